@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+# Every cache created in the process, by name, so they can be reported on
+# and reset together. Entries need stats() and reset() methods.
+_registry: Dict[str, Any] = {}
+
+def register_cache(name: str, cache: Any) -> None:
+    """Make a cache visible to get_cache_stats() and reset_all_caches()"""
+    _registry[name] = cache
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Caches are per process: in a multi-worker deployment the TTL bounds how
+    long another worker can serve an entry that was invalidated elsewhere.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled and max_entries > 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._generation = 0
+        # Monotonic time of the latest invalidation of each key, oldest first
+        # and bounded like the entries; older records, and clear(), fold into
+        # _invalidated_before, which then stands in for every other key
+        self._invalidated_at: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._invalidated_before: Optional[float] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        register_cache(name, self)
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter bumped by every invalidation.
+
+        Read it before loading a value from the database and pass it to set()
+        so a value loaded before a concurrent write is not cached after the
+        write invalidated it.
+        """
+        return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss"""
+        if not self.enabled:
+            return default
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None,
+            ttl_seconds: Optional[float] = None, min_age: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full
+
+        Args:
+            key: Cache key
+            value: Value to store
+            generation: Value of `generation` read before the value was loaded;
+                the value is dropped if an invalidation happened since
+            ttl_seconds: Override the cache TTL for this entry
+            min_age: Drop the value if the key was invalidated within the
+                last min_age seconds, e.g. because it was read from a
+                replica that may not have replayed the write yet
+        """
+        if not self.enabled:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if min_age is not None:
+                invalidated_at = self._invalidated_at.get(key, self._invalidated_before)
+                if invalidated_at is not None and time.monotonic() - invalidated_at < min_age:
+                    return
+
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def evict(self, key: Hashable) -> None:
+        """Invalidate a single key"""
+        self.evict_many((key,))
+
+    def evict_many(self, keys: Iterable[Hashable]) -> None:
+        """Invalidate several keys at once"""
+        now = time.monotonic()
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._invalidated_at[key] = now
+                self._invalidated_at.move_to_end(key)
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+            while len(self._invalidated_at) > self.max_entries:
+                _, self._invalidated_before = self._invalidated_at.popitem(last=False)
+
+    def clear(self) -> None:
+        """Invalidate every entry"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at.clear()
+            self._invalidated_before = time.monotonic()
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def reset(self) -> None:
+        """Drop every entry and zero the counters"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at.clear()
+            self._invalidated_before = None
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and eviction counters for the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the stats of every cache in the process, keyed by cache name"""
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+def reset_all_caches() -> None:
+    """Empty every cache and zero its counters"""
+    for cache in _registry.values():
+        cache.reset()
@@ -0,0 +1,178 @@
+import os
+from dataclasses import dataclass
+from typing import Tuple
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag such as "true"/"false" or "1"/"0" from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+# Read-through cache for GET /products/{product_id}
+PRODUCT_CACHE_ENABLED = env_bool("PRODUCT_CACHE_ENABLED", True)
+PRODUCT_CACHE_MAX_ENTRIES = int(os.getenv("PRODUCT_CACHE_MAX_ENTRIES", "10000"))
+PRODUCT_CACHE_TTL_SECONDS = float(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "60"))
+
+# In-memory category catalogue behind GET /categories/. The TTL bounds how
+# long other workers keep serving a list changed through this one.
+CATEGORY_CACHE_TTL_SECONDS = float(os.getenv("CATEGORY_CACHE_TTL_SECONDS", "300"))
+
+# In-process search index used when the database has no full-text search.
+# It is rebuilt from the database once older than this, which bounds how
+# long other workers miss products written through this one.
+SEARCH_INDEX_TTL_SECONDS = float(os.getenv("SEARCH_INDEX_TTL_SECONDS", "300"))
+
+# Decoded access tokens and resolved users/sellers behind get_current_user and
+# get_current_seller. The TTL bounds how long another worker keeps accepting
+# a principal that was changed or deleted through this one.
+AUTH_CACHE_ENABLED = env_bool("AUTH_CACHE_ENABLED", True)
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+# Dedicated pool for bcrypt work (see core/password_hasher.py). At most
+# workers + queue limit requests wait on it; the rest are refused with 503.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5"))
+
+# Revoked refresh/access token ids are mirrored in a per-process Bloom filter
+# (services/auth_service/revocation.py) so authenticating a request does
+# not query revoked_tokens. Other workers' revocations are picked up by an
+# incremental sync every REVOCATION_SYNC_SECONDS.
+REVOCATION_FILTER_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_FILTER_ERROR_RATE = float(os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001"))
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+
+# Deployment profile: "dev", "test" or "prod". Picks the database defaults
+# below; every DB_* variable overrides its profile default.
+APP_ENV = os.getenv("APP_ENV", "dev").strip().lower()
+
+DATABASE_PROFILES = {
+    # Local Postgres with SQL logging
+    "dev": {
+        "echo": True,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 0,
+        "connect_timeout": 10,
+    },
+    # One shared in-memory SQLite connection
+    "test": {
+        "url": "sqlite:///:memory:",
+        "echo": False,
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": 5.0,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_timeout_ms": 0,
+        "connect_timeout": 5,
+    },
+    # No statement logging; fail fast when the pool or a query is stuck
+    "prod": {
+        "echo": False,
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 5.0,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 15000,
+        "connect_timeout": 5,
+    },
+}
+
+if APP_ENV not in DATABASE_PROFILES:
+    raise ValueError(f"APP_ENV must be one of {', '.join(DATABASE_PROFILES)}, not {APP_ENV!r}")
+
+def _database_url(profile: dict) -> str:
+    url = os.getenv("DATABASE_URL") or profile.get("url")
+    if url:
+        return url
+    if APP_ENV == "prod":
+        raise ValueError("DATABASE_URL must be set when APP_ENV is prod")
+    # Local development database; credentials only come from the environment
+    # or .env, never from the code
+    user = os.getenv("DB_USER")
+    password = os.getenv("DB_PASSWORD")
+    if not user or not password:
+        raise ValueError(
+            f"Set DATABASE_URL, or DB_USER and DB_PASSWORD, in the environment or .env (APP_ENV={APP_ENV})"
+        )
+    host = os.getenv("DB_HOST", "localhost")
+    port = os.getenv("DB_PORT", "5433")
+    name = os.getenv("DB_NAME", "ecommercedb")
+    return f"postgresql://{user}:{password}@{host}:{port}/{name}"
+
+_profile = DATABASE_PROFILES[APP_ENV]
+DATABASE_URL = _database_url(_profile)
+DB_ECHO = env_bool("DB_ECHO", _profile["echo"])
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(_profile["pool_size"])))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", str(_profile["max_overflow"])))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", str(_profile["pool_timeout"])))
+# Seconds after which a pooled connection is replaced; -1 keeps them forever
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", str(_profile["pool_recycle"])))
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", _profile["pool_pre_ping"])
+# Postgres statement_timeout for every pooled connection; 0 disables it
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", str(_profile["statement_timeout_ms"])))
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", str(_profile["connect_timeout"])))
+
+# Read replicas for read-only routes, as comma-separated database URLs; reads
+# use the primary when empty. After a write, a client's reads stay on the
+# primary for READ_YOUR_WRITES_SECONDS, which should exceed the usual
+# replication lag. Clients are tracked by the subject of their bearer token
+# (per process, up to READ_YOUR_WRITES_MAX_PRINCIPALS at a time) and by a
+# time they send back in a cookie or the X-DB-Primary-Until header.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_MAX_PRINCIPALS = int(os.getenv("READ_YOUR_WRITES_MAX_PRINCIPALS", "100000"))
+
+# Per-request SQL instrumentation (core/sql_instrumentation.py). A statement
+# shape seen N_PLUS_ONE_THRESHOLD times in one request is reported as a
+# likely N+1. Requests running more than QUERY_BUDGET statements (0 = no
+# limit) are logged, or fail outright when QUERY_BUDGET_ENFORCE is on.
+SQL_INSTRUMENTATION_ENABLED = env_bool("SQL_INSTRUMENTATION_ENABLED", True)
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+QUERY_BUDGET_ENFORCE = env_bool("QUERY_BUDGET_ENFORCE", APP_ENV == "test")
+
+# Slow query log (core/slow_queries.py): statements slower than
+# SLOW_QUERY_MS are kept in a ring buffer of the last SLOW_QUERY_LOG_SIZE,
+# readable by admins (ADMIN_EMAILS) at GET /admin/slow-queries. With
+# SLOW_QUERY_EXPLAIN on, the plan of slow SELECTs is captured in the
+# background; on PostgreSQL that is EXPLAIN (ANALYZE, BUFFERS), which runs
+# the query a second time.
+SLOW_QUERY_LOG_ENABLED = env_bool("SLOW_QUERY_LOG_ENABLED", True)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+SLOW_QUERY_EXPLAIN = env_bool("SLOW_QUERY_EXPLAIN", False)
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+
+# Check at startup that the database has been migrated to the latest
+# revision (`alembic upgrade head`, see alembic.ini). Off in the test
+# profile, whose databases are built from the models directly.
+SCHEMA_CHECK_ENABLED = env_bool("SCHEMA_CHECK_ENABLED", APP_ENV != "test")
+
+# Browser origins allowed by CORS, comma-separated
+CORS_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173").split(",")
+    if origin.strip()
+)
+# Uploaded files, served under /static
+STATIC_DIR = os.path.abspath(os.getenv("STATIC_DIR", "static"))
+
+@dataclass(frozen=True)
+class AppSettings:
+    """What main.create_app() builds the application from; defaults come from the environment"""
+    cors_origins: Tuple[str, ...] = CORS_ORIGINS
+    static_dir: str = STATIC_DIR
+    schema_check: bool = SCHEMA_CHECK_ENABLED
@@ -1,25 +1,249 @@
-from sqlalchemy import create_engine
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import declarative_base
-# Database connection details
-DB_USER = "sergio"
-DB_PASSWORD = "mondongo"
-DB_HOST = "localhost"
-DB_PORT = "5433"
-DB_NAME = "ecommercedb"
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+
+from core.config import (
+    APP_ENV, DATABASE_URL, DB_ECHO, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS, DB_CONNECT_TIMEOUT
+)
+
+class PoolStats:
+    """
+    Counters for one engine's connection pool.
+
+    Checkouts and new connections are counted from pool events; the time
+    spent waiting for a free connection is measured by InstrumentedQueuePool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_sum += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_count": self.waits,
+                "wait_seconds_sum": self.wait_seconds_sum,
+                "wait_seconds_max": self.wait_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_sum / self.waits if self.waits else 0.0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.waits = 0
+            self.wait_seconds_sum = 0.0
+            self.wait_seconds_max = 0.0
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    pool_stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.pool_stats is not None:
+                self.pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.pool_stats is not None:
+            self.pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.pool_stats = self.pool_stats
+        return pool
+
+# PoolStats of every engine made by create_db_engine
+_engine_stats: "weakref.WeakKeyDictionary[Engine, PoolStats]" = weakref.WeakKeyDictionary()
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for asyncio drivers"""
+
+# Async drivers used for the database URLs of the sync engine
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-# Create the SQLAlchemy database URL
-SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def _connect_args(url: URL, statement_timeout_ms: int, connect_timeout: int) -> Dict[str, Any]:
+    """Driver-specific connection options for the statement and connect timeouts"""
+    driver = url.get_driver_name()
+    if url.get_backend_name() == "sqlite":
+        return {} if driver == "aiosqlite" else {"check_same_thread": False}
+    if driver == "asyncpg":
+        connect_args: Dict[str, Any] = {"timeout": connect_timeout}
+        if statement_timeout_ms > 0:
+            connect_args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+        return connect_args
+    if url.get_backend_name() == "postgresql":
+        connect_args = {"connect_timeout": connect_timeout}
+        if statement_timeout_ms > 0:
+            connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+        return connect_args
+    return {}
+
+def _instrument(engine: Engine) -> None:
+    pool_stats = PoolStats()
+    _engine_stats[engine] = pool_stats
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.pool_stats = pool_stats
+    event.listen(engine, "checkout", lambda *args: pool_stats.record("checkouts"))
+    event.listen(engine, "connect", lambda *args: pool_stats.record("connects"))
+    event.listen(engine, "invalidate", lambda *args: pool_stats.record("invalidations"))
+
+def create_db_engine(
+    url: str = DATABASE_URL,
+    echo: bool = DB_ECHO,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    pool_pre_ping: bool = DB_POOL_PRE_PING,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+    connect_timeout: int = DB_CONNECT_TIMEOUT
+) -> Engine:
+    """
+    Create an engine from the settings of the active APP_ENV profile
+
+    In-memory SQLite gets a single shared connection; every other database
+    gets a bounded InstrumentedQueuePool. Pool counters are available from
+    get_pool_stats(engine).
+    """
+    url = make_url(url)
+    connect_args = _connect_args(url, statement_timeout_ms, connect_timeout)
+
+    if _is_memory_sqlite(url):
+        engine = create_engine(url, echo=echo, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        engine = create_engine(
+            url,
+            echo=echo,
+            connect_args=connect_args,
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+        )
+
+    _instrument(engine)
+    return engine
+
+def create_async_db_engine(
+    url: str = DATABASE_URL,
+    echo: bool = DB_ECHO,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    pool_pre_ping: bool = DB_POOL_PRE_PING,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+    connect_timeout: int = DB_CONNECT_TIMEOUT
+) -> AsyncEngine:
+    """
+    Create an asyncio engine with the same settings as create_db_engine
+
+    A sync URL such as postgresql:// is switched to its async driver
+    (asyncpg, aiosqlite). The pool is separate from the sync engine's, and
+    sized by the same settings.
+    """
+    url = make_url(url)
+    if not url.get_dialect().is_async and url.get_backend_name() in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+    connect_args = _connect_args(url, statement_timeout_ms, connect_timeout)
+
+    if _is_memory_sqlite(url):
+        engine = create_async_engine(url, echo=echo, connect_args=connect_args, poolclass=StaticPool)
+    else:
+        engine = create_async_engine(
+            url,
+            echo=echo,
+            connect_args=connect_args,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+        )
+
+    _instrument(engine.sync_engine)
+    return engine
+
+def get_pool_stats(bind: Optional[Union[Engine, AsyncEngine]] = None) -> Dict[str, Any]:
+    """
+    Report the pool size and usage of an engine (the app engine by default)
+
+    Returns:
+        Dictionary with the pool class, its current size and occupancy, and
+        the checkout, connect, timeout and wait counters since start-up
+    """
+    bind = bind if bind is not None else engine
+    if isinstance(bind, AsyncEngine):
+        bind = bind.sync_engine
+    pool = bind.pool
+    stats: Dict[str, Any] = {"profile": APP_ENV, "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    pool_stats = _engine_stats.get(bind)
+    if pool_stats is not None:
+        stats.update(pool_stats.stats())
+    return stats
 
 # Create the SQLAlchemy engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    echo=True,  # Set to False in production
-)
+engine = create_db_engine()
 
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Asyncio engine and sessions for async def routes. Objects are not expired
+# on commit: reloading them lazily would need I/O outside an await.
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create a Base class
 Base = declarative_base()
 
@@ -29,4 +253,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,85 @@
+import hashlib
+from datetime import datetime, UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Mapping, Optional
+
+from fastapi import Response, status
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the given parts
+
+    Args:
+        parts: Values that together identify the representation
+
+    Returns:
+        Quoted entity tag
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()[:32]}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against the current ETag
+
+    Uses the weak comparison required for If-None-Match, so a W/ prefix
+    sent back by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+
+    current = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == current for tag in candidates)
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an HTTP-date; naive values are taken as UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+def is_not_modified(
+    headers: Mapping[str, str],
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Decide whether a conditional GET can be answered with 304
+
+    If-None-Match takes precedence; If-Modified-Since is only evaluated when
+    the request carries no entity tags (RFC 9110, section 13.2.2).
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=UTC)
+    # HTTP-dates have one second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+def not_modified(headers: Mapping[str, str]) -> Response:
+    """
+    Build a 304 response
+
+    Args:
+        headers: Validators and caching headers of the current representation
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(headers))
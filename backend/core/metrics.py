@@ -0,0 +1,216 @@
+import bisect
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds (seconds) of the request latency histogram
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that matched no route, so unknown paths cannot
+# create unbounded series
+UNMATCHED_ROUTE = "unmatched"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class RequestMetrics:
+    """
+    Request counters and latency histograms per route, method and status.
+
+    Each series is a flat list [count, sum, bucket_0 .. bucket_n] created
+    the first time the series is seen and updated in place afterwards.
+    ASGI middleware runs on the worker's event loop thread, so updates need
+    no lock; every worker process reports its own series.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.in_flight = 0
+        # route -> method -> status -> series
+        self._series: Dict[str, Dict[str, Dict[int, List[float]]]] = {}
+
+    def observe(self, route: str, method: str, status_code: int, seconds: float) -> None:
+        by_method = self._series.get(route)
+        if by_method is None:
+            by_method = self._series[route] = {}
+        by_status = by_method.get(method)
+        if by_status is None:
+            by_status = by_method[method] = {}
+        series = by_status.get(status_code)
+        if series is None:
+            series = by_status[status_code] = [0] * (len(self.buckets) + 2)
+
+        series[0] += 1
+        series[1] += seconds
+        # Non-cumulative; rendering adds them up. Slow requests beyond the
+        # last bound only count towards +Inf (the total)
+        index = bisect.bisect_left(self.buckets, seconds)
+        if index < len(self.buckets):
+            series[2 + index] += 1
+
+    def series(self) -> Iterable[Tuple[str, str, int, List[float]]]:
+        for route, by_method in list(self._series.items()):
+            for method, by_status in list(by_method.items()):
+                for status_code, series in list(by_status.items()):
+                    yield route, method, status_code, series
+
+    def reset(self) -> None:
+        self._series = {}
+
+class MetricsMiddleware:
+    """Record the latency, status and in-flight count of every HTTP request"""
+
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            metrics.observe(
+                getattr(route, "path", UNMATCHED_ROUTE),
+                scope["method"],
+                status_code,
+                time.perf_counter() - started
+            )
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(**labels: Any) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _bound(bound: float) -> str:
+    return repr(float(bound))
+
+class MetricsWriter:
+    """Prometheus text exposition format, one metric family at a time"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, metric_type: str, help_text: str) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+
+    def sample(self, name: str, value: Any, **labels: Any) -> None:
+        if isinstance(value, bool):
+            value = int(value)
+        self.lines.append(f"{name}{_labels(**labels)} {value}")
+
+    def histogram(self, name: str, bounds: Iterable[float], counts: Iterable[int], total: int, sum_value: float, **labels: Any) -> None:
+        """Write a histogram from non-cumulative bucket counts"""
+        cumulative = 0
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, **labels, le=_bound(bound))
+        self.sample(f"{name}_bucket", total, **labels, le="+Inf")
+        self.sample(f"{name}_count", total, **labels)
+        self.sample(f"{name}_sum", sum_value, **labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+def write_request_metrics(writer: MetricsWriter, metrics: RequestMetrics) -> None:
+    series = list(metrics.series())
+
+    writer.family("http_requests_total", "counter", "HTTP requests by route, method and status")
+    for route, method, status_code, values in series:
+        writer.sample("http_requests_total", values[0], route=route, method=method, status=status_code)
+
+    writer.family("http_request_duration_seconds", "histogram", "HTTP request latency by route, method and status")
+    for route, method, status_code, values in series:
+        writer.histogram(
+            "http_request_duration_seconds", metrics.buckets, values[2:], values[0], values[1],
+            route=route, method=method, status=status_code
+        )
+
+    writer.family("http_requests_in_flight", "gauge", "HTTP requests being handled by this worker")
+    writer.sample("http_requests_in_flight", metrics.in_flight)
+
+def write_pool_metrics(writer: MetricsWriter, pools: Dict[str, Dict[str, Any]]) -> None:
+    """Write get_pool_stats() results keyed by an engine name"""
+    gauges = (
+        ("db_pool_size", "size", "Configured connections kept in the pool"),
+        ("db_pool_checked_out", "checked_out", "Connections currently checked out"),
+        ("db_pool_checked_in", "checked_in", "Idle connections in the pool"),
+        ("db_pool_overflow", "overflow", "Connections open beyond the pool size (negative while below it)"),
+    )
+    counters = (
+        ("db_pool_checkouts_total", "checkouts", "Connection checkouts"),
+        ("db_pool_connects_total", "connects", "New database connections"),
+        ("db_pool_timeouts_total", "timeouts", "Checkouts that timed out waiting for a connection"),
+        ("db_pool_wait_seconds_total", "wait_seconds_sum", "Time spent waiting for a connection"),
+    )
+    for metric_type, definitions in (("gauge", gauges), ("counter", counters)):
+        for name, key, help_text in definitions:
+            writer.family(name, metric_type, help_text)
+            for engine_name, stats in pools.items():
+                if key in stats:
+                    writer.sample(name, stats[key], engine=engine_name)
+
+def write_cache_metrics(writer: MetricsWriter, caches: Dict[str, Dict[str, Any]]) -> None:
+    """Write get_cache_stats() results; caches without hit counters are skipped"""
+    caches = {name: stats for name, stats in caches.items() if "hits" in stats}
+    for name, key, metric_type, help_text in (
+        ("cache_hits_total", "hits", "counter", "Cache lookups that found an entry"),
+        ("cache_misses_total", "misses", "counter", "Cache lookups that found no entry"),
+        ("cache_hit_ratio", "hit_ratio", "gauge", "Share of cache lookups that hit since start or reset"),
+        ("cache_entries", "size", "gauge", "Entries currently cached"),
+    ):
+        writer.family(name, metric_type, help_text)
+        for cache_name, stats in caches.items():
+            if key in stats:
+                writer.sample(name, stats[key], cache=cache_name)
+
+def write_password_hasher_metrics(writer: MetricsWriter, stats: Dict[str, Any]) -> None:
+    """Write PasswordHasher.stats()"""
+    writer.family("password_hash_in_flight", "gauge", "Password hash calls admitted and not finished")
+    writer.sample("password_hash_in_flight", stats["in_flight"])
+    for name, key, help_text in (
+        ("password_hash_submitted_total", "submitted", "Password hash calls admitted to the pool"),
+        ("password_hash_rejected_total", "rejected", "Password hash calls refused because the pool was full"),
+        ("password_hash_timeouts_total", "timeouts", "Password hash calls that timed out in the queue"),
+    ):
+        writer.family(name, "counter", help_text)
+        writer.sample(name, stats[key])
+
+    buckets = stats["queue_wait_buckets"]
+    writer.family("password_hash_queue_wait_seconds", "histogram", "Time password hash calls waited for a worker")
+    writer.histogram(
+        "password_hash_queue_wait_seconds", buckets.keys(), buckets.values(),
+        stats["queue_wait_count"], stats["queue_wait_seconds_sum"]
+    )
+
+def write_sql_metrics(writer: MetricsWriter, stats: Dict[str, Any]) -> None:
+    """Write SQLInstrumentation.stats()"""
+    for name, key, help_text in (
+        ("sql_requests_total", "requests", "Requests whose SQL statements were counted"),
+        ("sql_statements_total", "queries", "SQL statements executed by requests"),
+        ("sql_n_plus_one_requests_total", "n_plus_one_requests", "Requests that repeated a statement shape"),
+        ("sql_over_budget_requests_total", "over_budget_requests", "Requests over the query budget"),
+    ):
+        writer.family(name, "counter", help_text)
+        writer.sample(name, stats[key])
+
+# Process-wide request metrics recorded by MetricsMiddleware
+request_metrics = RequestMetrics()
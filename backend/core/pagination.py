@@ -0,0 +1,51 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+
+# Response header used to hand the next page cursor back to the client.
+# List endpoints keep returning a plain JSON array so existing clients are
+# unaffected; cursor-aware clients read this header instead.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """
+    Encode keyset position data into an opaque, URL-safe cursor string
+
+    Args:
+        data: JSON serialisable position of the last row of a page
+
+    Returns:
+        Opaque cursor string
+    """
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Opaque cursor string sent by the client
+
+    Returns:
+        Position data stored in the cursor
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        data = None
+
+    if not isinstance(data, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    return data
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from core.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT, PASSWORD_HASH_TIMEOUT_SECONDS
+from core.security import get_password_hash, verify_password
+
+# Upper bounds (seconds) of the queue wait histogram
+QUEUE_WAIT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool with admission control.
+
+    bcrypt releases the GIL, so a few threads keep the CPUs busy without
+    borrowing Starlette's shared threadpool for the hashing itself. At most
+    `workers + queue_limit` calls are admitted at once; any further call is
+    refused immediately with 503 and Retry-After, as is a call that waited
+    longer than `timeout_seconds`. A login burst therefore holds a bounded
+    number of request threads instead of queueing behind bcrypt and
+    starving unrelated requests.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, timeout_seconds: float):
+        self.workers = max(workers, 1)
+        self.queue_limit = max(queue_limit, 0)
+        self.timeout_seconds = timeout_seconds
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_limit)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def hash(self, password: str) -> str:
+        """Hash a password on the pool"""
+        return self._run(get_password_hash, password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Check a password against its hash on the pool"""
+        return self._run(verify_password, plain_password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password on the pool without blocking the event loop"""
+        return await self._run_async(get_password_hash, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Check a password on the pool without blocking the event loop"""
+        return await self._run_async(verify_password, plain_password, hashed_password)
+
+    def _run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run func on the pool and wait for its result
+
+        Raises:
+            HTTPException: 503 if the pool is saturated or the call timed out
+        """
+        timeout = self.timeout_seconds
+        future = self._submit(func, *args)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise self._timed_out(future)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def _run_async(self, func: Callable[..., Any], *args) -> Any:
+        """Like _run, but awaits the result instead of blocking the thread"""
+        timeout = self.timeout_seconds
+        future = self._submit(func, *args)
+        try:
+            # shield: a timeout only abandons the wait; _timed_out cancels
+            # the pool future itself if it has not started yet
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out(future)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _submit(self, func: Callable[..., Any], *args) -> Future:
+        """
+        Admit a call and queue it on the pool
+
+        Raises:
+            HTTPException: 503 if the pool is saturated
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise self._busy()
+
+        submitted_at = time.monotonic()
+
+        def task():
+            self._record_wait(time.monotonic() - submitted_at)
+            return func(*args)
+
+        try:
+            future = self._get_executor().submit(task)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the work is really finished (or cancelled
+        # while still queued), not just until the caller gives up
+        future.add_done_callback(lambda _: self._slots.release())
+
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+        return future
+
+    def _timed_out(self, future: Future) -> HTTPException:
+        future.cancel()
+        with self._lock:
+            self.timeouts += 1
+        return self._busy()
+
+    def _busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.queue_wait_count += 1
+            self.queue_wait_sum += seconds
+            self.queue_wait_max = max(self.queue_wait_max, seconds)
+            for index, bound in enumerate(QUEUE_WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.queue_wait_buckets[index] += 1
+                    break
+
+    def _reset_counters(self) -> None:
+        self.submitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.queue_wait_count = 0
+        self.queue_wait_sum = 0.0
+        self.queue_wait_max = 0.0
+        self.queue_wait_buckets = [0] * len(QUEUE_WAIT_BUCKETS)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return admission counters and the time calls spent queued"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "queue_wait_count": self.queue_wait_count,
+                "queue_wait_seconds_sum": self.queue_wait_sum,
+                "queue_wait_seconds_max": self.queue_wait_max,
+                "queue_wait_seconds_avg": (
+                    self.queue_wait_sum / self.queue_wait_count if self.queue_wait_count else 0.0
+                ),
+                # Non-cumulative counts per bucket of QUEUE_WAIT_BUCKETS;
+                # waits above the last bound are only in queue_wait_count
+                "queue_wait_buckets": dict(zip(QUEUE_WAIT_BUCKETS, self.queue_wait_buckets)),
+            }
+
+    def reset(self) -> None:
+        """Zero the counters"""
+        with self._lock:
+            in_flight = self.in_flight
+            self._reset_counters()
+            self.in_flight = in_flight
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; the pool is recreated on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+# Process-wide hasher used by login, registration and password changes
+password_hasher = PasswordHasher(
+    workers=PASSWORD_HASH_WORKERS,
+    queue_limit=PASSWORD_HASH_QUEUE_LIMIT,
+    timeout_seconds=PASSWORD_HASH_TIMEOUT_SECONDS
+)
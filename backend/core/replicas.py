@@ -0,0 +1,228 @@
+import itertools
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.datastructures import Headers
+
+from core.cache import TTLCache
+from core.config import DATABASE_REPLICA_URLS, READ_YOUR_WRITES_SECONDS, READ_YOUR_WRITES_MAX_PRINCIPALS
+from core.database import (
+    SessionLocal, AsyncSessionLocal, create_db_engine, create_async_db_engine, get_pool_stats
+)
+from core.security import SECRET_KEY, ALGORITHM
+
+# Unix time until which the client reads from the primary. Sent back as a
+# cookie and as a response header; cross-origin clients that do not keep
+# cookies echo the header on their next requests.
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+READ_YOUR_WRITES_HEADER = "X-DB-Primary-Until"
+
+# Seconds the client's time may run ahead of this worker's clock when it
+# was set by another worker
+CLOCK_SKEW_SECONDS = 1.0
+
+# Requests with these methods never count as writes
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# POST routes that only read
+READ_ONLY_ROUTES = {
+    ("POST", "/products/batch"),
+    ("POST", "/auth/verify"),
+}
+
+# Token subjects that wrote through this worker within the window
+primary_pins = TTLCache(
+    "read_your_writes",
+    max_entries=READ_YOUR_WRITES_MAX_PRINCIPALS,
+    ttl_seconds=READ_YOUR_WRITES_SECONDS
+)
+
+def request_principal(headers: Headers) -> Optional[str]:
+    """Subject of the valid bearer access token sent with a request, if any"""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+def is_write(method: str, path: str) -> bool:
+    """True if a request with this method and path may change data"""
+    return method not in SAFE_METHODS and (method, path.rstrip("/") or "/") not in READ_ONLY_ROUTES
+
+class ReplicaRouter:
+    """
+    Picks the database for read-only routes.
+
+    Reads go to the replicas in turn, except for clients that wrote within
+    the last window_seconds (see ReadYourWritesMiddleware), which read from
+    the primary so they see their own changes despite replication lag.
+    A client counts as having written when its bearer token's subject
+    wrote through this worker, or when it sends back the time handed out
+    with a write by any worker.
+    """
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replicas: List[sessionmaker],
+        async_primary: async_sessionmaker,
+        async_replicas: List[async_sessionmaker],
+        window_seconds: float
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.async_primary = async_primary
+        self.async_replicas = async_replicas
+        self.window_seconds = window_seconds
+
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    def use_primary(self, request: Request) -> bool:
+        """
+        True if there are no replicas or the client wrote recently
+
+        The header or cookie time comes from the client, so it is only
+        trusted up to one window ahead (plus clock skew between workers):
+        anything later was not set by ReadYourWritesMiddleware and is
+        ignored, so a forged value cannot pin a client to the primary
+        indefinitely.
+        """
+        if not self.replicas:
+            return True
+        principal = request_principal(request.headers)
+        if principal is not None and primary_pins.get(principal):
+            return True
+        value = request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
+        try:
+            until = float(value or "0")
+        except ValueError:
+            return False
+        now = time.time()
+        return now < until <= now + self.window_seconds + CLOCK_SKEW_SECONDS
+
+    def _choose(self, request: Request, primary: Any, replicas: List[Any]) -> Any:
+        on_primary = self.use_primary(request)
+        with self._lock:
+            if on_primary:
+                self.primary_reads += 1
+                return primary
+            self.replica_reads += 1
+            return replicas[next(self._turn) % len(replicas)]
+
+    def read_sessionmaker(self, request: Request) -> sessionmaker:
+        return self._choose(request, self.primary, self.replicas)
+
+    def async_read_sessionmaker(self, request: Request) -> async_sessionmaker:
+        return self._choose(request, self.async_primary, self.async_replicas)
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """get_pool_stats() of every replica engine, keyed replica_<n>[_async]"""
+        stats = {}
+        for index, (replica, async_replica) in enumerate(zip(self.replicas, self.async_replicas)):
+            stats[f"replica_{index}"] = get_pool_stats(replica.kw["bind"])
+            stats[f"replica_{index}_async"] = get_pool_stats(async_replica.kw["bind"])
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replicas": len(self.replicas),
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.primary_reads = self.replica_reads = 0
+
+def replica_lag_window(db: Session) -> Optional[float]:
+    """
+    Seconds a replica session may lag behind the primary, None for the primary
+
+    Caches filled from a replica use this to avoid storing a value that
+    predates a write invalidated moments ago.
+    """
+    return READ_YOUR_WRITES_SECONDS if db.info.get("replica") else None
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client's reads to the primary for a short while after it writes.
+
+    Successful responses to writes (unsafe methods other than
+    READ_ONLY_ROUTES) pin the token's subject in primary_pins and carry the
+    time until which ReplicaRouter keeps the client on the primary, as a
+    cookie and a READ_YOUR_WRITES_HEADER header.
+    """
+
+    def __init__(self, app, window_seconds: float = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_write(scope["method"], scope["path"]) or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                principal = request_principal(Headers(scope=scope))
+                if principal is not None:
+                    primary_pins.set(principal, True, ttl_seconds=self.window_seconds)
+                until = f"{time.time() + self.window_seconds:.3f}"
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={until}; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                    (READ_YOUR_WRITES_HEADER.lower().encode("latin-1"), until.encode("latin-1"))
+                ]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
+
+def _replica_sessionmakers():
+    replicas, async_replicas = [], []
+    for url in DATABASE_REPLICA_URLS:
+        replicas.append(sessionmaker(
+            autocommit=False, autoflush=False, bind=create_db_engine(url), info={"replica": True}
+        ))
+        async_replicas.append(async_sessionmaker(
+            create_async_db_engine(url), autoflush=False, expire_on_commit=False, info={"replica": True}
+        ))
+    return replicas, async_replicas
+
+_replicas, _async_replicas = _replica_sessionmakers()
+
+# Process-wide router behind get_read_db and get_async_read_db
+replica_router = ReplicaRouter(
+    primary=SessionLocal,
+    replicas=_replicas,
+    async_primary=AsyncSessionLocal,
+    async_replicas=_async_replicas,
+    window_seconds=READ_YOUR_WRITES_SECONDS
+)
+
+# Dependency to get a session for a read-only route
+def get_read_db(request: Request):
+    db = replica_router.read_sessionmaker(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency to get an async session for a read-only route
+async def get_async_read_db(request: Request):
+    async with replica_router.async_read_sessionmaker(request)() as db:
+        yield db
@@ -0,0 +1,43 @@
+import os
+from typing import Set
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+# backend/alembic.ini, next to the migrations directory
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is not at the revision this code expects"""
+
+def alembic_config() -> Config:
+    return Config(ALEMBIC_INI)
+
+def head_revisions() -> Set[str]:
+    """Latest migration revisions shipped with the code"""
+    return set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+def current_revisions(bind: Engine) -> Set[str]:
+    """Revisions recorded in the database's alembic_version table (empty if none)"""
+    with bind.connect() as conn:
+        return set(MigrationContext.configure(conn).get_current_heads())
+
+def check_schema_version(bind: Engine) -> None:
+    """
+    Fail unless the database has been migrated to the latest revision
+
+    Costs one query on alembic_version; never changes the schema.
+
+    Raises:
+        SchemaVersionError: If migrations are missing or the database is
+            ahead of the code
+    """
+    heads = head_revisions()
+    current = current_revisions(bind)
+    if current != heads:
+        raise SchemaVersionError(
+            f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+            f"expected {', '.join(sorted(heads))}; run `alembic upgrade head` from backend/"
+        )
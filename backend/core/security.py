@@ -1,6 +1,7 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, UTC
 from typing import Optional
+from uuid import uuid4
 from jose import jwt
 from fastapi.security import OAuth2PasswordBearer
 import os
@@ -9,23 +10,37 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# bcrypt cost factor for new hashes; existing hashes keep the cost they
+# were created with. Each step doubles the time of a hash or verification.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 # Create a password context for hashing and verification
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 # Configure JWT
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-for-development-only")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+# Value of the "type" claim; tokens without one are access tokens
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
 
 # OAuth2 scheme for FastAPI
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="users/login")
 
 def verify_password(plain_password, hashed_password):
-    """Verify that the plain password matches the hashed password"""
+    """
+    Verify that the plain password matches the hashed password
+    
+    Runs bcrypt on the calling thread; request handlers should go through
+    core.password_hasher.password_hasher instead.
+    """
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    """Hash the password using bcrypt"""
+    """Hash the password using bcrypt (on the calling thread)"""
     return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -37,7 +52,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         
+    # A unique id lets a single token be revoked
+    to_encode.setdefault("type", ACCESS_TOKEN_TYPE)
+    to_encode.setdefault("jti", uuid4().hex)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
+    """Create a long-lived refresh token, only accepted by /auth/refresh"""
+    if expires_delta is None:
+        expires_delta = timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    return create_access_token({**data, "type": REFRESH_TOKEN_TYPE}, expires_delta)
+
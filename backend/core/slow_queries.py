@@ -0,0 +1,241 @@
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from core.cache import register_cache
+from core.config import SLOW_QUERY_LOG_ENABLED, SLOW_QUERY_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_EXPLAIN
+from core.database import create_db_engine
+from core.sql_instrumentation import current_queries
+
+logger = logging.getLogger("app.sql")
+
+# Plans waiting for the explain worker beyond this are skipped, so a burst
+# of slow queries cannot queue up unbounded re-executions
+MAX_PENDING_EXPLAINS = 8
+
+# Parameter values kept as they are; everything else (strings, bytes,
+# dates) is replaced by its type name
+_PLAIN_TYPES = (type(None), bool, int, float, Decimal)
+
+# Explain statement per database backend
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS)",
+    "sqlite": "EXPLAIN QUERY PLAN",
+}
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN of a SELECT, compiled for whichever database runs it"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    prefix = EXPLAIN_PREFIXES.get(compiler.dialect.name, "EXPLAIN")
+    return f"{prefix} {compiler.process(element.statement, **kw)}"
+
+def _redact_value(value: Any) -> Any:
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    return f"<{type(value).__name__}>"
+
+def redact_parameters(parameters: Any) -> Any:
+    """Copy of DBAPI parameters with every non-numeric value replaced by its type"""
+    if isinstance(parameters, dict):
+        return {name: _redact_value(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+def _plan_line(row) -> str:
+    return str(row[0]) if len(row) == 1 else " | ".join(str(column) for column in row)
+
+class SlowQueryLog:
+    """
+    Ring buffer of the statements slower than a threshold.
+
+    Statements are timed by cursor execution hooks installed on every
+    Engine. Each slow one is logged as JSON to the "app.sql" logger and
+    kept with its redacted parameters and the route of the request that ran
+    it; the oldest entries drop out once the buffer is full. When explain
+    is on, the plan of slow SELECTs is captured by a single background
+    thread on a separate one-connection engine, so neither the request nor
+    the application pools wait for it.
+    """
+
+    def __init__(self, enabled: bool, threshold_ms: float, size: int, explain: bool):
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.size = size
+
+        self._lock = threading.Lock()
+        self._entries: deque = deque(maxlen=size)
+        self._installed = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Engine that ran the statement -> engine its plans are captured on
+        self._explain_engines: "weakref.WeakKeyDictionary[Engine, Engine]" = weakref.WeakKeyDictionary()
+        self._pending = 0
+        self._reset_counters()
+
+    def install(self) -> None:
+        """Attach the timing hooks to all engines, once per process"""
+        with self._lock:
+            if self._installed or not self.enabled:
+                return
+            event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+            self._installed = True
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < self.threshold_ms or not context.execution_options.get("slow_query_log", True):
+            return
+        self.record(conn.engine, statement, parameters, context, executemany, elapsed_ms)
+
+    def record(self, engine: Engine, statement: str, parameters: Any, context, executemany: bool, elapsed_ms: float) -> Dict[str, Any]:
+        """
+        Keep and log one slow statement, and queue its plan if enabled
+
+        Returns:
+            The buffered entry; explain_status moves from "pending" to
+            "done" or "failed" once the background capture finishes
+        """
+        queries = current_queries.get()
+        entry: Dict[str, Any] = {
+            "at": datetime.now(UTC).isoformat(),
+            "duration_ms": round(elapsed_ms, 3),
+            "statement": statement,
+            "parameters": redact_parameters(parameters[0] if executemany and parameters else parameters),
+            "route": queries.route if queries is not None else None,
+            "database": engine.url.render_as_string(hide_password=True),
+        }
+        if executemany:
+            entry["rows"] = len(parameters)
+
+        compiled = getattr(context, "compiled", None)
+        if not self.explain:
+            entry["explain_status"] = "disabled"
+        elif compiled is None or not getattr(compiled.statement, "is_select", False):
+            entry["explain_status"] = "not_select"
+        else:
+            entry["explain_status"] = "pending"
+
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+            if entry["explain_status"] == "pending":
+                if self._pending >= MAX_PENDING_EXPLAINS:
+                    entry["explain_status"] = "skipped"
+                    self.explains_skipped += 1
+                else:
+                    self._pending += 1
+
+        logger.warning(json.dumps({"event": "slow_query", **entry}, default=str))
+        if entry["explain_status"] == "pending":
+            # Bind values stay in the worker's closure and are never stored
+            self._get_executor().submit(
+                self._capture_plan, entry, engine, compiled.statement, dict(context.compiled_parameters[0])
+            )
+        return entry
+
+    def _explain_engine(self, engine: Engine) -> Engine:
+        explain_engine = self._explain_engines.get(engine)
+        if explain_engine is None:
+            url = engine.url
+            if url.get_dialect().is_async:
+                url = url.set(drivername=url.get_backend_name())
+            explain_engine = create_db_engine(url.render_as_string(hide_password=False), pool_size=1, max_overflow=0)
+            self._explain_engines[engine] = explain_engine
+        return explain_engine
+
+    def _capture_plan(self, entry: Dict[str, Any], engine: Engine, statement: ClauseElement, parameters: Dict[str, Any]) -> None:
+        try:
+            with self._explain_engine(engine).connect() as conn:
+                rows = conn.execution_options(slow_query_log=False).execute(Explain(statement), parameters).all()
+                # EXPLAIN ANALYZE ran the query; leave nothing of it behind
+                conn.rollback()
+            entry["explain"] = [_plan_line(row) for row in rows]
+            entry["explain_status"] = "done"
+        except Exception as exc:
+            entry["explain"] = [f"{type(exc).__name__}: {exc}"]
+            entry["explain_status"] = "failed"
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.explains += entry["explain_status"] == "done"
+                self.explain_failures += entry["explain_status"] == "failed"
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        return self._executor
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Buffered slow statements, newest first"""
+        with self._lock:
+            entries = [dict(entry) for entry in reversed(self._entries)]
+        return entries[:limit] if limit is not None else entries
+
+    def _reset_counters(self) -> None:
+        self.recorded = 0
+        self.explains = 0
+        self.explain_failures = 0
+        self.explains_skipped = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "threshold_ms": self.threshold_ms,
+                "buffered": len(self._entries),
+                "capacity": self.size,
+                "recorded": self.recorded,
+                "explains": self.explains,
+                "explain_failures": self.explain_failures,
+                "explains_skipped": self.explains_skipped,
+                "explains_pending": self._pending,
+            }
+
+    def reset(self) -> None:
+        """Empty the buffer and zero the counters; pending plans still complete"""
+        with self._lock:
+            self._entries.clear()
+            self._reset_counters()
+
+    def shutdown(self) -> None:
+        """Wait for pending plans and stop the explain worker"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+# Process-wide slow query log; main.py installs the hooks
+slow_query_log = SlowQueryLog(
+    enabled=SLOW_QUERY_LOG_ENABLED,
+    threshold_ms=SLOW_QUERY_MS,
+    size=SLOW_QUERY_LOG_SIZE,
+    explain=SLOW_QUERY_EXPLAIN
+)
+register_cache("slow_queries", slow_query_log)
@@ -0,0 +1,207 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import (
+    SQL_INSTRUMENTATION_ENABLED, N_PLUS_ONE_THRESHOLD, QUERY_BUDGET, QUERY_BUDGET_ENFORCE
+)
+
+logger = logging.getLogger("app.sql")
+
+# Runs of bind placeholders (IN lists, multi-row VALUES) in the styles of
+# sqlite (?), psycopg2 (%(name)s) and asyncpg ($1), and single ones
+_PLACEHOLDER = r"(?:\?|%\([^)]*\)s|\$\d+)"
+_PLACEHOLDER_RUN = re.compile(rf"{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+    """Normalise a statement so executions that differ only in parameters compare equal"""
+    return _PLACEHOLDER_RUN.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more statements than the query budget allows"""
+
+class RequestQueries:
+    """Statements executed on behalf of one request"""
+
+    def __init__(self, scope: Optional[Dict[str, Any]] = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least threshold times, most frequent first"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    @property
+    def route(self) -> Optional[str]:
+        """Route template of the request once routed, else its path"""
+        if self.scope is None:
+            return None
+        route = self.scope.get("route")
+        return getattr(route, "path", self.scope.get("path"))
+
+# The RequestQueries of the request being handled. Starlette copies the
+# context into threadpool workers and SQLAlchemy's async greenlets, so
+# statements of sync and async routes both land here.
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+class SQLInstrumentation:
+    """
+    Count and time SQL statements per request.
+
+    Cursor execution hooks are installed on every Engine once; outside a
+    request (no RequestQueries in the context) they do nothing.
+    """
+
+    def __init__(self, enabled: bool, n_plus_one_threshold: int, budget: int, enforce_budget: bool):
+        self.enabled = enabled
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.budget = budget
+        self.enforce_budget = enforce_budget
+
+        self._installed = False
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def install(self) -> None:
+        """Attach the statement hooks to all engines, once per process"""
+        with self._lock:
+            if self._installed or not self.enabled:
+                return
+            event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+            self._installed = True
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        queries = current_queries.get()
+        if queries is None:
+            return
+        if self.enforce_budget and 0 < self.budget <= queries.count:
+            raise QueryBudgetExceeded(
+                f"Query budget of {self.budget} statements exceeded; most repeated: "
+                f"{queries.shapes.most_common(3)}"
+            )
+        context._sql_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        queries = current_queries.get()
+        started = getattr(context, "_sql_started", None)
+        if queries is None or started is None:
+            return
+        queries.count += 1
+        queries.seconds += time.perf_counter() - started
+        queries.shapes[statement_shape(statement)] += 1
+
+    def finish(self, method: str, path: str, status_code: int, queries: RequestQueries) -> Dict[str, Any]:
+        """
+        Log the statements of a finished request and update the counters
+
+        Returns:
+            The logged record
+        """
+        repeated = queries.repeated(self.n_plus_one_threshold)
+        over_budget = 0 < self.budget < queries.count
+        record = {
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "queries": queries.count,
+            "db_ms": round(queries.seconds * 1000, 3),
+        }
+        if repeated:
+            record["repeated"] = [{"statement": shape, "count": count} for shape, count in repeated]
+
+        with self._lock:
+            self.requests += 1
+            self.queries += queries.count
+            self.max_queries = max(self.max_queries, queries.count)
+            self.n_plus_one_requests += bool(repeated)
+            self.over_budget_requests += over_budget
+
+        if repeated or over_budget:
+            logger.warning(json.dumps({"event": "sql_suspect", **record, "over_budget": over_budget}))
+        else:
+            logger.info(json.dumps({"event": "sql", **record}))
+        return record
+
+    def _reset_counters(self) -> None:
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.n_plus_one_requests = 0
+        self.over_budget_requests = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "queries": self.queries,
+                "max_queries": self.max_queries,
+                "avg_queries": self.queries / self.requests if self.requests else 0.0,
+                "n_plus_one_requests": self.n_plus_one_requests,
+                "over_budget_requests": self.over_budget_requests,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._reset_counters()
+
+def server_timing(queries: RequestQueries) -> str:
+    """Server-Timing entry for the database time of a request"""
+    return f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} queries"'
+
+class SQLInstrumentationMiddleware:
+    """
+    Collect the statements of each HTTP request.
+
+    Adds a Server-Timing header with the time spent in the database and the
+    number of statements, and logs one record per request through
+    SQLInstrumentation.finish(). Statements run after the response has
+    started (dependency teardown, streaming bodies) are logged but are not
+    in the header.
+    """
+
+    def __init__(self, app, instrumentation: Optional["SQLInstrumentation"] = None):
+        self.app = app
+        self.instrumentation = instrumentation or sql_instrumentation
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.instrumentation.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = current_queries.set(queries)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [*message.get("headers", []), (b"server-timing", server_timing(queries).encode("latin-1"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_queries.reset(token)
+            self.instrumentation.finish(scope["method"], scope["path"], status_code, queries)
+
+# Process-wide instrumentation; main.py installs the hooks
+sql_instrumentation = SQLInstrumentation(
+    enabled=SQL_INSTRUMENTATION_ENABLED,
+    n_plus_one_threshold=N_PLUS_ONE_THRESHOLD,
+    budget=QUERY_BUDGET,
+    enforce_budget=QUERY_BUDGET_ENFORCE
+)
@@ -1,62 +1,173 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 import os
-from core.database import engine
-from models import Base
-from services.user_service.router import router as user_router
-from services.auth_service.router import router as auth_router
-from services.auth_service.user_info_router import router as user_info_router
-from services.seller_service.router import router as seller_router
-from services.product_service.router import router as product_router
-from services.product_service.category_router import router as category_router
-from services.file_service.router import router as file_router
-
-# Create the FastAPI app
-app = FastAPI(
-    title="E-Commerce API",
-    description="API for E-Commerce platform",
-    version="0.1.0"
-)
-
-# Configure CORS
-origins = [
-    "http://localhost:5173",           
-    "http://127.0.0.1:5173",
-]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],    
-)
-
-# Create database tables if they don't exist
-Base.metadata.create_all(bind=engine)
-
-# Create static directory for file uploads if it doesn't exist
-os.makedirs("static/images/products", exist_ok=True)
-
-# Mount static directory to serve uploaded files
-app.mount("/static", StaticFiles(directory="static"), name="static")
-
-# Include service routers   
-app.include_router(user_router)
-app.include_router(auth_router)
-app.include_router(user_info_router)
-app.include_router(seller_router)
-app.include_router(product_router)
-app.include_router(category_router)
-app.include_router(file_router)  # Add the file service router
-
-# Root endpoint
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to the E-Commerce API"}
-
-# Health check endpoint
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Optional
+from core.config import AppSettings
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+# Importing this module is cheap: FastAPI, the routers, services, database
+# engines and Alembic are imported by create_app() (and the schema check),
+# so tools that only need settings or models do not pay for them.
+# `main:app` builds the default application on first access; servers can
+# also call the factory (uvicorn --factory main:create_app).
+
+def create_app(settings: Optional[AppSettings] = None) -> "FastAPI":
+    """
+    Build the API application
+
+    Nothing here touches the database or the filesystem; the lifespan does
+    that when the server starts.
+
+    Args:
+        settings: CORS origins, static directory and startup checks;
+            defaults to the environment's
+
+    Returns:
+        The configured FastAPI application
+    """
+    settings = settings or AppSettings()
+
+    from fastapi import Depends, FastAPI, Query, Response
+    from fastapi.concurrency import run_in_threadpool
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.staticfiles import StaticFiles
+    from core.database import engine, async_engine, get_pool_stats
+    from core.pagination import NEXT_CURSOR_HEADER
+    from core.replicas import ReadYourWritesMiddleware, READ_YOUR_WRITES_HEADER, replica_router
+    from core.sql_instrumentation import SQLInstrumentationMiddleware, sql_instrumentation
+    from core.slow_queries import slow_query_log
+    from core.cache import get_cache_stats
+    from core.password_hasher import password_hasher
+    from core.metrics import (
+        MetricsMiddleware, MetricsWriter, request_metrics, CONTENT_TYPE,
+        write_request_metrics, write_pool_metrics, write_cache_metrics,
+        write_password_hasher_metrics, write_sql_metrics
+    )
+    from services.user_service.router import router as user_router
+    from services.auth_service.router import router as auth_router
+    from services.auth_service.middleware import get_admin_user_async
+    from services.auth_service.user_info_router import router as user_info_router
+    from services.seller_service.router import router as seller_router
+    from services.product_service.router import router as product_router
+    from services.product_service.category_router import router as category_router
+    from services.file_service.router import router as file_router
+    from services.file_service.service import product_image_dir
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Create static directory for file uploads if it doesn't exist
+        os.makedirs(product_image_dir(settings.static_dir), exist_ok=True)
+
+        # The schema is managed by migrations (alembic upgrade head); refuse
+        # to serve from a database that has not been migrated
+        if settings.schema_check:
+            from core.schema_version import check_schema_version
+            await run_in_threadpool(check_schema_version, engine)
+
+        yield
+
+        # Let queued work finish and close pooled connections
+        password_hasher.shutdown()
+        slow_query_log.shutdown()
+        await async_engine.dispose()
+        engine.dispose()
+
+    # Create the FastAPI app
+    app = FastAPI(
+        title="E-Commerce API",
+        description="API for E-Commerce platform",
+        version="0.1.0",
+        lifespan=lifespan
+    )
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=list(settings.cors_origins),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, READ_YOUR_WRITES_HEADER],
+    )
+
+    # Keep clients that just wrote on the primary database for their reads
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    # Count and time SQL statements per request (Server-Timing header and logs)
+    sql_instrumentation.install()
+    app.add_middleware(SQLInstrumentationMiddleware)
+
+    # Keep statements slower than SLOW_QUERY_MS for /admin/slow-queries
+    slow_query_log.install()
+
+    # Request counts and latencies for /metrics; added last so it times the
+    # whole middleware stack
+    app.add_middleware(MetricsMiddleware)
+
+    # Mount static directory to serve uploaded files; the lifespan creates it
+    # and uploads are written below it (services/file_service/router.py)
+    app.state.static_dir = settings.static_dir
+    app.mount("/static", StaticFiles(directory=settings.static_dir, check_dir=False), name="static")
+
+    # Include service routers
+    app.include_router(user_router)
+    app.include_router(auth_router)
+    app.include_router(user_info_router)
+    app.include_router(seller_router)
+    app.include_router(product_router)
+    app.include_router(category_router)
+    app.include_router(file_router)
+
+    # Root endpoint
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to the E-Commerce API"}
+
+    # Health check endpoint
+    @app.get("/health")
+    def health_check():
+        return {"status": "healthy"}
+
+    # Connection pool usage of this worker
+    @app.get("/health/db")
+    def database_health():
+        return {
+            "status": "healthy",
+            "pool": get_pool_stats(),
+            "async_pool": get_pool_stats(async_engine),
+            "reads": replica_router.stats()
+        }
+
+    # Prometheus metrics of this worker
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        writer = MetricsWriter()
+        write_request_metrics(writer, request_metrics)
+        write_pool_metrics(writer, {
+            "primary": get_pool_stats(),
+            "primary_async": get_pool_stats(async_engine),
+            **replica_router.pool_stats()
+        })
+        write_cache_metrics(writer, get_cache_stats())
+        write_password_hasher_metrics(writer, password_hasher.stats())
+        write_sql_metrics(writer, sql_instrumentation.stats())
+        return Response(content=writer.render(), media_type=CONTENT_TYPE)
+
+    # Slowest recent statements of this worker, newest first
+    @app.get("/admin/slow-queries", dependencies=[Depends(get_admin_user_async)])
+    async def slow_queries(limit: int = Query(50, ge=1, le=1000)):
+        return {
+            **slow_query_log.stats(),
+            "queries": slow_query_log.entries(limit)
+        }
+
+    return app
+
+def __getattr__(name: str):
+    # Build the default app the first time `main.app` is looked up
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,118 @@
+"""Baseline schema: the tables the app created with create_all() before migrations
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 20:15:11
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('categories',
+    sa.Column('category_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('category_id'),
+    sa.UniqueConstraint('name')
+    )
+
+    op.create_table('users',
+    sa.Column('user_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=False),
+    sa.Column('last_name', sa.String(length=100), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id'),
+    sa.UniqueConstraint('email')
+    )
+
+    op.create_table('orders',
+    sa.Column('order_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('order_date', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('total_amount', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('shipping_address', sa.Text(), nullable=False),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('order_status', sa.Enum('pending', 'processing', 'shipped', 'delivered', 'cancelled', name='order_status_enum'), nullable=True),
+    sa.Column('tracking_number', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('status_updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('status_updated_by', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.PrimaryKeyConstraint('order_id')
+    )
+
+    op.create_table('sellers',
+    sa.Column('seller_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('business_name', sa.String(length=255), nullable=True),
+    sa.Column('business_description', sa.Text(), nullable=True),
+    sa.Column('id_type', sa.String(length=50), nullable=False),
+    sa.Column('number_id', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('seller_id'),
+    sa.UniqueConstraint('user_id')
+    )
+
+    op.create_table('products',
+    sa.Column('product_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('stock_quantity', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['seller_id'], ['sellers.seller_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+
+    op.create_table('order_items',
+    sa.Column('order_item_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('price_per_unit', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('subtotal', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.order_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ),
+    sa.PrimaryKeyConstraint('order_item_id')
+    )
+
+    op.create_table('product_categories',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.category_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'category_id')
+    )
+
+    op.create_table('product_images',
+    sa.Column('image_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('image_url', sa.String(length=255), nullable=False),
+    sa.Column('is_primary', sa.Boolean(), nullable=True),
+    sa.Column('display_order', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('image_id')
+    )
+
+def downgrade() -> None:
+    op.drop_table('product_images')
+    op.drop_table('product_categories')
+    op.drop_table('order_items')
+    op.drop_table('products')
+    op.drop_table('sellers')
+    op.drop_table('orders')
+    op.drop_table('users')
+    op.drop_table('categories')
+    sa.Enum(name='order_status_enum').drop(op.get_bind(), checkfirst=True)
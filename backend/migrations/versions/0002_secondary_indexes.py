@@ -0,0 +1,36 @@
+"""Secondary indexes for foreign keys and the product listing orders
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 20:20:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_product_categories_category_id', 'product_categories', ['category_id', 'product_id']),
+    ('ix_products_seller_id_product_id', 'products', ['seller_id', 'product_id']),
+    ('ix_products_price_product_id', 'products', ['price', 'product_id']),
+    ('ix_products_seller_id_price_product_id', 'products', ['seller_id', 'price', 'product_id']),
+    ('ix_products_name_product_id', 'products', ['name', 'product_id']),
+    ('ix_products_seller_id_name_product_id', 'products', ['seller_id', 'name', 'product_id']),
+    ('ix_product_images_product_id', 'product_images', ['product_id']),
+    ('ix_orders_user_id', 'orders', ['user_id']),
+    ('ix_order_items_order_id', 'order_items', ['order_id']),
+    ('ix_order_items_product_id', 'order_items', ['product_id']),
+]
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,34 @@
+"""Full-text search vector on products (PostgreSQL only)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 20:21:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Other databases search with the in-process index
+    # (services/product_service/search.py)
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "ALTER TABLE products ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.execute("CREATE INDEX ix_products_search_vector ON products USING GIN (search_vector)")
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX ix_products_search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN search_vector")
@@ -0,0 +1,119 @@
+"""product_cards listing read model, filled for the existing products
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 20:22:00
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Products whose cards are built per round of queries
+BACKFILL_CHUNK_SIZE = 500
+
+# The tables as they stand at this revision, independent of models.py
+products = sa.table(
+    'products',
+    sa.column('product_id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('price', sa.DECIMAL(10, 2)),
+    sa.column('stock_quantity', sa.Integer),
+    sa.column('updated_at', sa.DateTime),
+)
+product_images = sa.table(
+    'product_images',
+    sa.column('image_id', sa.Integer),
+    sa.column('product_id', sa.Integer),
+    sa.column('image_url', sa.String),
+    sa.column('is_primary', sa.Boolean),
+    sa.column('display_order', sa.Integer),
+)
+product_categories = sa.table(
+    'product_categories',
+    sa.column('product_id', sa.Integer),
+    sa.column('category_id', sa.Integer),
+)
+categories = sa.table(
+    'categories',
+    sa.column('category_id', sa.Integer),
+    sa.column('name', sa.String),
+)
+
+def upgrade() -> None:
+    product_cards = op.create_table('product_cards',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+    sa.Column('in_stock', sa.Boolean(), nullable=False),
+    sa.Column('primary_image_url', sa.String(length=255), nullable=True),
+    sa.Column('category_names', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.product_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    # Reading the products needs a connection; upgrade --sql output leaves
+    # the new table empty, so run this revision online on such databases
+    if not context.is_offline_mode():
+        backfill(op.get_bind(), product_cards)
+
+def backfill(conn, product_cards) -> None:
+    """One card per existing product, built the way the card service builds them"""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(products)
+            .where(products.c.product_id > last_id)
+            .order_by(products.c.product_id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].product_id
+        product_ids = [row.product_id for row in rows]
+
+        # Primary image first, then by display order (unset last) and age
+        primary_images = {}
+        for product_id, image_url in conn.execute(
+            sa.select(product_images.c.product_id, product_images.c.image_url)
+            .where(product_images.c.product_id.in_(product_ids))
+            .order_by(
+                product_images.c.product_id,
+                product_images.c.is_primary.desc(),
+                product_images.c.display_order.is_(None),
+                product_images.c.display_order,
+                product_images.c.image_id
+            )
+        ):
+            primary_images.setdefault(product_id, image_url)
+
+        category_names = defaultdict(list)
+        for product_id, name in conn.execute(
+            sa.select(product_categories.c.product_id, categories.c.name)
+            .join(categories, categories.c.category_id == product_categories.c.category_id)
+            .where(product_categories.c.product_id.in_(product_ids))
+            .order_by(categories.c.name)
+        ):
+            category_names[product_id].append(name)
+
+        conn.execute(product_cards.insert(), [
+            {
+                "product_id": row.product_id,
+                "name": row.name,
+                "price": row.price,
+                "in_stock": (row.stock_quantity or 0) > 0,
+                "primary_image_url": primary_images.get(row.product_id),
+                "category_names": category_names.get(row.product_id, []),
+                "updated_at": row.updated_at,
+            }
+            for row in rows
+        ])
+
+def downgrade() -> None:
+    op.drop_table('product_cards')
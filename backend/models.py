@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, Enum, DateTime, DECIMAL, Table
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey, Enum, DateTime, DECIMAL, JSON, Table, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.orm import declarative_base
@@ -10,7 +10,9 @@ product_categories = Table(
     'product_categories',
     Base.metadata,
     Column('product_id', Integer, ForeignKey('products.product_id', ondelete='CASCADE'), primary_key=True),
-    Column('category_id', Integer, ForeignKey('categories.category_id', ondelete='CASCADE'), primary_key=True)
+    Column('category_id', Integer, ForeignKey('categories.category_id', ondelete='CASCADE'), primary_key=True),
+    # The primary key starts with product_id; this serves category listings
+    Index('ix_product_categories_category_id', 'category_id', 'product_id')
 )
 
 class User(Base):
@@ -45,6 +47,16 @@ class Seller(Base):
 
 class Product(Base):
     __tablename__ = 'products'
+    __table_args__ = (
+        # Seller listings, ordered by id (or newest first) for keyset pagination
+        Index('ix_products_seller_id_product_id', 'seller_id', 'product_id'),
+        # sort=price and price ranges, overall and per seller
+        Index('ix_products_price_product_id', 'price', 'product_id'),
+        Index('ix_products_seller_id_price_product_id', 'seller_id', 'price', 'product_id'),
+        # sort=name, overall and per seller
+        Index('ix_products_name_product_id', 'name', 'product_id'),
+        Index('ix_products_seller_id_name_product_id', 'seller_id', 'name', 'product_id'),
+    )
 
     product_id = Column(Integer, primary_key=True, autoincrement=True)
     seller_id = Column(Integer, ForeignKey('sellers.seller_id', ondelete='CASCADE'), nullable=False)
@@ -61,6 +73,33 @@ class Product(Base):
     categories = relationship("Category", secondary=product_categories, back_populates="products")
     order_items = relationship("OrderItem", back_populates="product")
 
+# Full-text search vector kept up to date by Postgres itself. It is not mapped
+# on the model; queries reference it as products.search_vector. Databases
+# without full-text search (SQLite in tests and development) use the
+# in-process index in services/product_service/search.py instead.
+# Migration 0003 adds the same column to migrated databases; these hooks
+# cover schemas built with create_all (the tests).
+PRODUCT_SEARCH_CONFIG = "simple"
+
+event.listen(
+    Product.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE products ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{PRODUCT_SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+        f"setweight(to_tsvector('{PRODUCT_SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+        ") STORED"
+    ).execute_if(dialect="postgresql")
+)
+event.listen(
+    Product.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_products_search_vector ON products USING GIN (search_vector)"
+    ).execute_if(dialect="postgresql")
+)
+
 class Category(Base):
     __tablename__ = 'categories'
 
@@ -74,7 +113,7 @@ class ProductImage(Base):
     __tablename__ = 'product_images'
 
     image_id = Column(Integer, primary_key=True, autoincrement=True)
-    product_id = Column(Integer, ForeignKey('products.product_id', ondelete='CASCADE'), nullable=False)
+    product_id = Column(Integer, ForeignKey('products.product_id', ondelete='CASCADE'), nullable=False, index=True)
     image_url = Column(String(255), nullable=False)
     is_primary = Column(Boolean, default=False)
     display_order = Column(Integer)
@@ -82,11 +121,24 @@ class ProductImage(Base):
     # Relationships
     product = relationship("Product", back_populates="images")
 
+# Denormalised listing row, one per product, holding only what a product
+# card shows. Kept in sync by services/product_service/card_service.py.
+class ProductCard(Base):
+    __tablename__ = 'product_cards'
+
+    product_id = Column(Integer, ForeignKey('products.product_id', ondelete='CASCADE'), primary_key=True)
+    name = Column(String(255), nullable=False)
+    price = Column(DECIMAL(10, 2), nullable=False)
+    in_stock = Column(Boolean, nullable=False)
+    primary_image_url = Column(String(255))
+    category_names = Column(JSON, nullable=False, default=list)
+    updated_at = Column(DateTime)
+
 class Order(Base):
     __tablename__ = 'orders'
 
     order_id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, ForeignKey('users.user_id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.user_id'), nullable=False, index=True)
     order_date = Column(DateTime, server_default=func.now())
     total_amount = Column(DECIMAL(10, 2), nullable=False)
     shipping_address = Column(Text, nullable=False)
@@ -105,12 +157,23 @@ class OrderItem(Base):
     __tablename__ = 'order_items'
 
     order_item_id = Column(Integer, primary_key=True, autoincrement=True)
-    order_id = Column(Integer, ForeignKey('orders.order_id', ondelete='CASCADE'), nullable=False)
-    product_id = Column(Integer, ForeignKey('products.product_id'), nullable=False)
+    order_id = Column(Integer, ForeignKey('orders.order_id', ondelete='CASCADE'), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey('products.product_id'), nullable=False, index=True)
     quantity = Column(Integer, nullable=False)
     price_per_unit = Column(DECIMAL(10, 2), nullable=False)
     subtotal = Column(DECIMAL(10, 2), nullable=False)
 
     # Relationships
     order = relationship("Order", back_populates="order_items")
-    product = relationship("Product", back_populates="order_items") 
\ No newline at end of file
+    product = relationship("Product", back_populates="order_items")
+
+# Revoked access and refresh tokens by JWT id, kept until the token expires.
+# Read through the in-memory filter in services/auth_service/revocation.py.
+class RevokedToken(Base):
+    __tablename__ = 'revoked_tokens'
+
+    jti = Column(String(64), primary_key=True)
+    # Naive UTC, from the token's exp claim
+    expires_at = Column(DateTime, nullable=False, index=True)
+    # Incremental syncs read rows newer than the last one they saw
+    revoked_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
@@ -0,0 +1,155 @@
+"""
+Startup benchmark: import time of main and time to the first response.
+
+Every run is a fresh interpreter, so the numbers are cold starts as a new
+worker sees them. Run from backend/:
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --server --budget-ms 150
+
+APP_ENV defaults to "test" (in-memory SQLite, no schema check) so the
+benchmark needs no database; set it to measure another profile.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Phases of one in-process start, measured inside the child interpreter
+FIRST_RESPONSE_SNIPPET = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.create_app()
+created = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    started_up = time.perf_counter()
+    status = client.get("/health").status_code
+    responded = time.perf_counter()
+print(json.dumps({
+    "import_main_ms": (imported - started) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "lifespan_ms": (started_up - created) * 1000,
+    "first_request_ms": (responded - started_up) * 1000,
+    "status": status,
+}))
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("APP_ENV", "test")
+    return env
+
+def import_times(module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Import a module under python -X importtime
+
+    Returns:
+        The module's cumulative import time in ms, and its direct imports
+        with their cumulative times, slowest first
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=child_env(), capture_output=True, text=True, check=True
+    )
+    total = 0.0
+    children: List[Tuple[str, float]] = []
+    # Imports are listed after their own imports, so the direct imports of a
+    # top-level module are the level-2 lines just before it
+    pending: List[Tuple[str, float]] = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3))
+        name = match.group(4)
+        if depth == 3:
+            pending.append((name, cumulative_ms))
+        elif depth == 1:
+            if name == module:
+                total, children = cumulative_ms, pending
+            pending = []
+    return total, sorted(children, key=lambda child: child[1], reverse=True)
+
+def first_response() -> Dict[str, float]:
+    """Start a fresh interpreter and serve one in-process request"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_RESPONSE_SNIPPET],
+        cwd=BACKEND_DIR, env=child_env(), capture_output=True, text=True, check=True
+    )
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    phases["process_total_ms"] = (time.perf_counter() - started) * 1000
+    return phases
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_first_response(timeout: float = 30.0) -> float:
+    """Start uvicorn on main:app and time until GET /health answers, in ms"""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=child_env()
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"uvicorn did not answer within {timeout} seconds")
+    finally:
+        server.terminate()
+        server.wait()
+
+def _summary(values: List[float]) -> str:
+    return f"median {statistics.median(values):8.1f} ms   min {min(values):8.1f} ms   max {max(values):8.1f} ms"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports of main to list")
+    parser.add_argument("--server", action="store_true", help="also time a real uvicorn start")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if the median `import main` exceeds this")
+    args = parser.parse_args()
+
+    import_runs = [import_times("main") for _ in range(args.runs)]
+    import_totals = [total for total, _ in import_runs]
+    print(f"import main (-X importtime)     {_summary(import_totals)}")
+    for name, cumulative_ms in import_runs[-1][1][:args.top]:
+        print(f"    {name:<40} {cumulative_ms:8.1f} ms")
+
+    runs = [first_response() for _ in range(args.runs)]
+    for phase in ("import_main_ms", "create_app_ms", "lifespan_ms", "first_request_ms", "process_total_ms"):
+        print(f"{phase:<32}{_summary([run[phase] for run in runs])}")
+
+    if args.server:
+        print(f"{'uvicorn first response':<32}{_summary([server_first_response() for _ in range(args.runs)])}")
+
+    if args.budget_ms is not None and statistics.median(import_totals) > args.budget_ms:
+        print(f"import main exceeds its budget of {args.budget_ms} ms", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
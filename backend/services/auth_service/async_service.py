@@ -0,0 +1,105 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from typing import Optional, Dict, Any
+
+from models import User, Seller
+from core.password_hasher import password_hasher
+from services.user_service.async_service import AsyncUserService
+from .schemas import Token, LoginRequest
+from .service import AuthService, token_expiry, invalid_refresh_token
+from .revocation import revocation_list
+
+class AsyncAuthService:
+    """
+    AuthService for async routes
+    
+    Token building and verification are shared with AuthService; only the
+    database access and the bcrypt wait are awaited.
+    """
+    
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+        """
+        Authenticate a user with email and password
+        
+        Raises:
+            HTTPException: 503 if the password hashing pool is saturated
+        """
+        user = await AsyncUserService.get_user_by_email(db, email)
+        
+        if not user or not await password_hasher.verify_async(password, user.password_hash):
+            return None
+        
+        return user
+    
+    @staticmethod
+    async def get_token_data(db: AsyncSession, user: User) -> Dict[str, Any]:
+        """Get token claims including roles, user_id and seller_id"""
+        seller_id = await db.scalar(select(Seller.seller_id).where(Seller.user_id == user.user_id))
+        return AuthService.build_token_data(user, seller_id)
+    
+    @staticmethod
+    async def login(db: AsyncSession, login_data: LoginRequest) -> Token:
+        """
+        Process login request and create access and refresh tokens
+        
+        Raises:
+            HTTPException: If authentication fails
+        """
+        user = await AsyncAuthService.authenticate_user(db, login_data.email, login_data.password)
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        token_data = await AsyncAuthService.get_token_data(db, user)
+        return AuthService.issue_tokens(user, token_data)
+    
+    @staticmethod
+    async def refresh(db: AsyncSession, refresh_token: str) -> Token:
+        """
+        Exchange a refresh token for a new access and refresh token
+        
+        The refresh token is single use: it is revoked as part of the
+        exchange, so replaying it (or racing another refresh with it) fails.
+        
+        Args:
+            db: Async database session
+            refresh_token: Refresh token from login or a previous refresh
+            
+        Returns:
+            Token with new access and refresh tokens and user info
+            
+        Raises:
+            HTTPException: 401 if the refresh token is invalid, expired or
+                already used, or the user no longer exists
+        """
+        payload = AuthService.decode_refresh_token(refresh_token)
+        if await db.run_sync(revocation_list.is_revoked, payload["jti"]):
+            raise invalid_refresh_token()
+        
+        user = await AsyncUserService.get_user_by_email(db, payload["sub"])
+        if not user:
+            raise invalid_refresh_token()
+        
+        # Rotate: only one exchange can record the revocation
+        if not await db.run_sync(revocation_list.revoke, payload["jti"], token_expiry(payload)):
+            raise invalid_refresh_token()
+        
+        token_data = await AsyncAuthService.get_token_data(db, user)
+        return AuthService.issue_tokens(user, token_data)
+    
+    @staticmethod
+    async def logout(db: AsyncSession, access_payload: Dict[str, Any], refresh_token: Optional[str] = None) -> None:
+        """
+        Revoke the current access token and, if given, a refresh token
+        
+        Raises:
+            HTTPException: 401 if the refresh token is invalid or belongs
+                to another user
+        """
+        await db.run_sync(AuthService.logout, access_payload, refresh_token)
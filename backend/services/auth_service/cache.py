@@ -0,0 +1,82 @@
+import time
+from typing import Any, Dict, Optional, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from core.cache import TTLCache
+from core.config import AUTH_CACHE_ENABLED, AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS
+
+T = TypeVar("T")
+
+# Decoded JWT payloads keyed by the raw token. An entry never outlives the
+# token's own expiry.
+token_cache = TTLCache(
+    "auth_tokens",
+    max_entries=AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=AUTH_CACHE_TTL_SECONDS,
+    enabled=AUTH_CACHE_ENABLED
+)
+
+# Detached User and Seller snapshots keyed by ("user", email) and
+# ("seller", seller_id). UserService and SellerService write methods evict
+# the affected keys after committing.
+principal_cache = TTLCache(
+    "auth_principals",
+    max_entries=AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=AUTH_CACHE_TTL_SECONDS,
+    enabled=AUTH_CACHE_ENABLED
+)
+
+def user_key(email: str) -> tuple:
+    return ("user", email)
+
+def seller_key(seller_id: int) -> tuple:
+    return ("seller", seller_id)
+
+def get_cached_payload(token: str) -> Optional[Dict[str, Any]]:
+    """Return the decoded payload of a token seen before, if still cached"""
+    return token_cache.get(token)
+
+def cache_payload(token: str, payload: Dict[str, Any]) -> None:
+    """Remember a decoded payload until the token or the cache entry expires"""
+    expires_at = payload.get("exp")
+    ttl_seconds = None
+    if isinstance(expires_at, (int, float)):
+        ttl_seconds = expires_at - time.time()
+    token_cache.set(token, payload, ttl_seconds=ttl_seconds)
+
+def snapshot(instance: T) -> T:
+    """
+    Copy the column attributes of a loaded instance into a detached object
+
+    The copy belongs to no session, so it can be shared between requests;
+    attach it to a request session with attach().
+    """
+    mapper = inspect(instance).mapper
+    copy = mapper.class_(**{
+        attribute.key: getattr(instance, attribute.key)
+        for attribute in mapper.column_attrs
+    })
+    make_transient_to_detached(copy)
+    return copy
+
+def attach(db: Session, cached: T) -> T:
+    """
+    Return a session-bound instance for a cached snapshot without a query
+
+    Relationships are not part of the snapshot and lazy-load from the
+    session as usual.
+    """
+    return db.merge(cached, load=False)
+
+def invalidate_user(email: str, seller_id: Optional[int] = None) -> None:
+    """Forget a user, and its seller profile when seller_id is given"""
+    keys = [user_key(email)]
+    if seller_id is not None:
+        keys.append(seller_key(seller_id))
+    principal_cache.evict_many(keys)
+
+def invalidate_seller(seller_id: int) -> None:
+    """Forget a seller profile"""
+    principal_cache.evict(seller_key(seller_id))
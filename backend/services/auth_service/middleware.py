@@ -1,29 +1,85 @@
+from typing import Any, Callable, Dict, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from core.database import get_db
-from core.security import SECRET_KEY, ALGORITHM
+from core.config import ADMIN_EMAILS
+from core.database import get_db, get_async_db
+from core.security import SECRET_KEY, ALGORITHM, REFRESH_TOKEN_TYPE
 from models import User, Seller
+from .cache import (
+    principal_cache, user_key, seller_key,
+    get_cached_payload, cache_payload, snapshot, attach
+)
+from .revocation import revocation_list
 
 # Define OAuth2 scheme with the correct token URL for Swagger UI
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+def decode_access_token(token: str) -> Dict[str, Any]:
     """
-    Dependency to get the current authenticated user from JWT token
+    Decode and verify a JWT, reusing the result for tokens seen recently
+    
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    payload = get_cached_payload(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        cache_payload(token, payload)
+    return payload
+
+def is_usable_access_token(db: Session, payload: Dict[str, Any]) -> bool:
+    """
+    Reject refresh tokens and revoked tokens
+    
+    The revocation check is answered from memory for tokens that were
+    never revoked; tokens issued without a jti cannot be revoked.
+    """
+    if payload.get("type") == REFRESH_TOKEN_TYPE:
+        return False
+    jti = payload.get("jti")
+    return jti is None or not revocation_list.is_revoked(db, jti)
+
+def _resolve_principal(db: Session, key: tuple, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+    """Return the cached principal for key attached to db, loading it on a miss"""
+    cached = principal_cache.get(key)
+    if cached is not None:
+        return attach(db, cached)
+    
+    generation = principal_cache.generation
+    principal = load()
+    if principal is not None:
+        principal_cache.set(key, snapshot(principal), generation=generation)
+    return principal
+
+def resolve_user(db: Session, email: str) -> Optional[User]:
+    """Get the user a token was issued to, from the principal cache when possible"""
+    # Import here to avoid circular imports
+    from services.user_service.service import UserService
+    
+    return _resolve_principal(
+        db, user_key(email), lambda: UserService.get_user_by_email(db, email=email)
+    )
+
+def resolve_seller(db: Session, seller_id: int) -> Optional[Seller]:
+    """Get a seller profile by primary key, from the principal cache when possible"""
+    # Import here to avoid circular imports
+    from services.seller_service.service import SellerService
+    
+    return _resolve_principal(
+        db, seller_key(seller_id), lambda: SellerService.get_seller_by_id(db, seller_id=seller_id)
+    )
+
+def user_from_token(db: Session, token: str) -> User:
+    """
+    Authenticate a bearer token and return its user
+    
+    Shared by the sync and async dependencies; the async ones run it on
+    the AsyncSession's underlying Session.
     
-    Args:
-        token: JWT token from Authorization header
-        db: Database session
-        
-    Returns:
-        User: The authenticated user
-        
     Raises:
         HTTPException: If token is invalid or user not found
     """
@@ -35,16 +91,13 @@ def get_current_user(
     
     try:
         # Decode JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
-        if email is None:
+        if email is None or not is_usable_access_token(db, payload):
             raise credentials_exception
             
-        # Import here to avoid circular imports
-        from services.user_service.service import UserService
-        
         # Token valid, get user
-        user = UserService.get_user_by_email(db, email=email)
+        user = resolve_user(db, email)
         if user is None:
             raise credentials_exception
             
@@ -53,6 +106,36 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token
+    
+    Decoded tokens and users are cached for a short time, so repeat
+    requests with the same token skip both the signature check and the
+    user query.
+    
+    Args:
+        token: JWT token from Authorization header
+        db: Database session
+        
+    Returns:
+        User: The authenticated user
+        
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    return user_from_token(db, token)
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user for async routes, on the request's AsyncSession"""
+    return await db.run_sync(user_from_token, token)
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -77,24 +160,19 @@ def get_current_active_user(
     #     )
     return current_user
 
-def get_current_seller(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Seller:
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    """get_current_active_user for async routes"""
+    return current_user
+
+def seller_from_token(db: Session, token: str) -> Seller:
     """
-    Dependency to verify the current user has a seller profile.
-    This checks both the JWT token for seller role and the database
-    for the seller profile.
+    Authenticate a bearer token and return its seller profile
     
-    Args:
-        token: JWT token from Authorization header
-        db: Database session
-        
-    Returns:
-        Seller: The seller profile of the authenticated user
-        
     Raises:
-        HTTPException: If user is not a seller
+        HTTPException: 401 if the token is invalid, 403 if it does not
+            belong to a seller
     """
     # First, authenticate the user
     credentials_exception = HTTPException(
@@ -110,22 +188,28 @@ def get_current_seller(
     
     try:
         # Decode JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         roles: list = payload.get("roles", [])
         
-        if email is None:
+        if email is None or not is_usable_access_token(db, payload):
             raise credentials_exception
             
         # Check if seller role is in the token
         if "seller" not in roles:
             raise forbidden_exception
             
-        # Import here to avoid circular imports
-        from services.user_service.service import UserService
-        
+        seller_id = payload.get("seller_id")
+        if seller_id is not None:
+            # Deleting a user deletes its seller profile, so an existing
+            # profile still owned by the token's user authenticates it
+            seller = resolve_seller(db, seller_id)
+            if not seller or seller.user_id != payload.get("user_id"):
+                raise forbidden_exception
+            return seller
+            
         # Get user
-        user = UserService.get_user_by_email(db, email=email)
+        user = resolve_user(db, email)
         if user is None:
             raise credentials_exception
             
@@ -139,6 +223,53 @@ def get_current_seller(
     except JWTError:
         raise credentials_exception
 
+def get_current_seller(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Seller:
+    """
+    Dependency to verify the current user has a seller profile.
+    This checks both the JWT token for seller role and the database
+    for the seller profile.
+    
+    Tokens carry the seller_id and user_id claims, so the profile is
+    resolved with one primary key lookup (or none, on a cache hit) without
+    loading the user. Tokens issued without these claims fall back to
+    resolving the user by email first.
+    
+    Args:
+        token: JWT token from Authorization header
+        db: Database session
+        
+    Returns:
+        Seller: The seller profile of the authenticated user
+        
+    Raises:
+        HTTPException: If user is not a seller
+    """
+    return seller_from_token(db, token)
+
+async def get_current_seller_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Seller:
+    """get_current_seller for async routes, on the request's AsyncSession"""
+    return await db.run_sync(seller_from_token, token)
+
+def admin_from_user(current_user: User) -> User:
+    """
+    Check that a user is one of the configured admins (ADMIN_EMAILS)
+    
+    Raises:
+        HTTPException: 403 if the user is not an admin
+    """
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions"
+        )
+    return current_user
+
 def get_admin_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -154,11 +285,10 @@ def get_admin_user(
     Raises:
         HTTPException: If user is not an admin
     """
-    # We need to implement this when the is_admin field is added to User model
-    # For now, it's just a placeholder
-    # if not current_user.is_admin:
-    #     raise HTTPException(
-    #         status_code=status.HTTP_403_FORBIDDEN,
-    #         detail="Insufficient permissions"
-    #     )
-    return current_user
\ No newline at end of file
+    return admin_from_user(current_user)
+
+async def get_admin_user_async(
+    current_user: User = Depends(get_current_user_async)
+) -> User:
+    """get_admin_user for async routes"""
+    return admin_from_user(current_user)
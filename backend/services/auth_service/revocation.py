@@ -0,0 +1,183 @@
+import threading
+import time
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.bloom import BloomFilter
+from core.cache import register_cache
+from core.config import (
+    REVOCATION_FILTER_CAPACITY, REVOCATION_FILTER_ERROR_RATE,
+    REVOCATION_SYNC_SECONDS, REVOCATION_REBUILD_SECONDS
+)
+from models import RevokedToken
+
+# Re-read revocations this far behind the newest one seen, so rows committed
+# late by another worker with an earlier revoked_at are not skipped
+SYNC_OVERLAP = timedelta(seconds=60)
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+class RevocationList:
+    """
+    Process-local view of revoked_tokens for the authentication hot path.
+
+    Revoked ids live in a Bloom filter: a token that was never revoked is
+    accepted without a query (no false negatives), and only the rare
+    filter hits are confirmed against the table. Every sync_seconds the
+    next check reads the rows revoked since the previous sync; every
+    rebuild_seconds the filter is rebuilt from scratch, which drops
+    expired ids and resizes it to the number of live revocations.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, sync_seconds: float, rebuild_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+
+        self._sync_lock = threading.Lock()
+        self._filter = BloomFilter(capacity, error_rate)
+        self._loaded = False
+        # Newest revoked_at read from the table; None while it is empty
+        self._watermark: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._next_rebuild = 0.0
+        self._next_prune = 0.0
+
+        self.checks = 0
+        self.filter_hits = 0
+        self.false_positives = 0
+        self.syncs = 0
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        """
+        Check whether a token id was revoked
+
+        Costs no query unless a sync is due or the filter reports a hit.
+        """
+        self.maybe_sync(db)
+        self.checks += 1
+        if jti not in self._filter:
+            return False
+
+        self.filter_hits += 1
+        revoked = db.execute(
+            select(RevokedToken.jti).where(RevokedToken.jti == jti)
+        ).first() is not None
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> bool:
+        """
+        Record a revocation and commit it
+
+        Args:
+            db: Database session
+            jti: Token id
+            expires_at: Token expiry (naive UTC); the row is pruned after it
+
+        Returns:
+            False if the token was already revoked, e.g. by a concurrent
+            refresh with the same token
+        """
+        db.add(RevokedToken(jti=jti, expires_at=expires_at))
+        if time.monotonic() >= self._next_prune:
+            self.prune(db)
+            self._next_prune = time.monotonic() + self.rebuild_seconds
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+
+        self._filter.add(jti)
+        return True
+
+    def maybe_sync(self, db: Session) -> None:
+        """Run a sync or rebuild if one is due and no other thread is running it"""
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            if now >= self._next_rebuild or not self._loaded:
+                self._rebuild(db)
+                self._next_rebuild = now + self.rebuild_seconds
+            else:
+                self._sync(db)
+            self._next_sync = now + self.sync_seconds
+            self.syncs += 1
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self, db: Session) -> None:
+        query = select(RevokedToken.jti, RevokedToken.revoked_at)
+        if self._watermark is not None:
+            query = query.where(RevokedToken.revoked_at >= self._watermark - SYNC_OVERLAP)
+        for jti, revoked_at in db.execute(query):
+            self._filter.add(jti)
+            self._watermark = revoked_at if self._watermark is None else max(self._watermark, revoked_at)
+
+    def _rebuild(self, db: Session) -> None:
+        rows = db.execute(
+            select(RevokedToken.jti, RevokedToken.revoked_at)
+            .where(RevokedToken.expires_at > _utcnow())
+        ).all()
+
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for jti, _ in rows:
+            bloom.add(jti)
+
+        # Swap in one assignment; readers see either the old or new filter
+        self._filter = bloom
+        self._watermark = max((revoked_at for _, revoked_at in rows), default=None)
+        self._loaded = True
+
+    @staticmethod
+    def prune(db: Session) -> int:
+        """
+        Delete revocations of tokens that have expired anyway
+
+        Does not commit. Returns the number of rows deleted.
+        """
+        result = db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= _utcnow()))
+        return result.rowcount or 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._filter.stats(),
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "false_positives": self.false_positives,
+            "syncs": self.syncs,
+        }
+
+    def reset(self) -> None:
+        """
+        Empty the filter and zero the counters
+
+        The next sync, after sync_seconds, reloads every live revocation.
+        """
+        with self._sync_lock:
+            self._filter = BloomFilter(self.capacity, self.error_rate)
+            self._loaded = False
+            self._watermark = None
+            self._next_sync = time.monotonic() + self.sync_seconds
+            self._next_rebuild = 0.0
+            self.checks = self.filter_hits = self.false_positives = self.syncs = 0
+
+# Process-wide revocation list used by the auth dependencies
+revocation_list = RevocationList(
+    capacity=REVOCATION_FILTER_CAPACITY,
+    error_rate=REVOCATION_FILTER_ERROR_RATE,
+    sync_seconds=REVOCATION_SYNC_SECONDS,
+    rebuild_seconds=REVOCATION_REBUILD_SECONDS
+)
+register_cache("token_revocations", revocation_list)
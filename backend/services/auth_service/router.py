@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
-from core.database import get_db
+from core.database import get_async_db
 from models import User
-from .schemas import LoginRequest, Token
-from .service import AuthService
-from .middleware import get_current_user
+from .schemas import LoginRequest, Token, RefreshRequest, LogoutRequest
+from .async_service import AsyncAuthService
+from .middleware import get_current_user_async, decode_access_token, oauth2_scheme
 
 router = APIRouter(
     prefix="/auth",
@@ -14,9 +15,9 @@ router = APIRouter(
 )
 
 @router.post("/login", response_model=Token, status_code=status.HTTP_200_OK)
-def login_json(
+async def login_json(
     login_data: LoginRequest, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Authenticate a user using JSON request and return an access token.
@@ -27,12 +28,12 @@ def login_json(
     Returns a token that can be used in the Authorization header
     for protected endpoints.
     """
-    return AuthService.login(db=db, login_data=login_data)
+    return await AsyncAuthService.login(db=db, login_data=login_data)
 
 @router.post("/token", response_model=Token, status_code=status.HTTP_200_OK)
-def login_form(
+async def login_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     OAuth2 compatible token endpoint.
@@ -52,10 +53,46 @@ def login_form(
         password=form_data.password
     )
     
-    return AuthService.login(db=db, login_data=login_data)
+    return await AsyncAuthService.login(db=db, login_data=login_data)
+
+@router.post("/refresh", response_model=Token, status_code=status.HTTP_200_OK)
+async def refresh_token(
+    refresh_data: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    
+    - **refresh_token**: Refresh token from login or a previous refresh
+    
+    Each refresh token can be used once; use the returned refresh token
+    for the next exchange.
+    """
+    return await AsyncAuthService.refresh(db=db, refresh_token=refresh_data.refresh_token)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Revoke the access token in the Authorization header.
+    
+    - **refresh_token**: Optional refresh token to revoke as well
+    
+    Requires a valid JWT token in the Authorization header.
+    """
+    await AsyncAuthService.logout(
+        db=db,
+        access_payload=decode_access_token(token),
+        refresh_token=logout_data.refresh_token if logout_data else None
+    )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @router.get("/me", response_model=dict)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user_async)):
     """
     Get current authenticated user information.
     
@@ -69,7 +106,7 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
     }
 
 @router.post("/verify", response_model=dict)
-def verify_token(current_user: User = Depends(get_current_user)):
+async def verify_token(current_user: User = Depends(get_current_user_async)):
     """
     Verify if a token is valid.
     
@@ -6,6 +6,8 @@ from services.user_service.schemas import UserResponse
 class TokenData(BaseModel):
     """Schema for JWT token payload data"""
     email: Optional[str] = None
+    user_id: Optional[int] = None
+    seller_id: Optional[int] = None
     roles: Optional[List[str]] = None
     exp: Optional[datetime] = None
 
@@ -18,6 +20,7 @@ class UserRoleInfo(BaseModel):
 class Token(BaseModel):
     """Schema for authentication response"""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     user: UserResponse
     roles: List[str] = []
@@ -26,4 +29,12 @@ class Token(BaseModel):
 class LoginRequest(BaseModel):
     """Schema for JSON login request"""
     email: EmailStr = Field(..., description="User email address")
-    password: str = Field(..., description="User password", min_length=1)
\ No newline at end of file
+    password: str = Field(..., description="User password", min_length=1)
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token for new tokens"""
+    refresh_token: str = Field(..., min_length=1)
+
+class LogoutRequest(BaseModel):
+    """Schema for logging out; the refresh token is revoked too when given"""
+    refresh_token: Optional[str] = None
@@ -1,11 +1,28 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from datetime import timedelta
+from datetime import datetime, timedelta, UTC
 from typing import Optional, Dict, Any
+from jose import JWTError, jwt
 
 from models import User, Seller
-from core.security import verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from core.security import (
+    create_access_token, create_refresh_token, ACCESS_TOKEN_EXPIRE_MINUTES,
+    SECRET_KEY, ALGORITHM, REFRESH_TOKEN_TYPE
+)
+from core.password_hasher import password_hasher
 from .schemas import Token, LoginRequest
+from .revocation import revocation_list
+
+def token_expiry(payload: Dict[str, Any]) -> datetime:
+    """Return the exp claim as a naive UTC datetime"""
+    return datetime.fromtimestamp(payload["exp"], UTC).replace(tzinfo=None)
+
+def invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 class AuthService:
     """Service for handling authentication operations"""
@@ -22,6 +39,9 @@ class AuthService:
             
         Returns:
             User object if authentication succeeds, None otherwise
+            
+        Raises:
+            HTTPException: 503 if the password hashing pool is saturated
         """
         # Importing here to avoid circular imports
         from services.user_service.service import UserService
@@ -30,7 +50,7 @@ class AuthService:
         user = UserService.get_user_by_email(db, email)
         
         # Check if user exists and password is correct
-        if not user or not verify_password(password, user.password_hash):
+        if not user or not password_hasher.verify(password, user.password_hash):
             return None
             
         return user
@@ -45,18 +65,34 @@ class AuthService:
             user: User object
             
         Returns:
-            Dictionary with token claims including roles
+            Dictionary with token claims including roles, user_id and,
+            for sellers, seller_id
         """
-        # Basic token data
-        token_data = {"sub": user.email}
-        
         # Check if user is a seller
-        seller = db.query(Seller).filter(Seller.user_id == user.user_id).first()
+        seller_id = db.query(Seller.seller_id).filter(Seller.user_id == user.user_id).scalar()
+        
+        return AuthService.build_token_data(user, seller_id)
+    
+    @staticmethod
+    def build_token_data(user: User, seller_id: Optional[int]) -> Dict[str, Any]:
+        """
+        Build the token claims for a user whose seller_id is already known
+        
+        Args:
+            user: User object
+            seller_id: ID of the user's seller profile, None if there is none
+            
+        Returns:
+            Dictionary with token claims
+        """
+        # Basic token data
+        token_data = {"sub": user.email, "user_id": user.user_id}
         
         # Add roles to token data
         roles = ["user"]
-        if seller:
+        if seller_id is not None:
             roles.append("seller")
+            token_data["seller_id"] = seller_id
             
         # Add is_admin if we implement it later
         # if user.is_admin:
@@ -67,19 +103,21 @@ class AuthService:
         return token_data
     
     @staticmethod
-    def create_token(db: Session, user: User) -> str:
+    def create_token(db: Session, user: User, token_data: Optional[Dict[str, Any]] = None) -> str:
         """
         Create an access token for a user with role information
         
         Args:
             db: Database session
             user: User object
+            token_data: Claims from get_token_data, if the caller already has them
             
         Returns:
             JWT access token
         """
         # Get token data with roles
-        token_data = AuthService.get_token_data(db, user)
+        if token_data is None:
+            token_data = AuthService.get_token_data(db, user)
         
         # Create token with expiration
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -113,19 +151,73 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Create access token with role information
-        access_token = AuthService.create_token(db, user)
-        
-        # Get role information
+        # Get role information once for both the token and the response
         token_data = AuthService.get_token_data(db, user)
+        return AuthService.issue_tokens(user, token_data)
+    
+    @staticmethod
+    def issue_tokens(user: User, token_data: Dict[str, Any]) -> Token:
+        """Create an access and a refresh token for a user"""
         roles = token_data.get("roles", ["user"])
+        
+        # Create access token with role information
+        access_token = create_access_token(
+            data=token_data,
+            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        refresh_token = create_refresh_token({"sub": user.email, "user_id": user.user_id})
         is_seller = "seller" in roles
         
         # Return token with user info and roles
         return Token(
             access_token=access_token,
+            refresh_token=refresh_token,
             token_type="bearer",
             user=user,
             roles=roles,
             is_seller=is_seller
-        )
\ No newline at end of file
+        )
+    
+    @staticmethod
+    def decode_refresh_token(refresh_token: str) -> Dict[str, Any]:
+        """
+        Verify a refresh token and return its claims
+        
+        Raises:
+            HTTPException: 401 if it is not a valid refresh token
+        """
+        try:
+            payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise invalid_refresh_token()
+        
+        if payload.get("type") != REFRESH_TOKEN_TYPE or not payload.get("jti") or not payload.get("sub"):
+            raise invalid_refresh_token()
+        return payload
+    
+    @staticmethod
+    def logout(db: Session, access_payload: Dict[str, Any], refresh_token: Optional[str] = None) -> None:
+        """
+        Revoke the current access token and, if given, a refresh token
+        
+        Args:
+            db: Database session
+            access_payload: Decoded claims of the access token in use
+            refresh_token: Refresh token of the same user to revoke as well
+            
+        Raises:
+            HTTPException: 401 if the refresh token is invalid or belongs
+                to another user
+        """
+        jti = access_payload.get("jti")
+        if jti:
+            revocation_list.revoke(db, jti, token_expiry(access_payload))
+        
+        if refresh_token is None:
+            return
+        
+        payload = AuthService.decode_refresh_token(refresh_token)
+        if payload["sub"] != access_payload.get("sub"):
+            raise invalid_refresh_token()
+        # Already revoked (e.g. used for a refresh) is fine
+        revocation_list.revoke(db, payload["jti"], token_expiry(payload))
\ No newline at end of file
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
-from services.auth_service.middleware import get_current_user
+from core.database import get_async_db
+from services.auth_service.middleware import get_current_user_async
 from models import User, Seller
 from services.auth_service.schemas import UserRoleInfo
 
@@ -12,16 +13,16 @@ router = APIRouter(
 )
 
 @router.get("/me", response_model=UserRoleInfo)
-def get_user_with_roles(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_user_with_roles(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current user information including roles.
     Requires authentication.
     """
     # Check if user is a seller
-    seller = db.query(Seller).filter(Seller.user_id == current_user.user_id).first()
+    seller = await db.scalar(select(Seller).where(Seller.user_id == current_user.user_id).limit(1))
     
     # Define roles
     roles = ["user"]
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from core.database import get_db
 from services.auth_service.middleware import get_current_seller, get_current_user
-from .service import FileService
+from .service import FileService, product_image_dir
 from .schemas import FileUploadResponse
 
 router = APIRouter(
@@ -12,13 +12,18 @@ router = APIRouter(
     tags=["files"]
 )
 
+def get_image_dir(request: Request) -> str:
+    """Product image directory under the static directory the app was built with"""
+    return product_image_dir(request.app.state.static_dir)
+
 @router.post("/product-image", response_model=FileUploadResponse)
 async def upload_product_image(
     file: UploadFile = File(...),
     category: str = Form("uncategorized"),
     product_id: str = Form("new"),
     seller = Depends(get_current_seller),  # Requires seller authentication
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    image_dir: str = Depends(get_image_dir)
 ):
     """
     Upload a product image and save it to the filesystem
@@ -31,5 +36,5 @@ async def upload_product_image(
     Returns:
         JSON with the saved file path
     """
-    result = await FileService.upload_product_image(file, category, product_id)
+    result = await FileService.upload_product_image(file, category, product_id, image_dir)
     return result
\ No newline at end of file
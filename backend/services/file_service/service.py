@@ -4,15 +4,20 @@ from datetime import datetime
 from fastapi import UploadFile, HTTPException
 import aiofiles
 
-# Base directory for storing product images
-# This should be in your public directory so images can be served statically
-BASE_IMAGE_DIR = os.path.join(os.getcwd(), "static", "images", "products")
+def product_image_dir(static_dir: str) -> str:
+    """
+    Base directory for storing product images
+    
+    It lives under the static directory the app serves at /static, so
+    images can be served statically.
+    """
+    return os.path.join(static_dir, "images", "products")
 
 class FileService:
     """Service for handling file uploads"""
     
     @staticmethod
-    async def upload_product_image(file: UploadFile, category: str, product_id: str):
+    async def upload_product_image(file: UploadFile, category: str, product_id: str, image_dir: str):
         """
         Upload a product image and save it to the filesystem    
         
@@ -20,6 +25,7 @@ class FileService:
             file: The image file to upload
             category: Product category (used for folder structure)
             product_id: Product ID (used for folder structure)
+            image_dir: Base directory for product images (see product_image_dir)
             
         Returns:
             Dict with file information
@@ -37,7 +43,7 @@ class FileService:
             
             # Create directory for this product
             # Structure: /static/images/products/{category}/{product_id}/
-            product_dir = os.path.join(BASE_IMAGE_DIR, safe_category, str(product_id))
+            product_dir = os.path.join(image_dir, safe_category, str(product_id))
             os.makedirs(product_dir, exist_ok=True)
             
             # Generate unique filename with timestamp and UUID
@@ -0,0 +1,176 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Any, Tuple, Union, AsyncIterator, BinaryIO
+
+from models import Product, ProductCard, ProductImage
+from .schemas import (
+    ProductCreate, ProductUpdate, ProductImageCreate,
+    ProductImportResult, ProductBulkUpdateItem, ProductBulkUpdateResult
+)
+from .service import ProductService
+from .bulk_service import ProductBulkService, ProductExportEncoder
+
+def _loaded(db: Session, product: Union[Product, bool]) -> Union[Product, bool]:
+    """Load what ProductResponse serialises while still inside run_sync"""
+    if product:
+        db.refresh(product, ["categories", "images"])
+    return product
+
+class AsyncProductService:
+    """
+    ProductService for async routes
+    
+    The listing, search, lookup and write logic (cursors, filters, product
+    cards, product cache, in-process search index) lives in ProductService;
+    these methods run it on the AsyncSession's connection with run_sync, so
+    the event loop is free while the queries are in flight and both kinds
+    of route share one implementation. Every method returns products with
+    their relationships already loaded, so serialising them after the
+    await needs no further I/O.
+    """
+    
+    @staticmethod
+    async def get_products_page(db: AsyncSession, **filters) -> Tuple[List[Product], Optional[str]]:
+        """Async ProductService.get_products_page"""
+        return await db.run_sync(lambda session: ProductService.get_products_page(db=session, **filters))
+    
+    @staticmethod
+    async def get_product_cards_page(db: AsyncSession, **filters) -> Tuple[List[ProductCard], Optional[str]]:
+        """Async ProductService.get_product_cards_page"""
+        return await db.run_sync(lambda session: ProductService.get_product_cards_page(db=session, **filters))
+    
+    @staticmethod
+    async def search_products(db: AsyncSession, q: str, **filters) -> Tuple[List[Product], Optional[str]]:
+        """Async ProductService.search_products"""
+        return await db.run_sync(lambda session: ProductService.search_products(db=session, q=q, **filters))
+    
+    @staticmethod
+    async def get_product_payload(db: AsyncSession, product_id: int) -> Optional[Dict[str, Any]]:
+        """Async ProductService.get_product_payload"""
+        return await db.run_sync(ProductService.get_product_payload, product_id)
+    
+    @staticmethod
+    async def get_product_payloads(db: AsyncSession, product_ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Async ProductService.get_product_payloads"""
+        return await db.run_sync(ProductService.get_product_payloads, product_ids)
+    
+    @staticmethod
+    async def create_product(db: AsyncSession, seller_id: int, product_data: ProductCreate) -> Product:
+        """Async ProductService.create_product"""
+        return await db.run_sync(
+            lambda session: _loaded(session, ProductService.create_product(session, seller_id, product_data))
+        )
+    
+    @staticmethod
+    async def update_product(
+        db: AsyncSession,
+        product_id: int,
+        seller_id: int,
+        product_data: ProductUpdate
+    ) -> Union[Product, bool]:
+        """Async ProductService.update_product"""
+        return await db.run_sync(
+            lambda session: _loaded(session, ProductService.update_product(session, product_id, seller_id, product_data))
+        )
+    
+    @staticmethod
+    async def delete_product(db: AsyncSession, product_id: int, seller_id: int) -> bool:
+        """Async ProductService.delete_product"""
+        return await db.run_sync(ProductService.delete_product, product_id, seller_id)
+    
+    @staticmethod
+    async def add_product_image(
+        db: AsyncSession,
+        product_id: int,
+        seller_id: int,
+        image_data: ProductImageCreate
+    ) -> Union[ProductImage, bool]:
+        """Async ProductService.add_product_image"""
+        return await db.run_sync(ProductService.add_product_image, product_id, seller_id, image_data)
+    
+    @staticmethod
+    async def delete_product_image(db: AsyncSession, image_id: int, seller_id: int) -> bool:
+        """Async ProductService.delete_product_image"""
+        return await db.run_sync(ProductService.delete_product_image, image_id, seller_id)
+
+class AsyncProductBulkService:
+    """ProductBulkService for async routes"""
+    
+    @staticmethod
+    async def bulk_update(
+        db: AsyncSession,
+        seller_id: int,
+        items: List[ProductBulkUpdateItem]
+    ) -> ProductBulkUpdateResult:
+        """Async ProductBulkService.bulk_update"""
+        return await db.run_sync(ProductBulkService.bulk_update, seller_id, items)
+    
+    @staticmethod
+    async def import_products(
+        db: AsyncSession,
+        seller_id: int,
+        stream: BinaryIO,
+        file_format: str
+    ) -> ProductImportResult:
+        """
+        Import products for a seller from a CSV or NDJSON stream
+        
+        The upload is read and validated on the threadpool, a chunk of
+        IMPORT_CHUNK_SIZE rows at a time, so a large file does not hold up
+        the event loop; each chunk is then inserted on the AsyncSession in
+        its own transaction. Invalid rows are reported and skipped.
+        
+        Args:
+            db: Async database session
+            seller_id: ID of the seller importing the products
+            stream: Binary file object holding the upload
+            file_format: "csv" or "ndjson"
+            
+        Returns:
+            Counts of created and failed rows with per-row errors
+            
+        Raises:
+            HTTPException: If the format is unsupported or the file is not UTF-8
+        """
+        ProductBulkService.check_import_format(file_format)
+        
+        category_map = await db.run_sync(ProductBulkService.load_category_map)
+        result = ProductImportResult()
+        chunks = ProductBulkService.iter_import_chunks(stream, file_format, category_map, result)
+        while True:
+            chunk = await run_in_threadpool(next, chunks, None)
+            if chunk is None:
+                break
+            await db.run_sync(ProductBulkService.insert_chunk, seller_id, chunk, result)
+        
+        return result
+    
+    @staticmethod
+    async def export_products(bind: AsyncEngine, seller_id: int, file_format: str) -> AsyncIterator[bytes]:
+        """
+        Stream a seller's catalogue as NDJSON or CSV
+        
+        Rows are read through a server-side cursor in batches (see
+        ProductBulkService.export_statement) and written out as soon as a
+        batch is ready. The export runs in its own session because the
+        response body is produced after the request's session is closed.
+        The CSV layout is accepted back by import_products.
+        
+        Args:
+            bind: Async engine to read from
+            seller_id: ID of the seller whose products are exported
+            file_format: "csv" or "ndjson"
+            
+        Yields:
+            Encoded chunks of the export file
+        """
+        encoder = ProductExportEncoder(file_format)
+        async with AsyncSession(bind=bind) as session:
+            result = await session.stream_scalars(ProductBulkService.export_statement(seller_id))
+            async for partition in result.partitions():
+                yield encoder.encode(partition)
+        
+        rest = encoder.encode([])
+        if rest:
+            yield rest
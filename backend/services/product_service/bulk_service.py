@@ -0,0 +1,384 @@
+import csv
+import io
+import json
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert, update, case, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+
+from models import Product, Category, ProductImage, product_categories
+from .schemas import (
+    ProductImportRow, ProductImportError, ProductImportResult,
+    ProductBulkUpdateItem, ProductBulkUpdateResult
+)
+from .search import product_search_index
+from .cache import product_cache
+from .card_service import ProductCardService
+
+# Rows validated and inserted per transaction
+IMPORT_CHUNK_SIZE = 500
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Product ids covered by each bulk UPDATE statement
+BULK_UPDATE_CHUNK_SIZE = 1000
+
+# Rows fetched per round trip from the server-side cursor during export,
+# and rows written per chunk of the streamed response
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_COLUMNS = (
+    "product_id", "name", "description", "price", "stock_quantity",
+    "categories", "images", "created_at", "updated_at"
+)
+
+class ProductExportEncoder:
+    """Turns batches of products into chunks of an NDJSON or CSV export"""
+
+    def __init__(self, file_format: str):
+        self._buffer = io.StringIO()
+        self._writer = None
+        if file_format == "csv":
+            self._writer = csv.DictWriter(self._buffer, fieldnames=EXPORT_COLUMNS)
+            self._writer.writeheader()
+
+    def encode(self, products: Iterable[Product]) -> bytes:
+        """Encoded rows of the products, preceded by anything still buffered"""
+        for product in products:
+            row = ProductBulkService.export_row(product)
+            if self._writer is not None:
+                row["categories"] = "|".join(row["categories"])
+                row["images"] = "|".join(row["images"])
+                self._writer.writerow(row)
+            else:
+                self._buffer.write(json.dumps(row, separators=(",", ":")))
+                self._buffer.write("\n")
+
+        chunk = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return chunk
+
+class ProductBulkService:
+    """Service for catalogue-wide product operations used by sellers"""
+
+    @staticmethod
+    def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+        """Guess the import format from the upload's file name or content type"""
+        name = (filename or "").lower()
+        if name.endswith(".csv") or content_type == "text/csv":
+            return "csv"
+        if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+            return "ndjson"
+        return None
+
+    @staticmethod
+    def iter_rows(stream: BinaryIO, file_format: str) -> Iterator[Tuple[int, object]]:
+        """
+        Stream (row number, raw row) pairs out of an uploaded file
+
+        CSV rows come out as dicts with empty cells dropped; NDJSON rows as
+        whatever the line decodes to, or the JSONDecodeError it raised.
+        """
+        text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        try:
+            if file_format == "csv":
+                for row_number, row in enumerate(csv.DictReader(text), start=1):
+                    yield row_number, {
+                        key.strip(): value for key, value in row.items()
+                        if key and value not in (None, "")
+                    }
+            else:
+                row_number = 0
+                for line in text:
+                    if not line.strip():
+                        continue
+                    row_number += 1
+                    try:
+                        yield row_number, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield row_number, e
+        finally:
+            # Leave the underlying upload open; FastAPI closes it
+            text.detach()
+
+    @staticmethod
+    def export_statement(seller_id: int):
+        """
+        SELECT of a seller's catalogue for export, in product id order
+
+        Meant to be streamed: rows come in batches of EXPORT_BATCH_SIZE
+        (yield_per) with categories and images loaded per batch, so memory
+        use does not grow with the catalogue.
+        """
+        return (
+            select(Product)
+            .where(Product.seller_id == seller_id)
+            .order_by(Product.product_id)
+            .options(selectinload(Product.categories), selectinload(Product.images))
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+    @staticmethod
+    def export_row(product: Product) -> dict:
+        images = sorted(
+            product.images,
+            key=lambda image: (not image.is_primary, image.display_order or 0, image.image_id)
+        )
+        return {
+            "product_id": product.product_id,
+            "name": product.name,
+            "description": product.description,
+            "price": str(product.price),
+            "stock_quantity": product.stock_quantity,
+            "categories": [category.name for category in product.categories],
+            "images": [image.image_url for image in images],
+            "created_at": product.created_at.isoformat() if product.created_at else None,
+            "updated_at": product.updated_at.isoformat() if product.updated_at else None,
+        }
+
+    @staticmethod
+    def load_category_map(db: Session) -> Dict[str, int]:
+        """Map lowercase category names and stringified ids to category ids"""
+        category_map = {}
+        for category_id, name in db.query(Category.category_id, Category.name):
+            category_map[name.lower()] = category_id
+            category_map[str(category_id)] = category_id
+        return category_map
+
+    @staticmethod
+    def check_import_format(file_format: str) -> None:
+        """
+        Raises:
+            HTTPException: If the import format is unsupported
+        """
+        if file_format not in IMPORT_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported import format, expected one of: {', '.join(IMPORT_FORMATS)}"
+            )
+
+    @staticmethod
+    def iter_import_chunks(
+        stream: BinaryIO,
+        file_format: str,
+        category_map: Dict[str, int],
+        result: ProductImportResult
+    ) -> Iterator[List[Tuple[int, ProductImportRow, List[int]]]]:
+        """
+        Validate an upload and yield its valid rows in chunks of IMPORT_CHUNK_SIZE
+
+        Invalid rows are counted and reported on result as they are met.
+        Reading and validating touch no database, so callers can run this
+        off the event loop and insert each chunk with insert_chunk().
+
+        Args:
+            stream: Binary file object holding the upload
+            file_format: "csv" or "ndjson"
+            category_map: Result of load_category_map()
+            result: Import result collecting the row errors
+
+        Yields:
+            Lists of (row number, validated row, category ids)
+
+        Raises:
+            HTTPException: If the file is not UTF-8
+        """
+        chunk: List[Tuple[int, ProductImportRow, List[int]]] = []
+        try:
+            for row_number, raw in ProductBulkService.iter_rows(stream, file_format):
+                parsed = ProductBulkService._validate_row(raw, category_map)
+                if isinstance(parsed, list):
+                    result.failed += 1
+                    result.errors.append(ProductImportError(row=row_number, errors=parsed))
+                    continue
+
+                chunk.append((row_number, parsed[0], parsed[1]))
+                if len(chunk) >= IMPORT_CHUNK_SIZE:
+                    yield chunk
+                    chunk = []
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Import file must be UTF-8 encoded"
+            )
+
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _validate_row(raw, category_map: Dict[str, int]):
+        """Return (row, category_ids) for a valid row or a list of error messages"""
+        if isinstance(raw, json.JSONDecodeError):
+            return [f"Invalid JSON: {raw.msg}"]
+        if not isinstance(raw, dict):
+            return ["Row must be an object"]
+
+        try:
+            row = ProductImportRow.model_validate(raw)
+        except ValidationError as e:
+            return [
+                f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                for error in e.errors()
+            ]
+
+        category_ids = []
+        unknown = []
+        for category in row.categories:
+            category_id = category_map.get(str(category).strip().lower())
+            if category_id is None:
+                unknown.append(str(category))
+            elif category_id not in category_ids:
+                category_ids.append(category_id)
+        if unknown:
+            return [f"Unknown categories: {', '.join(unknown)}"]
+
+        return row, category_ids
+
+    @staticmethod
+    def insert_chunk(
+        db: Session,
+        seller_id: int,
+        chunk: List[Tuple[int, ProductImportRow, List[int]]],
+        result: ProductImportResult
+    ) -> None:
+        """
+        Insert one chunk of validated rows in a single transaction
+
+        Products, category links and images go in as multi-row INSERTs. A
+        chunk that fails in the database is rolled back and reported row by
+        row on result, without affecting earlier chunks.
+        """
+        try:
+            product_ids = db.execute(
+                insert(Product.__table__).returning(
+                    Product.__table__.c.product_id, sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        "seller_id": seller_id,
+                        "name": row.name,
+                        "description": row.description,
+                        "price": row.price,
+                        "stock_quantity": row.stock_quantity,
+                    }
+                    for _, row, _ in chunk
+                ]
+            ).scalars().all()
+
+            category_links = [
+                {"product_id": product_id, "category_id": category_id}
+                for product_id, (_, _, category_ids) in zip(product_ids, chunk)
+                for category_id in category_ids
+            ]
+            if category_links:
+                db.execute(insert(product_categories), category_links)
+
+            images = [
+                {
+                    "product_id": product_id,
+                    "image_url": image_url,
+                    "is_primary": position == 0,
+                    "display_order": position,
+                }
+                for product_id, (_, row, _) in zip(product_ids, chunk)
+                for position, image_url in enumerate(row.images)
+            ]
+            if images:
+                db.execute(insert(ProductImage.__table__), images)
+
+            ProductCardService.refresh(db, product_ids)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = f"Database error: {e.__class__.__name__}"
+            for row_number, _, _ in chunk:
+                result.failed += 1
+                result.errors.append(ProductImportError(row=row_number, errors=[message]))
+            return
+
+        result.created += len(product_ids)
+        product_search_index.update_many(
+            (product_id, row.name, row.description)
+            for product_id, (_, row, _) in zip(product_ids, chunk)
+        )
+
+    @staticmethod
+    def bulk_update(
+        db: Session,
+        seller_id: int,
+        items: List[ProductBulkUpdateItem]
+    ) -> ProductBulkUpdateResult:
+        """
+        Update price and/or stock of many products of a seller at once
+
+        Entries are merged per product (later entries win) and applied with
+        one UPDATE ... SET col = CASE product_id ... statement per chunk of
+        BULK_UPDATE_CHUNK_SIZE products, all in a single transaction.
+
+        Args:
+            db: Database session
+            seller_id: ID of the seller (for authorization)
+            items: Requested changes
+
+        Returns:
+            Number of products updated and the ids that were rejected
+            (not found, not owned by the seller, or nothing to change)
+        """
+        prices: Dict[int, object] = {}
+        stocks: Dict[int, int] = {}
+        requested: List[int] = []
+        for item in items:
+            requested.append(item.product_id)
+            if item.price is not None:
+                prices[item.product_id] = item.price
+            if item.stock_quantity is not None:
+                stocks[item.product_id] = item.stock_quantity
+
+        requested = list(dict.fromkeys(requested))
+
+        table = Product.__table__
+        updated_ids: List[int] = []
+        for start in range(0, len(requested), BULK_UPDATE_CHUNK_SIZE):
+            chunk = [
+                product_id for product_id in requested[start:start + BULK_UPDATE_CHUNK_SIZE]
+                if product_id in prices or product_id in stocks
+            ]
+            if not chunk:
+                continue
+
+            values = {"updated_at": func.now()}
+            chunk_prices = {product_id: prices[product_id] for product_id in chunk if product_id in prices}
+            if chunk_prices:
+                values["price"] = case(chunk_prices, value=table.c.product_id, else_=table.c.price)
+            chunk_stocks = {product_id: stocks[product_id] for product_id in chunk if product_id in stocks}
+            if chunk_stocks:
+                values["stock_quantity"] = case(
+                    chunk_stocks, value=table.c.product_id, else_=table.c.stock_quantity
+                )
+
+            # Products of other sellers or already deleted are filtered out by
+            # the WHERE clause; RETURNING reports the rows actually changed
+            owned = db.execute(
+                update(table)
+                .where(table.c.seller_id == seller_id, table.c.product_id.in_(chunk))
+                .values(**values)
+                .returning(table.c.product_id)
+            ).scalars().all()
+            if not owned:
+                continue
+
+            ProductCardService.refresh_columns(db, owned)
+            updated_ids.extend(owned)
+
+        db.commit()
+        product_cache.evict_many(updated_ids)
+
+        updated = set(updated_ids)
+        return ProductBulkUpdateResult(
+            updated=len(updated_ids),
+            rejected=[product_id for product_id in requested if product_id not in updated]
+        )
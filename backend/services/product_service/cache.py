@@ -0,0 +1,130 @@
+import json
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache, register_cache
+from core.config import (
+    PRODUCT_CACHE_ENABLED, PRODUCT_CACHE_MAX_ENTRIES, PRODUCT_CACHE_TTL_SECONDS,
+    CATEGORY_CACHE_TTL_SECONDS
+)
+from core.http_cache import make_etag
+from core.replicas import replica_lag_window
+from models import Category
+
+# Serialised ProductResponse payloads keyed by product_id. ProductService
+# write methods evict the affected product after committing.
+product_cache = TTLCache(
+    "product_detail",
+    max_entries=PRODUCT_CACHE_MAX_ENTRIES,
+    ttl_seconds=PRODUCT_CACHE_TTL_SECONDS,
+    enabled=PRODUCT_CACHE_ENABLED
+)
+
+class CategoryPage(NamedTuple):
+    """A rendered slice of the category catalogue"""
+    body: bytes
+    etag: str
+
+class _Snapshot(NamedTuple):
+    version: int
+    expires_at: float
+    items: List[dict]
+    digest: str
+
+class CategoryCatalogue:
+    """
+    The full category list held in memory under a version number.
+
+    Category writes call bump(), which drops the snapshot so the next read
+    reloads it. ETags are derived from the catalogue content rather than the
+    version, so every worker hands out the same tag for the same list.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._bumped_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_Snapshot] = None
+        self._pages: Dict[Tuple[int, int], CategoryPage] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self) -> None:
+        """Invalidate the catalogue after a category was created, renamed or deleted"""
+        with self._lock:
+            self.version += 1
+            self._bumped_at = time.monotonic()
+            self._snapshot = None
+            self._pages = {}
+
+    def get_page(self, db: Session, skip: int = 0, limit: int = 100) -> CategoryPage:
+        """
+        Get a slice of the catalogue as a JSON body with its ETag
+
+        Only touches the database when the snapshot is missing or expired.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.expires_at <= time.monotonic():
+            self.misses += 1
+            snapshot = self._load(db, replica_lag_window(db))
+        else:
+            self.hits += 1
+
+        key = (skip, limit)
+        page = self._pages.get(key) if snapshot is self._snapshot else None
+        if page is None:
+            items = snapshot.items[max(skip, 0):max(skip, 0) + max(limit, 0)]
+            page = CategoryPage(
+                body=json.dumps(items, separators=(",", ":")).encode("utf-8"),
+                etag=make_etag(snapshot.digest, skip, limit)
+            )
+            with self._lock:
+                if snapshot is self._snapshot:
+                    self._pages[key] = page
+        return page
+
+    def _load(self, db: Session, min_age: Optional[float] = None) -> _Snapshot:
+        version = self.version
+        rows = db.query(Category.category_id, Category.name).order_by(Category.category_id).all()
+        items = [{"name": name, "category_id": category_id} for category_id, name in rows]
+        snapshot = _Snapshot(
+            version=version,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            items=items,
+            digest=make_etag(json.dumps(items, sort_keys=True))
+        )
+        with self._lock:
+            # Do not publish a list loaded before a concurrent bump(), or
+            # from a replica that may not have caught up with a recent one
+            recently_bumped = (
+                min_age is not None and self._bumped_at is not None
+                and time.monotonic() - self._bumped_at < min_age
+            )
+            if version == self.version and not recently_bumped:
+                self._snapshot = snapshot
+                self._pages = {}
+        return snapshot
+
+    def reset(self) -> None:
+        """Drop the snapshot and zero the counters"""
+        self.bump()
+        self._bumped_at = None
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "size": len(self._snapshot.items) if self._snapshot else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+category_catalogue = CategoryCatalogue(ttl_seconds=CATEGORY_CACHE_TTL_SECONDS)
+register_cache("category_catalogue", category_catalogue)
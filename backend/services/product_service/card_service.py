@@ -0,0 +1,142 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from models import Product, ProductCard, ProductImage, Category, product_categories
+
+# Number of products recomputed per round of queries
+CARD_REFRESH_CHUNK_SIZE = 500
+
+class ProductCardService:
+    """
+    Maintains the product_cards read model.
+
+    Every write that changes what a card shows (name, price, stock, images,
+    category assignments or names) must call refresh(), or refresh_columns()
+    when only the products row changed, for the affected products before
+    committing, so the cards commit with the change.
+    """
+
+    @staticmethod
+    def refresh(db: Session, product_ids: Iterable[int]) -> None:
+        """
+        Recompute the cards of the given products from the source tables
+
+        Products that no longer exist lose their card. Does not commit; the
+        caller commits with the rest of its changes.
+
+        Args:
+            db: Database session
+            product_ids: IDs of the products whose card may have changed
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        if not product_ids:
+            return
+
+        # Sessions do not autoflush; pending ORM changes must be visible below
+        db.flush()
+
+        for start in range(0, len(product_ids), CARD_REFRESH_CHUNK_SIZE):
+            chunk = product_ids[start:start + CARD_REFRESH_CHUNK_SIZE]
+            cards = ProductCardService._build_cards(db, chunk)
+
+            db.execute(
+                delete(ProductCard).where(ProductCard.product_id.in_(chunk)),
+                execution_options={"synchronize_session": False}
+            )
+            if cards:
+                db.execute(insert(ProductCard.__table__), cards)
+
+    @staticmethod
+    def refresh_columns(db: Session, product_ids: List[int]) -> None:
+        """
+        Copy name, price, stock flag and updated_at from products into
+        existing cards with one UPDATE
+
+        Cheaper than refresh() for writes that only touch the products row,
+        such as bulk price and stock updates. Does not commit.
+        """
+        if not product_ids:
+            return
+
+        card = ProductCard.__table__
+        products = Product.__table__
+
+        def column(expression):
+            return (
+                select(expression)
+                .where(products.c.product_id == card.c.product_id)
+                .scalar_subquery()
+            )
+
+        db.execute(
+            update(card)
+            .where(card.c.product_id.in_(product_ids))
+            .values(
+                name=column(products.c.name),
+                price=column(products.c.price),
+                in_stock=column(products.c.stock_quantity > 0),
+                updated_at=column(products.c.updated_at)
+            )
+        )
+
+    @staticmethod
+    def remove(db: Session, product_ids: Iterable[int]) -> None:
+        """Drop the cards of deleted products (does not commit)"""
+        product_ids = list(product_ids)
+        if product_ids:
+            db.execute(
+                delete(ProductCard).where(ProductCard.product_id.in_(product_ids)),
+                execution_options={"synchronize_session": False}
+            )
+
+    @staticmethod
+    def _build_cards(db: Session, product_ids: List[int]) -> List[Dict]:
+        """Card rows for the given products, with three queries"""
+        products = db.execute(
+            select(
+                Product.product_id, Product.name, Product.price,
+                Product.stock_quantity, Product.updated_at
+            ).where(Product.product_id.in_(product_ids))
+        ).all()
+        if not products:
+            return []
+
+        # Primary image first, then by display order (unset last) and age
+        primary_images: Dict[int, str] = {}
+        for product_id, image_url in db.execute(
+            select(ProductImage.product_id, ProductImage.image_url)
+            .where(ProductImage.product_id.in_(product_ids))
+            .order_by(
+                ProductImage.product_id,
+                ProductImage.is_primary.desc(),
+                ProductImage.display_order.is_(None),
+                ProductImage.display_order,
+                ProductImage.image_id
+            )
+        ):
+            primary_images.setdefault(product_id, image_url)
+
+        category_names: Dict[int, List[str]] = defaultdict(list)
+        for product_id, name in db.execute(
+            select(product_categories.c.product_id, Category.name)
+            .join(Category, Category.category_id == product_categories.c.category_id)
+            .where(product_categories.c.product_id.in_(product_ids))
+            .order_by(Category.name)
+        ):
+            category_names[product_id].append(name)
+
+        return [
+            {
+                "product_id": product.product_id,
+                "name": product.name,
+                "price": product.price,
+                "in_stock": product.stock_quantity > 0,
+                "primary_image_url": primary_images.get(product.product_id),
+                "category_names": category_names.get(product.product_id, []),
+                "updated_at": product.updated_at,
+            }
+            for product in products
+        ]
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from core.database import get_db
+from core.replicas import get_read_db
+from core.http_cache import etag_matches, not_modified
 from services.auth_service.middleware import get_current_seller
-from models import Category, Seller
+from models import Category, Seller, product_categories
 from .schemas import CategoryCreate, CategoryResponse
+from .cache import product_cache, category_catalogue
+from .service import ProductService
+from .card_service import ProductCardService
 
 router = APIRouter(
     prefix="/categories",
@@ -15,20 +20,29 @@ router = APIRouter(
 # Public endpoint to get all categories
 @router.get("/", response_model=List[CategoryResponse])
 def get_categories(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all product categories.
+    
+    Served from the in-memory catalogue with a strong ETag; a matching
+    If-None-Match gets a 304 without a database round trip.
     """
-    categories = db.query(Category).offset(skip).limit(limit).all()
-    return categories
+    page = category_catalogue.get_page(db, skip=skip, limit=limit)
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    
+    if etag_matches(request.headers.get("if-none-match"), page.etag):
+        return not_modified(headers)
+    
+    return Response(content=page.body, media_type="application/json", headers=headers)
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 def get_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific category by ID.
@@ -69,6 +83,8 @@ def create_category(
     db.commit()
     db.refresh(db_category)
     
+    category_catalogue.bump()
+    
     return db_category
 
 @router.put("/{category_id}", response_model=CategoryResponse)
@@ -102,11 +118,24 @@ def update_category(
                 detail="Category with this name already exists"
             )
     
+    # Products embed the category name, so their validators and cached
+    # payloads must change with it
+    product_ids = [
+        product_id for (product_id,) in db.query(product_categories.c.product_id).filter(
+            product_categories.c.category_id == category_id
+        )
+    ]
+    
     # Update category
     category.name = category_data.name
+    ProductService.touch(db, product_ids)
+    ProductCardService.refresh(db, product_ids)
     db.commit()
     db.refresh(category)
     
+    category_catalogue.bump()
+    product_cache.evict_many(product_ids)
+    
     return category
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -136,4 +165,6 @@ def delete_category(
     
     # Delete category
     db.delete(category)
-    db.commit()
\ No newline at end of file
+    db.commit()
+    
+    category_catalogue.bump()
\ No newline at end of file
@@ -1,73 +1,257 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from datetime import datetime
+from decimal import Decimal
 
-from core.database import get_db
-from services.auth_service.middleware import get_current_user, get_current_seller
-from models import User, Seller
+from core.database import get_async_db
+from core.replicas import get_async_read_db
+from core.http_cache import make_etag, http_date, is_not_modified, not_modified
+from core.pagination import NEXT_CURSOR_HEADER
+from services.auth_service.middleware import get_current_seller_async
+from models import User, Seller, Product
 from .schemas import (
     ProductCreate, ProductResponse, ProductUpdate,
-    ProductImageCreate, ProductImageResponse
+    ProductImageCreate, ProductImageResponse, ProductCardResponse,
+    ProductBatchRequest, ProductBatchResponse, ProductImportResult,
+    ProductBulkUpdateRequest, ProductBulkUpdateResult
 )
-from .service import ProductService
+from .service import PRODUCT_SORTS
+from .async_service import AsyncProductService, AsyncProductBulkService
+from .bulk_service import ProductBulkService, IMPORT_FORMATS
 
 router = APIRouter(
     prefix="/products",
     tags=["products"]
 )
 
+# Maximum number of ids accepted by the batch lookup endpoints
+BATCH_MAX_IDS = 100
+
+PRODUCT_SORT_PATTERN = f"^({'|'.join(sort for sort in PRODUCT_SORTS if sort)})$"
+
+def product_validators(product_id: int, updated_at: Optional[datetime]) -> Dict[str, str]:
+    """ETag and Last-Modified headers for a single product"""
+    headers = {
+        "ETag": make_etag("product", product_id, updated_at),
+        "Cache-Control": "no-cache"
+    }
+    if updated_at is not None:
+        headers["Last-Modified"] = http_date(updated_at)
+    return headers
+
+def conditional_list(
+    request: Request,
+    response: Response,
+    products: List[Product],
+    next_cursor: Optional[str],
+    cache_control: str = "no-cache",
+    card_view: bool = False
+):
+    """
+    Return a page of products, or 304 when the client copy is current
+    
+    The ETag covers the filters (query string), the ids on the page and the
+    newest updated_at among them, so edits, deletions and inserts that
+    change the page all produce a new tag. Pages of product cards are
+    serialised here, since they do not match the route's response model.
+    """
+    last_modified = max((p.updated_at for p in products if p.updated_at), default=None)
+    headers = {
+        "ETag": make_etag(
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+            [p.product_id for p in products],
+            last_modified
+        ),
+        "Cache-Control": cache_control
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    if is_not_modified(request.headers, headers["ETag"], last_modified):
+        return not_modified(headers)
+    
+    if card_view:
+        return JSONResponse(
+            content=[ProductCardResponse.model_validate(card).model_dump(mode="json") for card in products],
+            headers=headers
+        )
+    
+    response.headers.update(headers)
+    return products
+
+async def list_page(db: AsyncSession, view: str, **filters):
+    """Fetch a listing page of full products or of product cards"""
+    if view == "card":
+        return await AsyncProductService.get_product_cards_page(db=db, **filters)
+    return await AsyncProductService.get_products_page(db=db, **filters)
+
 # Public endpoints (no authentication required)
 
 @router.get("/", response_model=List[ProductResponse])
-def get_products(
+async def get_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category_id: Optional[int] = None,
     seller_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    in_stock: Optional[bool] = None,
+    sort: Optional[str] = Query(None, pattern=PRODUCT_SORT_PATTERN),
+    view: str = Query("full", pattern="^(full|card)$", description="card returns the compact ProductCardResponse"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get all products with optional filtering.
+    
+    `sort` orders by price (lowest first), newest or name; products are
+    listed by id when it is omitted. Pass the X-Next-Cursor header of a
+    response back as `cursor`, with the same `sort`, to fetch the following
+    page; `skip` is ignored when a cursor is given.
+    
+    `view=card` returns ProductCardResponse items (name, price, stock flag,
+    primary image and category names) read from the product_cards table,
+    which is much cheaper for listing pages.
     """
-    products = ProductService.get_products(
-        db=db,
+    products, next_cursor = await list_page(
+        db,
+        view,
         skip=skip,
         limit=limit,
         category_id=category_id,
-        seller_id=seller_id
+        seller_id=seller_id,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        sort=sort,
+        cursor=cursor
     )
-    return products
+    return conditional_list(request, response, products, next_cursor, card_view=view == "card")
+
+@router.get("/search", response_model=List[ProductResponse])
+async def search_products(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    limit: int = Query(20, ge=1, le=100),
+    category_id: Optional[int] = None,
+    seller_id: Optional[int] = None,
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Search products by name and description, best matches first.
+    
+    Every search term must appear in the product. Results can be narrowed
+    with the same filters as the product list and paged with `cursor`.
+    """
+    products, next_cursor = await AsyncProductService.search_products(
+        db=db,
+        q=q,
+        limit=limit,
+        category_id=category_id,
+        seller_id=seller_id,
+        min_price=min_price,
+        max_price=max_price,
+        cursor=cursor
+    )
+    return conditional_list(request, response, products, next_cursor)
+
+async def batch_response(db: AsyncSession, product_ids: List[int]) -> JSONResponse:
+    """Look up products by id and report the ones that do not exist"""
+    if len(product_ids) > BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_MAX_IDS} ids can be requested at once"
+        )
+    
+    products, missing = await AsyncProductService.get_product_payloads(db=db, product_ids=product_ids)
+    return JSONResponse(content={"products": products, "missing": missing})
+
+@router.get("/batch", response_model=ProductBatchResponse)
+async def get_products_batch(
+    ids: str = Query(..., description="Comma-separated product ids, e.g. 1,2,3"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get several products in one request (cart and wishlist hydration).
+    
+    Products are returned in the requested order; ids that do not exist
+    are listed in `missing` instead of failing the request.
+    """
+    try:
+        product_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    
+    return await batch_response(db, product_ids)
+
+@router.post("/batch", response_model=ProductBatchResponse)
+async def post_products_batch(
+    batch: ProductBatchRequest,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get several products in one request, with the ids in the body.
+    
+    Same as GET /products/batch, for clients whose id lists do not fit
+    comfortably in a URL.
+    """
+    return await batch_response(db, batch.ids)
 
 @router.get("/{product_id}", response_model=ProductResponse)
-def get_product(
+async def get_product(
     product_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get a specific product by ID.
+    
+    Served from the product cache when possible; the cached payload is
+    already serialised, so it is returned without re-validation. Supports
+    conditional requests via ETag / Last-Modified.
     """
-    product = ProductService.get_product_by_id(db=db, product_id=product_id)
-    if not product:
+    payload = await AsyncProductService.get_product_payload(db=db, product_id=product_id)
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
-    return product
+    
+    updated_at = datetime.fromisoformat(payload["updated_at"]) if payload.get("updated_at") else None
+    headers = product_validators(product_id, updated_at)
+    if is_not_modified(request.headers, headers["ETag"], updated_at):
+        return not_modified(headers)
+    
+    return JSONResponse(content=payload, headers=headers)
 
 # Seller-only endpoints (require seller authentication)
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
-def create_product(
+async def create_product(
     product_data: ProductCreate,
-    seller: Seller = Depends(get_current_seller),
-    db: Session = Depends(get_db)
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new product.
     Requires seller authentication.
     """
     try:
-        return ProductService.create_product(
+        return await AsyncProductService.create_product(
             db=db,
             seller_id=seller.seller_id,
             product_data=product_data
@@ -80,18 +264,68 @@ def create_product(
             detail=f"Failed to create product: {str(e)}"
         )
 
+@router.post("/import", response_model=ProductImportResult)
+async def import_products(
+    file: UploadFile = File(..., description="CSV or NDJSON file, one product per row"),
+    format: Optional[str] = Query(None, description=f"One of {', '.join(IMPORT_FORMATS)}; guessed from the file name if omitted"),
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Bulk import products from a CSV or NDJSON file.
+    Requires seller authentication.
+    
+    Each row has `name`, `price`, and optionally `description`,
+    `stock_quantity`, `categories` (names or ids) and `images` (URLs, the
+    first one becomes the primary image). In CSV files list values are
+    separated with `|`. Valid rows are created; invalid rows are reported
+    by row number.
+    """
+    file_format = format or ProductBulkService.detect_format(file.filename, file.content_type)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not detect the import format, pass ?format=csv or ?format=ndjson"
+        )
+    
+    return await AsyncProductBulkService.import_products(
+        db=db,
+        seller_id=seller.seller_id,
+        stream=file.file,
+        file_format=file_format
+    )
+
+@router.patch("/bulk", response_model=ProductBulkUpdateResult)
+async def bulk_update_products(
+    update_data: ProductBulkUpdateRequest,
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update price and/or stock of many products in one request.
+    Requires seller authentication; only the seller's own products change.
+    
+    Returns the number of products updated and the ids that were rejected
+    because they do not exist, belong to another seller or had no changes.
+    """
+    return await AsyncProductBulkService.bulk_update(
+        db=db,
+        seller_id=seller.seller_id,
+        items=update_data.items
+    )
+
 @router.put("/{product_id}", response_model=ProductResponse)
-def update_product(
+async def update_product(
     product_id: int,
     product_data: ProductUpdate,
-    seller: Seller = Depends(get_current_seller),
-    db: Session = Depends(get_db)
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a product.
     Requires seller authentication and ownership of the product.
     """
-    updated_product = ProductService.update_product(
+    updated_product = await AsyncProductService.update_product(
         db=db,
         product_id=product_id,
         seller_id=seller.seller_id,
@@ -107,16 +341,16 @@ def update_product(
     return updated_product
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(
+async def delete_product(
     product_id: int,
-    seller: Seller = Depends(get_current_seller),
-    db: Session = Depends(get_db)
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a product.
     Requires seller authentication and ownership of the product.
     """
-    result = ProductService.delete_product(
+    result = await AsyncProductService.delete_product(
         db=db,
         product_id=product_id,
         seller_id=seller.seller_id
@@ -129,17 +363,17 @@ def delete_product(
         )
 
 @router.post("/{product_id}/images", response_model=ProductImageResponse)
-def add_product_image(
+async def add_product_image(
     product_id: int,
     image_data: ProductImageCreate,
-    seller: Seller = Depends(get_current_seller),
-    db: Session = Depends(get_db)
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add an image to a product.
     Requires seller authentication and ownership of the product.
     """
-    result = ProductService.add_product_image(
+    result = await AsyncProductService.add_product_image(
         db=db,
         product_id=product_id,
         seller_id=seller.seller_id,
@@ -155,17 +389,17 @@ def add_product_image(
     return result
 
 @router.delete("/{product_id}/images/{image_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product_image(
+async def delete_product_image(
     product_id: int,
     image_id: int,
-    seller: Seller = Depends(get_current_seller),
-    db: Session = Depends(get_db)
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete an image from a product.
     Requires seller authentication and ownership of the product.
     """
-    result = ProductService.delete_product_image(
+    result = await AsyncProductService.delete_product_image(
         db=db,
         image_id=image_id,
         seller_id=seller.seller_id
@@ -180,20 +414,64 @@ def delete_product_image(
 # Seller management routes - get seller's own products
 
 @router.get("/seller/my-products", response_model=List[ProductResponse])
-def get_seller_products(
+async def get_seller_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    seller: Seller = Depends(get_current_seller),
-    db: Session = Depends(get_db)
+    category_id: Optional[int] = None,
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    in_stock: Optional[bool] = None,
+    sort: Optional[str] = Query(None, pattern=PRODUCT_SORT_PATTERN),
+    view: str = Query("full", pattern="^(full|card)$", description="card returns the compact ProductCardResponse"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get all products for the authenticated seller.
-    Requires seller authentication.
+    Requires seller authentication. Takes the same filters, sorts and
+    `view` as GET /products/.
     """
-    products = ProductService.get_products(
-        db=db,
+    products, next_cursor = await list_page(
+        db,
+        view,
         skip=skip,
         limit=limit,
-        seller_id=seller.seller_id
+        category_id=category_id,
+        seller_id=seller.seller_id,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        sort=sort,
+        cursor=cursor
+    )
+    return conditional_list(
+        request, response, products, next_cursor,
+        cache_control="private, no-cache", card_view=view == "card"
     )
-    return products
\ No newline at end of file
+
+@router.get("/seller/export")
+async def export_seller_products(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    seller: Seller = Depends(get_current_seller_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Export all products of the authenticated seller as NDJSON or CSV.
+    Requires seller authentication.
+    
+    The file is streamed while it is read from the database, so there is
+    no size limit. The CSV layout can be fed back to /products/import.
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        AsyncProductBulkService.export_products(
+            bind=db.bind,
+            seller_id=seller.seller_id,
+            file_format=format
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'}
+    )
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
 from decimal import Decimal
 
@@ -63,4 +63,78 @@ class ProductResponse(ProductBase):
     images: List[ProductImageResponse] = []
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ProductCardResponse(BaseModel):
+    """Compact listing representation, served with view=card"""
+    product_id: int
+    name: str
+    price: Decimal
+    in_stock: bool
+    primary_image_url: Optional[str] = None
+    category_names: List[str] = []
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class ProductBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=100)
+
+class ProductBatchResponse(BaseModel):
+    products: List[ProductResponse] = []
+    missing: List[int] = []
+
+class ProductImportRow(BaseModel):
+    """One product row of a bulk import file"""
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    price: Decimal = Field(..., ge=0, max_digits=10, decimal_places=2)
+    stock_quantity: int = Field(0, ge=0)
+    categories: List[Union[int, str]] = []
+    images: List[str] = []
+    
+    @field_validator('categories', 'images', mode='before')
+    @classmethod
+    def split_list(cls, v):
+        """Accept "a|b" strings as used by CSV files"""
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return [part.strip() for part in v.split("|") if part.strip()]
+        return v
+    
+    @field_validator('images')
+    @classmethod
+    def image_url_length(cls, v):
+        if any(not url or len(url) > 255 for url in v):
+            raise ValueError('Image URLs must be between 1 and 255 characters')
+        return v
+
+class ProductImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class ProductImportResult(BaseModel):
+    created: int = 0
+    failed: int = 0
+    errors: List[ProductImportError] = []
+
+class ProductBulkUpdateItem(BaseModel):
+    product_id: int
+    price: Optional[Decimal] = Field(None, ge=0)
+    stock_quantity: Optional[int] = Field(None, ge=0)
+    
+    @field_validator('price')
+    @classmethod
+    def validate_price(cls, v):
+        if v is not None:
+            return Decimal(str(v)).quantize(Decimal('0.01'))
+        return v
+
+class ProductBulkUpdateRequest(BaseModel):
+    items: List[ProductBulkUpdateItem] = Field(..., min_length=1, max_length=10000)
+
+class ProductBulkUpdateResult(BaseModel):
+    updated: int = 0
+    rejected: List[int] = []
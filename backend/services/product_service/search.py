@@ -0,0 +1,155 @@
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from core.config import SEARCH_INDEX_TTL_SECONDS
+from models import Product
+
+# Relative weight of a match in each field, mirroring the 'A' and 'B'
+# weights given to name and description in the Postgres search_vector.
+NAME_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lowercase search terms
+
+    Behaves like the Postgres 'simple' text search configuration so both
+    backends match the same products for a given query.
+    """
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+class InvertedIndex:
+    """
+    In-process inverted index over product names and descriptions.
+
+    Used as the search backend when the database has no full-text search
+    (SQLite in tests and development). The index is built lazily from the
+    database on the first search and kept current by ProductService write
+    methods. It is per process, so a search rebuilds it once it is older
+    than ttl_seconds; that bounds how long changes made by other workers
+    stay invisible here.
+    """
+
+    def __init__(self, ttl_seconds: float = SEARCH_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._built = False
+        self._built_at = 0.0
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def build(self, db: Session) -> None:
+        """Load every product from the database into the index"""
+        built_at = time.monotonic()
+        rows = db.query(Product.product_id, Product.name, Product.description).all()
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_terms = {}
+            for product_id, name, description in rows:
+                self._add(product_id, name, description)
+            self._built = True
+            self._built_at = built_at
+
+    def ensure_built(self, db: Session) -> None:
+        """Build the index if it is missing or older than ttl_seconds"""
+        if not self._built or time.monotonic() - self._built_at >= self.ttl_seconds:
+            self.build(db)
+
+    def clear(self) -> None:
+        """Drop the index; it is rebuilt on the next search"""
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_terms = {}
+            self._built = False
+
+    def update(self, product: Product) -> None:
+        """Add or re-index a product (no-op until the index is built)"""
+        self.update_many([(product.product_id, product.name, product.description)])
+
+    def update_many(self, rows: Iterable[tuple]) -> None:
+        """Add or re-index (product_id, name, description) rows"""
+        if not self._built:
+            return
+        with self._lock:
+            for product_id, name, description in rows:
+                self._remove(product_id)
+                self._add(product_id, name, description)
+
+    def remove(self, product_id: int) -> None:
+        """Remove a product from the index"""
+        if not self._built:
+            return
+        with self._lock:
+            self._remove(product_id)
+
+    def search(self, query: str) -> Dict[int, float]:
+        """
+        Find products containing every term of the query
+
+        Args:
+            query: Free text query
+
+        Returns:
+            Mapping of product_id to relevance score
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return {}
+
+        with self._lock:
+            total_docs = max(len(self._doc_terms), 1)
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return {}
+
+            # Intersect starting from the rarest term
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                matches &= posting.keys()
+
+            scores = {}
+            for product_id in matches:
+                score = 0.0
+                for posting in postings:
+                    idf = math.log(1 + total_docs / len(posting))
+                    score += posting[product_id] * idf
+                scores[product_id] = score
+            return scores
+
+    def _add(self, product_id: int, name: Optional[str], description: Optional[str]) -> None:
+        weights: Dict[str, float] = defaultdict(float)
+        for term in tokenize(name):
+            weights[term] += NAME_WEIGHT
+        for term in tokenize(description):
+            weights[term] += DESCRIPTION_WEIGHT
+
+        for term, weight in weights.items():
+            self._postings[term][product_id] = weight
+        self._doc_terms[product_id] = set(weights)
+
+    def _remove(self, product_id: int) -> None:
+        for term in self._doc_terms.pop(product_id, ()):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(product_id, None)
+            if not posting:
+                del self._postings[term]
+
+# Process-wide index used by ProductService on databases without full-text search
+product_search_index = InvertedIndex()
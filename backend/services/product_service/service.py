@@ -1,18 +1,102 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Union
+from sqlalchemy import Float, and_, or_, cast, func, literal, literal_column, tuple_
+from sqlalchemy.orm import Session, Query, selectinload
+from typing import Any, Dict, List, Optional, Tuple, Union
+from decimal import Decimal, InvalidOperation
 from fastapi import HTTPException, status
 
-from models import Product, Category, ProductImage, Seller
-from .schemas import ProductCreate, ProductUpdate, ProductImageCreate
+from core.pagination import encode_cursor, decode_cursor
+from core.replicas import replica_lag_window
+from models import Product, ProductCard, Category, ProductImage, Seller, product_categories, PRODUCT_SEARCH_CONFIG
+from .schemas import ProductCreate, ProductUpdate, ProductImageCreate, ProductResponse
+from .search import product_search_index
+from .cache import product_cache
+from .card_service import ProductCardService
+
+# Orders accepted by get_products_page, as (sort column, descending). Every
+# order ends with product_id so it is total and can be resumed from a cursor.
+PRODUCT_SORTS = {
+    None: (None, False),
+    "price": (Product.price, False),
+    "name": (Product.name, False),
+    # Ids are issued in creation order, so the primary key walked backwards
+    # lists the newest products first without a timestamp tiebreak
+    "newest": (None, True),
+}
 
 class ProductService:
+    @staticmethod
+    def with_relationships(query: Query) -> Query:
+        """
+        Eager-load the relationships serialised by ProductResponse
+        
+        Categories and images are fetched with one batched SELECT ... IN
+        each, so a page costs three queries no matter how many products
+        it holds.
+        """
+        return query.options(
+            selectinload(Product.categories),
+            selectinload(Product.images)
+        )
+    
+    @staticmethod
+    def apply_filters(
+        query: Query,
+        seller_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        in_stock: Optional[bool] = None
+    ) -> Query:
+        """Apply the optional listing filters shared by list and search queries"""
+        if seller_id is not None:
+            query = query.filter(Product.seller_id == seller_id)
+            
+        if category_id is not None:
+            # Filter on the junction table alone; no need to join categories
+            query = query.join(
+                product_categories, product_categories.c.product_id == Product.product_id
+            ).filter(product_categories.c.category_id == category_id)
+            
+        if min_price is not None:
+            query = query.filter(Product.price >= min_price)
+            
+        if max_price is not None:
+            query = query.filter(Product.price <= max_price)
+            
+        if in_stock is not None:
+            query = query.filter(
+                Product.stock_quantity > 0 if in_stock else Product.stock_quantity <= 0
+            )
+            
+        return query
+    
+    @staticmethod
+    def touch(db: Session, product_ids: List[int]) -> None:
+        """
+        Bump updated_at for products whose serialised form changed without
+        a change to their own row (images, category names)
+        
+        Does not commit; the caller commits with the rest of its changes.
+        """
+        if not product_ids:
+            return
+        db.query(Product).filter(Product.product_id.in_(product_ids)).update(
+            {Product.updated_at: func.now()},
+            synchronize_session=False
+        )
+    
     @staticmethod
     def get_products(
         db: Session,
         skip: int = 0,
         limit: int = 100,
         seller_id: Optional[int] = None,
-        category_id: Optional[int] = None
+        category_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        in_stock: Optional[bool] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Product]:
         """
         Get products with optional filters
@@ -23,24 +107,403 @@ class ProductService:
             limit: Max number of records to return
             seller_id: Filter by seller_id
             category_id: Filter by category_id
+            min_price: Minimum price (inclusive)
+            max_price: Maximum price (inclusive)
+            in_stock: Only products with (True) or without (False) stock
+            sort: One of "price", "newest" or "name"; product_id order if omitted
+            cursor: Keyset cursor from a previous page (overrides skip)
             
         Returns:
             List of products
         """
-        query = db.query(Product)
+        products, _ = ProductService.get_products_page(
+            db=db,
+            skip=skip,
+            limit=limit,
+            seller_id=seller_id,
+            category_id=category_id,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            sort=sort,
+            cursor=cursor
+        )
+        return products
+    
+    @staticmethod
+    def get_products_page(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        seller_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        in_stock: Optional[bool] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[str]]:
+        """
+        Get one page of products in the requested order
         
-        if seller_id is not None:
-            query = query.filter(Product.seller_id == seller_id)
+        When a cursor is given the page starts right after the product it
+        points to (keyset pagination), so deep pages cost the same as the
+        first one. Without a cursor the legacy skip/limit offset is used.
+        Cursors are only valid for the sort they were issued for.
+        
+        Args:
+            db: Database session
+            skip: Number of records to skip (ignored when cursor is set)
+            limit: Max number of records to return
+            seller_id: Filter by seller_id
+            category_id: Filter by category_id
+            min_price: Minimum price (inclusive)
+            max_price: Maximum price (inclusive)
+            in_stock: Only products with (True) or without (False) stock
+            sort: One of "price", "newest" or "name"; product_id order if omitted
+            cursor: Keyset cursor from a previous page
             
-        if category_id is not None:
-            query = query.join(Product.categories).filter(Category.category_id == category_id)
+        Returns:
+            Tuple of (products, next_cursor); next_cursor is None on the last page
+            
+        Raises:
+            HTTPException: If the sort or the cursor is invalid
+        """
+        query = ProductService.with_relationships(db.query(Product))
+        return ProductService._listing_page(
+            query, skip, limit, seller_id, category_id,
+            min_price, max_price, in_stock, sort, cursor
+        )
+    
+    @staticmethod
+    def get_product_cards_page(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        seller_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        in_stock: Optional[bool] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[ProductCard], Optional[str]]:
+        """
+        Get one page of product cards
+        
+        Takes the same filters, sorts and cursors as get_products_page, but
+        reads the denormalised product_cards rows: one query per page, with
+        no image or category loads.
+        
+        Returns:
+            Tuple of (cards, next_cursor); next_cursor is None on the last page
+            
+        Raises:
+            HTTPException: If the sort or the cursor is invalid
+        """
+        query = db.query(ProductCard).join(Product, Product.product_id == ProductCard.product_id)
+        return ProductService._listing_page(
+            query, skip, limit, seller_id, category_id,
+            min_price, max_price, in_stock, sort, cursor
+        )
+    
+    @staticmethod
+    def _listing_page(
+        query: Query,
+        skip: int,
+        limit: int,
+        seller_id: Optional[int],
+        category_id: Optional[int],
+        min_price: Optional[Decimal],
+        max_price: Optional[Decimal],
+        in_stock: Optional[bool],
+        sort: Optional[str],
+        cursor: Optional[str]
+    ) -> Tuple[list, Optional[str]]:
+        """Filter, order and page a query that selects from products"""
+        if sort not in PRODUCT_SORTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid sort, expected one of: {', '.join(s for s in PRODUCT_SORTS if s)}"
+            )
+        sort_column, descending = PRODUCT_SORTS[sort]
+        keys = [Product.product_id] if sort_column is None else [sort_column, Product.product_id]
+        
+        query = ProductService.apply_filters(
+            query,
+            seller_id=seller_id,
+            category_id=category_id,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock
+        )
+        query = query.order_by(*(key.desc() if descending else key for key in keys))
+        
+        if cursor is not None:
+            position = ProductService._decode_list_cursor(cursor, sort)
+            row = keys[0] if len(keys) == 1 else tuple_(*keys)
+            after = position[0] if len(keys) == 1 else tuple_(*position)
+            query = query.filter(row < after if descending else row > after)
+        else:
+            query = query.offset(skip)
+        
+        # Fetch one extra row to find out whether another page exists
+        rows = query.limit(limit + 1).all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = ProductService._encode_list_cursor(rows[-1], sort)
+            
+        return rows, next_cursor
+    
+    @staticmethod
+    def _encode_list_cursor(product: Union[Product, ProductCard], sort: Optional[str]) -> str:
+        """Cursor pointing at the last product (or card) of a listing page"""
+        if sort is None:
+            return encode_cursor({"id": product.product_id})
+        
+        payload: Dict[str, Any] = {"s": sort, "id": product.product_id}
+        if sort == "price":
+            payload["k"] = str(product.price)
+        elif sort == "name":
+            payload["k"] = product.name
+        return encode_cursor(payload)
+    
+    @staticmethod
+    def _decode_list_cursor(cursor: str, sort: Optional[str]) -> List[Any]:
+        """
+        Decode a listing cursor into the sort key values of its product
+        
+        Raises:
+            HTTPException: If the cursor is malformed or was issued for another sort
+        """
+        position = decode_cursor(cursor)
+        last_id, key = position.get("id"), position.get("k")
+        
+        valid = isinstance(last_id, int) and position.get("s") == sort
+        if sort in ("price", "name"):
+            valid = valid and isinstance(key, str)
+        if valid and sort == "price":
+            try:
+                key = Decimal(key)
+                valid = key.is_finite()
+            except InvalidOperation:
+                valid = False
+        
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        return [last_id] if PRODUCT_SORTS[sort][0] is None else [key, last_id]
+    
+    @staticmethod
+    def search_products(
+        db: Session,
+        q: str,
+        limit: int = 100,
+        seller_id: Optional[int] = None,
+        category_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Product], Optional[str]]:
+        """
+        Full-text search over product names and descriptions
+        
+        Results are ordered by relevance (name matches weigh more than
+        description matches), then by product_id. Postgres uses the indexed
+        products.search_vector column; other databases fall back to the
+        in-process inverted index.
+        
+        Args:
+            db: Database session
+            q: Free text query; every term must match
+            limit: Max number of records to return
+            seller_id: Filter by seller_id
+            category_id: Filter by category_id
+            min_price: Minimum price (inclusive)
+            max_price: Maximum price (inclusive)
+            cursor: Keyset cursor from a previous page
+            
+        Returns:
+            Tuple of (products, next_cursor); next_cursor is None on the last page
             
-        return query.offset(skip).limit(limit).all()
+        Raises:
+            HTTPException: If the cursor is invalid
+        """
+        after = None
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            last_rank, last_id = position.get("r"), position.get("id")
+            if not isinstance(last_rank, (int, float)) or not isinstance(last_id, int):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            after = (float(last_rank), last_id)
+        
+        filters = dict(
+            seller_id=seller_id,
+            category_id=category_id,
+            min_price=min_price,
+            max_price=max_price
+        )
+        
+        if db.get_bind().dialect.name == "postgresql":
+            ranked = ProductService._search_postgres(db, q, limit + 1, after, filters)
+        else:
+            ranked = ProductService._search_in_process(db, q, limit + 1, after, filters)
+        
+        has_more = len(ranked) > limit
+        ranked = ranked[:limit]
+        
+        next_cursor = None
+        if has_more and ranked:
+            product, rank = ranked[-1]
+            next_cursor = encode_cursor({"r": rank, "id": product.product_id})
+        
+        return [product for product, _ in ranked], next_cursor
+    
+    @staticmethod
+    def _search_postgres_query(db: Session, q: str, after, filters: dict) -> Query:
+        """
+        Matches with their ts_rank over the GIN-indexed search_vector
+        
+        ts_rank returns real, but cursors carry the rank as a Python float
+        (double); the rank is cast to double precision everywhere so equal
+        ranks compare equal in the cursor predicate.
+        """
+        search_vector = literal_column("products.search_vector")
+        ts_query = func.plainto_tsquery(PRODUCT_SEARCH_CONFIG, q)
+        rank = cast(func.ts_rank(search_vector, ts_query), Float(53))
+        
+        query = ProductService.with_relationships(db.query(Product, rank.label("rank")))
+        query = query.filter(search_vector.op("@@")(ts_query))
+        query = ProductService.apply_filters(query, **filters)
+        
+        if after is not None:
+            last_rank, last_id = after
+            last_rank = literal(float(last_rank), Float(53))
+            query = query.filter(or_(
+                rank < last_rank,
+                and_(rank == last_rank, Product.product_id > last_id)
+            ))
+        
+        return query.order_by(rank.desc(), Product.product_id)
+    
+    @staticmethod
+    def _search_postgres(db: Session, q: str, limit: int, after, filters: dict) -> List[tuple]:
+        """Rank matches with ts_rank over the GIN-indexed search_vector"""
+        rows = ProductService._search_postgres_query(db, q, after, filters).limit(limit).all()
+        return [(product, float(score)) for product, score in rows]
+    
+    @staticmethod
+    def _search_in_process(db: Session, q: str, limit: int, after, filters: dict) -> List[tuple]:
+        """Rank matches with the in-process index, then apply filters in SQL"""
+        product_search_index.ensure_built(db)
+        scores = product_search_index.search(q)
+        if not scores:
+            return []
+        
+        query = db.query(Product.product_id).filter(Product.product_id.in_(list(scores)))
+        allowed = {product_id for (product_id,) in ProductService.apply_filters(query, **filters)}
+        
+        ordered = sorted(allowed, key=lambda product_id: (-scores[product_id], product_id))
+        if after is not None:
+            last_rank, last_id = after
+            ordered = [
+                product_id for product_id in ordered
+                if (-scores[product_id], product_id) > (-last_rank, last_id)
+            ]
+        page_ids = ordered[:limit]
+        if not page_ids:
+            return []
+        
+        products = ProductService.with_relationships(db.query(Product)).filter(
+            Product.product_id.in_(page_ids)
+        ).all()
+        by_id = {product.product_id: product for product in products}
+        
+        return [
+            (by_id[product_id], scores[product_id])
+            for product_id in page_ids if product_id in by_id
+        ]
     
     @staticmethod
     def get_product_by_id(db: Session, product_id: int) -> Optional[Product]:
         """Get a product by ID"""
-        return db.query(Product).filter(Product.product_id == product_id).first()
+        return ProductService.with_relationships(db.query(Product)).filter(
+            Product.product_id == product_id
+        ).first()
+    
+    @staticmethod
+    def get_product_payload(db: Session, product_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a product serialised as a ProductResponse dict, using the cache
+        
+        Args:
+            db: Database session
+            product_id: ID of the product
+            
+        Returns:
+            JSON-ready product payload, or None if the product does not exist
+        """
+        payload = product_cache.get(product_id)
+        if payload is not None:
+            return payload
+        
+        generation = product_cache.generation
+        product = ProductService.get_product_by_id(db, product_id)
+        if not product:
+            return None
+        
+        payload = ProductResponse.model_validate(product).model_dump(mode="json")
+        product_cache.set(product_id, payload, generation=generation, min_age=replica_lag_window(db))
+        
+        return payload
+    
+    @staticmethod
+    def get_product_payloads(db: Session, product_ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        Get several products serialised as ProductResponse dicts
+        
+        Cached products are served from the cache; the rest are loaded with
+        a single query and cached.
+        
+        Args:
+            db: Database session
+            product_ids: IDs to look up; duplicates are collapsed
+            
+        Returns:
+            Tuple of (payloads in requested order, ids that do not exist)
+        """
+        ordered_ids = list(dict.fromkeys(product_ids))
+        
+        payloads = {}
+        for product_id in ordered_ids:
+            payload = product_cache.get(product_id)
+            if payload is not None:
+                payloads[product_id] = payload
+        
+        to_load = [product_id for product_id in ordered_ids if product_id not in payloads]
+        if to_load:
+            generation = product_cache.generation
+            products = ProductService.with_relationships(db.query(Product)).filter(
+                Product.product_id.in_(to_load)
+            ).all()
+            for product in products:
+                payload = ProductResponse.model_validate(product).model_dump(mode="json")
+                product_cache.set(product.product_id, payload, generation=generation, min_age=replica_lag_window(db))
+                payloads[product.product_id] = payload
+        
+        found = [payloads[product_id] for product_id in ordered_ids if product_id in payloads]
+        missing = [product_id for product_id in ordered_ids if product_id not in payloads]
+        
+        return found, missing
     
     @staticmethod
     def create_product(db: Session, seller_id: int, product_data: ProductCreate) -> Product:
@@ -101,10 +564,14 @@ class ProductService:
             )
             db.add(db_image)
         
+        ProductCardService.refresh(db, [db_product.product_id])
+        
         # Commit changes
         db.commit()
         db.refresh(db_product)
         
+        product_search_index.update(db_product)
+        
         return db_product
     
     @staticmethod
@@ -160,10 +627,17 @@ class ProductService:
                 
             db_product.categories = categories
         
+        # Category changes do not touch the products row, so bump it explicitly
+        db_product.updated_at = func.now()
+        ProductCardService.refresh(db, [product_id])
+        
         # Commit changes
         db.commit()
         db.refresh(db_product)
         
+        product_cache.evict(product_id)
+        product_search_index.update(db_product)
+        
         return db_product
     
     @staticmethod
@@ -190,10 +664,43 @@ class ProductService:
         
         # Delete product
         db.delete(db_product)
+        ProductCardService.remove(db, [product_id])
         db.commit()
         
+        product_cache.evict(product_id)
+        product_search_index.remove(product_id)
+        
         return True
     
+    @staticmethod
+    def remove_seller_products(db: Session, seller_id: int) -> List[int]:
+        """
+        Drop the cards of a seller's products before the seller is deleted
+        
+        The products themselves go with the seller (cascade). Does not
+        commit; pass the returned ids to forget_products() after committing.
+        
+        Args:
+            db: Database session
+            seller_id: ID of the seller being deleted
+            
+        Returns:
+            IDs of the seller's products
+        """
+        product_ids = [
+            product_id for (product_id,) in
+            db.query(Product.product_id).filter(Product.seller_id == seller_id).all()
+        ]
+        ProductCardService.remove(db, product_ids)
+        return product_ids
+    
+    @staticmethod
+    def forget_products(product_ids: List[int]) -> None:
+        """Evict deleted products from the product cache and the search index"""
+        product_cache.evict_many(product_ids)
+        for product_id in product_ids:
+            product_search_index.remove(product_id)
+    
     @staticmethod
     def add_product_image(
         db: Session,
@@ -231,9 +738,13 @@ class ProductService:
         )
         
         db.add(db_image)
+        db_product.updated_at = func.now()
+        ProductCardService.refresh(db, [product_id])
         db.commit()
         db.refresh(db_image)
         
+        product_cache.evict(product_id)
+        
         return db_image
     
     @staticmethod
@@ -263,7 +774,12 @@ class ProductService:
             return False
         
         # Delete image
+        product_id = db_image.product_id
         db.delete(db_image)
+        ProductService.touch(db, [product_id])
+        ProductCardService.refresh(db, [product_id])
         db.commit()
         
+        product_cache.evict(product_id)
+        
         return True
\ No newline at end of file
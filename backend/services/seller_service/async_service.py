@@ -0,0 +1,81 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Union
+
+from models import Seller, User
+from services.auth_service.cache import invalidate_seller
+from services.product_service.service import ProductService
+from .schemas import SellerCreate, SellerUpdate
+
+class AsyncSellerService:
+    """SellerService for async routes"""
+    
+    @staticmethod
+    async def get_seller_by_user_id(db: AsyncSession, user_id: int) -> Optional[Seller]:
+        """Get a seller by user ID"""
+        return await db.scalar(select(Seller).where(Seller.user_id == user_id).limit(1))
+    
+    @staticmethod
+    async def get_seller_by_id(db: AsyncSession, seller_id: int) -> Optional[Seller]:
+        """Get a seller by seller ID"""
+        return await db.get(Seller, seller_id)
+    
+    @staticmethod
+    async def create_seller(db: AsyncSession, user_id: int, seller_data: SellerCreate) -> Seller:
+        """Create a new seller profile for an existing user"""
+        if await db.get(User, user_id) is None:
+            raise ValueError("User not found")
+        
+        if await AsyncSellerService.get_seller_by_user_id(db, user_id) is not None:
+            raise ValueError("Seller profile already exists for this user")
+        
+        db_seller = Seller(
+            user_id=user_id,
+            business_name=seller_data.business_name,
+            business_description=seller_data.business_description,
+            id_type=seller_data.id_type,
+            number_id=seller_data.number_id
+        )
+        
+        db.add(db_seller)
+        await db.commit()
+        await db.refresh(db_seller)
+        
+        invalidate_seller(db_seller.seller_id)
+        
+        return db_seller
+    
+    @staticmethod
+    async def update_seller(db: AsyncSession, seller_id: int, seller_data: SellerUpdate) -> Union[Seller, bool]:
+        """Update seller information"""
+        db_seller = await db.get(Seller, seller_id)
+        if not db_seller:
+            return False
+        
+        update_data = seller_data.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            if hasattr(db_seller, key):
+                setattr(db_seller, key, value)
+        
+        await db.commit()
+        await db.refresh(db_seller)
+        
+        invalidate_seller(seller_id)
+        
+        return db_seller
+    
+    @staticmethod
+    async def delete_seller(db: AsyncSession, seller_id: int) -> bool:
+        """Delete a seller profile"""
+        db_seller = await db.get(Seller, seller_id)
+        if not db_seller:
+            return False
+        
+        product_ids = await db.run_sync(ProductService.remove_seller_products, seller_id)
+        await db.delete(db_seller)
+        await db.commit()
+        
+        invalidate_seller(seller_id)
+        ProductService.forget_products(product_ids)
+        
+        return True
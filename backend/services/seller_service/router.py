@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_async_db
 from models import User, Seller
 from .schemas import SellerCreate, SellerResponse, SellerUpdate
-from .service import SellerService
-from services.auth_service.middleware import get_current_user, get_current_active_user
+from .async_service import AsyncSellerService
+from services.auth_service.middleware import get_current_active_user_async
 
 router = APIRouter(
     prefix="/sellers",
@@ -13,17 +13,17 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=SellerResponse, status_code=status.HTTP_201_CREATED)
-def create_seller(
+async def create_seller(
     seller_data: SellerCreate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register as a seller (for existing users).
     Requires authentication.
     """
     try:
-        seller = SellerService.create_seller(
+        seller = await AsyncSellerService.create_seller(
             db=db,
             user_id=current_user.user_id,
             seller_data=seller_data
@@ -36,15 +36,15 @@ def create_seller(
         )
 
 @router.get("/me", response_model=SellerResponse)
-def get_current_seller(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def get_current_seller(
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current user's seller profile.
     Requires authentication and seller role.
     """
-    seller = SellerService.get_seller_by_user_id(db=db, user_id=current_user.user_id)
+    seller = await AsyncSellerService.get_seller_by_user_id(db=db, user_id=current_user.user_id)
     if not seller:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,23 +53,23 @@ def get_current_seller(
     return seller
 
 @router.put("/me", response_model=SellerResponse)
-def update_current_seller(
+async def update_current_seller(
     seller_data: SellerUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user's seller profile.
     Requires authentication and seller role.
     """
-    seller = SellerService.get_seller_by_user_id(db=db, user_id=current_user.user_id)
+    seller = await AsyncSellerService.get_seller_by_user_id(db=db, user_id=current_user.user_id)
     if not seller:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Seller profile not found"
         )
     
-    updated_seller = SellerService.update_seller(
+    updated_seller = await AsyncSellerService.update_seller(
         db=db,
         seller_id=seller.seller_id,
         seller_data=seller_data
@@ -84,22 +84,22 @@ def update_current_seller(
     return updated_seller
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
-def delete_current_seller(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+async def delete_current_seller(
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete current user's seller profile.
     Requires authentication and seller role.
     """
-    seller = SellerService.get_seller_by_user_id(db=db, user_id=current_user.user_id)
+    seller = await AsyncSellerService.get_seller_by_user_id(db=db, user_id=current_user.user_id)
     if not seller:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Seller profile not found"
         )
     
-    result = SellerService.delete_seller(db=db, seller_id=seller.seller_id)
+    result = await AsyncSellerService.delete_seller(db=db, seller_id=seller.seller_id)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
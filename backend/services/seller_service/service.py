@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session
 from typing import Optional, Union
 
 from models import Seller, User
+from services.auth_service.cache import invalidate_seller
+from services.product_service.service import ProductService
 from .schemas import SellerCreate, SellerUpdate
 
 class SellerService:
@@ -41,6 +43,8 @@ class SellerService:
         db.commit()
         db.refresh(db_seller)
         
+        invalidate_seller(db_seller.seller_id)
+        
         return db_seller
     
     @staticmethod
@@ -59,6 +63,8 @@ class SellerService:
         db.commit()
         db.refresh(db_seller)
         
+        invalidate_seller(seller_id)
+        
         return db_seller
     
     @staticmethod
@@ -68,7 +74,11 @@ class SellerService:
         if not db_seller:
             return False
         
+        product_ids = ProductService.remove_seller_products(db, seller_id)
         db.delete(db_seller)
         db.commit()
         
+        invalidate_seller(seller_id)
+        ProductService.forget_products(product_ids)
+        
         return True
\ No newline at end of file
@@ -0,0 +1,111 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Union, List
+
+from models import User, Seller
+from core.password_hasher import password_hasher
+from services.auth_service.cache import invalidate_user
+from services.product_service.service import ProductService
+from .schemas import UserCreate, UserUpdate
+
+class AsyncUserService:
+    """UserService for async routes; password hashing is awaited, not run inline"""
+    
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        """Get a user by their email address"""
+        return await db.scalar(select(User).where(User.email == email).limit(1))
+    
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get a user by their ID"""
+        return await db.get(User, user_id)
+    
+    @staticmethod
+    async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+        """Get all users with pagination"""
+        result = await db.scalars(select(User).order_by(User.user_id).offset(skip).limit(limit))
+        return list(result)
+    
+    @staticmethod
+    async def create_user(db: AsyncSession, user: UserCreate) -> User:
+        """Create a new user with hashed password"""
+        hashed_password = await password_hasher.hash_async(user.password)
+        
+        db_user = User(
+            email=user.email,
+            password_hash=hashed_password,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            phone=user.phone,
+            address=user.address
+        )
+        
+        db.add(db_user)
+        await db.commit()
+        await db.refresh(db_user)
+        
+        return db_user
+    
+    @staticmethod
+    async def update_user(db: AsyncSession, user_id: int, user_data: UserUpdate) -> Union[User, bool]:
+        """
+        Update user information
+        
+        Args:
+            db: Async database session
+            user_id: ID of the user to update
+            user_data: New user data
+            
+        Returns:
+            Updated user object if successful, False if user not found
+        """
+        db_user = await db.get(User, user_id)
+        if not db_user:
+            return False
+        
+        # Email changes are not allowed
+        update_data = user_data.model_dump(exclude_unset=True, exclude={"email"})
+        
+        if "password" in update_data:
+            update_data["password_hash"] = await password_hasher.hash_async(update_data.pop("password"))
+        
+        for key, value in update_data.items():
+            if hasattr(db_user, key):
+                setattr(db_user, key, value)
+        
+        await db.commit()
+        await db.refresh(db_user)
+        
+        invalidate_user(db_user.email)
+        
+        return db_user
+    
+    @staticmethod
+    async def delete_user(db: AsyncSession, user_id: int) -> bool:
+        """
+        Delete a user by ID
+        
+        Args:
+            db: Async database session
+            user_id: ID of the user to delete
+            
+        Returns:
+            True if successful, False if user not found
+        """
+        db_user = await db.get(User, user_id)
+        if not db_user:
+            return False
+        
+        email = db_user.email
+        seller_id = await db.scalar(select(Seller.seller_id).where(Seller.user_id == user_id))
+        product_ids = []
+        if seller_id is not None:
+            product_ids = await db.run_sync(ProductService.remove_seller_products, seller_id)
+        await db.delete(db_user)
+        await db.commit()
+        
+        invalidate_user(email, seller_id)
+        ProductService.forget_products(product_ids)
+        
+        return True
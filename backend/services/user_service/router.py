@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_async_db
 from models import User
 from .schemas import UserCreate, UserResponse, UserUpdate
-from .service import UserService
-from services.auth_service.middleware import get_current_user, get_current_active_user
+from .async_service import AsyncUserService
+from services.auth_service.middleware import get_current_active_user_async
 
 router = APIRouter(
     prefix="/users",
@@ -13,12 +13,12 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new user with the given details.
     """
     # Check if user with this email already exists
-    db_user = UserService.get_user_by_email(db, email=user.email)
+    db_user = await AsyncUserService.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -26,10 +26,10 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create the new user
-    return UserService.create_user(db=db, user=user)
+    return await AsyncUserService.create_user(db=db, user=user)
 
 @router.get("/me", response_model=UserResponse)
-async def read_current_user(current_user: User = Depends(get_current_active_user)):
+async def read_current_user(current_user: User = Depends(get_current_active_user_async)):
     """
     Get the currently authenticated user's information.
     Requires a valid JWT token in the Authorization header.
@@ -39,8 +39,8 @@ async def read_current_user(current_user: User = Depends(get_current_active_user
 @router.put("/me", response_model=UserResponse)
 async def update_current_user(
     user_data: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update the currently authenticated user's details.
@@ -54,7 +54,7 @@ async def update_current_user(
             detail="Email address cannot be changed"
         )
     
-    result = UserService.update_user(db=db, user_id=current_user.user_id, user_data=user_data)
+    result = await AsyncUserService.update_user(db=db, user_id=current_user.user_id, user_data=user_data)
     
     if result is False:
         raise HTTPException(
@@ -66,14 +66,14 @@ async def update_current_user(
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_current_user(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_active_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete the currently authenticated user's account.
     Requires a valid JWT token in the Authorization header.
     """
-    result = UserService.delete_user(db=db, user_id=current_user.user_id)
+    result = await AsyncUserService.delete_user(db=db, user_id=current_user.user_id)
     
     if not result:
         raise HTTPException(
@@ -2,7 +2,9 @@ from sqlalchemy.orm import Session
 from typing import Optional, Union, List
 
 from models import User
-from core.security import get_password_hash
+from core.password_hasher import password_hasher
+from services.auth_service.cache import invalidate_user
+from services.product_service.service import ProductService
 from .schemas import UserCreate, UserUpdate
 
 class UserService:
@@ -24,7 +26,7 @@ class UserService:
     @staticmethod
     def create_user(db: Session, user: UserCreate) -> User:
         """Create a new user with hashed password"""
-        hashed_password = get_password_hash(user.password)
+        hashed_password = password_hasher.hash(user.password)
         
         db_user = User(
             email=user.email,
@@ -64,7 +66,7 @@ class UserService:
         
         # Handle password update
         if "password" in update_data:
-            update_data["password_hash"] = get_password_hash(update_data.pop("password"))
+            update_data["password_hash"] = password_hasher.hash(update_data.pop("password"))
         
         for key, value in update_data.items():
             if hasattr(db_user, key):
@@ -73,6 +75,8 @@ class UserService:
         db.commit()
         db.refresh(db_user)
         
+        invalidate_user(db_user.email)
+        
         return db_user
     
     @staticmethod
@@ -91,7 +95,15 @@ class UserService:
         if not db_user:
             return False
         
+        email = db_user.email
+        seller_id = db_user.seller.seller_id if db_user.seller else None
+        product_ids = []
+        if seller_id is not None:
+            product_ids = ProductService.remove_seller_products(db, seller_id)
         db.delete(db_user)
         db.commit()
         
+        invalidate_user(email, seller_id)
+        ProductService.forget_products(product_ids)
+        
         return True
\ No newline at end of file
@@ -1,24 +1,59 @@
+import os
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from main import app
-from core.database import get_db
-from models import Base
+# Test database profile and cheap bcrypt; must be set before the app
+# modules are imported
+os.environ.setdefault("APP_ENV", "test")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Any request running more statements than this fails its test
+os.environ.setdefault("QUERY_BUDGET", "40")
 
-# Create in-memory SQLite database for testing
-TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+from main import create_app
+from core.database import get_db, get_async_db
+from core.replicas import get_read_db, get_async_read_db
+from models import Base, User, Seller
+from core.security import get_password_hash
+from core.cache import reset_all_caches
+from core.sql_instrumentation import sql_instrumentation
+from services.product_service.search import product_search_index
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    Application built once for the test session.
+    """
+    return create_app()
+
+@pytest.fixture(autouse=True)
+def reset_process_state():
+    """
+    Drop process-wide indexes and caches so each test starts cold.
+    """
+    product_search_index.clear()
+    reset_all_caches()
+    yield
+
+@pytest.fixture(scope="function")
+def test_db_path(tmp_path):
+    """
+    SQLite file for each test, shared by the sync and async engines.
+    """
+    return tmp_path / "test.db"
 
 @pytest.fixture(scope="function")
-def test_db():
+def test_db(test_db_path):
     """
     Create a fresh database for each test.
     """
-    # Create in-memory SQLite engine
+    # Create SQLite engine
     engine = create_engine(
-        TEST_SQLALCHEMY_DATABASE_URL,
+        f"sqlite:///{test_db_path}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
@@ -35,9 +70,20 @@ def test_db():
         yield db
     finally:
         db.close()
+        engine.dispose()
+
+@pytest.fixture(scope="function")
+def test_async_engine(test_db, test_db_path):
+    """
+    Async engine on the test database, for the async routes.
+    """
+    # A connection per session, opened and closed on the client's event loop
+    engine = create_async_engine(f"sqlite+aiosqlite:///{test_db_path}", poolclass=NullPool)
+    yield engine
+    engine.sync_engine.dispose()
 
 @pytest.fixture(scope="function")
-def client(test_db):
+def client(app, test_db, test_async_engine):
     """
     Create a test client using the test database session.
     """
@@ -48,12 +94,99 @@ def client(test_db):
         finally:
             pass
     
-    # Apply the dependency override
+    TestAsyncSessionLocal = async_sessionmaker(test_async_engine, autoflush=False, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with TestAsyncSessionLocal() as db:
+            yield db
+    
+    # Apply the dependency overrides
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     
     # Create and return the test client
     with TestClient(app) as c:
         yield c
     
     # Clear dependency overrides after test is done
-    app.dependency_overrides = {}
\ No newline at end of file
+    app.dependency_overrides = {}
+
+@pytest.fixture(scope="function")
+def seller(test_db):
+    """
+    Create a user with a seller profile.
+    """
+    user = User(
+        email="seller.fixture@example.com",
+        password_hash=get_password_hash("sellerpassword123"),
+        first_name="Seller",
+        last_name="Fixture"
+    )
+    test_db.add(user)
+    test_db.flush()
+    
+    db_seller = Seller(
+        user_id=user.user_id,
+        business_name="Fixture Store",
+        id_type="NIT",
+        number_id="900123456"
+    )
+    test_db.add(db_seller)
+    test_db.commit()
+    test_db.refresh(db_seller)
+    
+    return db_seller
+
+@pytest.fixture(scope="function")
+def seller_headers(client, seller):
+    """
+    Log in as the seller fixture and return the Authorization header.
+    """
+    response = client.post("/auth/token", data={
+        "username": "seller.fixture@example.com",
+        "password": "sellerpassword123"
+    })
+    assert response.status_code == 200
+    
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture(scope="function")
+def query_counter(test_db, test_async_engine):
+    """
+    Record every SQL statement sent to the test database.
+    
+    Covers the sync and the async engine. Yields the list of statements;
+    clear it before the call under test.
+    """
+    engines = [test_db.get_bind(), test_async_engine.sync_engine]
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(scope="function")
+def query_budget():
+    """
+    Tighten the per-request statement budget for one test.
+    
+    Call the yielded function with the budget; a request exceeding it
+    raises QueryBudgetExceeded.
+    """
+    original = sql_instrumentation.budget
+    
+    def set_budget(budget: int):
+        sql_instrumentation.budget = budget
+    
+    yield set_budget
+    sql_instrumentation.budget = original
@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.config import AppSettings
+from core.database import get_db
+from core.schema_version import SchemaVersionError
+from main import create_app
+from services.auth_service.middleware import get_current_seller
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class TestAppFactory:
+    def test_importing_main_is_lazy(self):
+        """Test that importing main loads neither FastAPI, the database nor the routers"""
+        heavy = ["fastapi", "sqlalchemy", "alembic", "core.database", "services.user_service.router"]
+        result = subprocess.run(
+            [sys.executable, "-c", f"import json, sys, main; print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"],
+            cwd=BACKEND_DIR, env={**os.environ, "APP_ENV": "test"}, capture_output=True, text=True, check=True
+        )
+
+        assert json.loads(result.stdout) == []
+
+    def test_lifespan_creates_static_dir(self, tmp_path):
+        """Test that the static directory is created at startup, not when the app is built"""
+        static_dir = tmp_path / "static"
+        app = create_app(AppSettings(static_dir=str(static_dir), schema_check=False))
+        assert not static_dir.exists()
+
+        with TestClient(app) as client:
+            assert client.get("/health").status_code == 200
+
+        assert (static_dir / "images" / "products").is_dir()
+
+    def test_uploads_go_to_settings_static_dir(self, tmp_path, test_db, seller):
+        """Test that uploaded images are written to, and served from, the configured static directory"""
+        static_dir = tmp_path / "static"
+        app = create_app(AppSettings(static_dir=str(static_dir), schema_check=False))
+        app.dependency_overrides[get_db] = lambda: test_db
+        app.dependency_overrides[get_current_seller] = lambda: seller
+
+        with TestClient(app) as client:
+            response = client.post(
+                "/files/product-image",
+                files={"file": ("lamp.png", b"image-bytes", "image/png")},
+                data={"category": "Lighting", "product_id": "7"}
+            )
+            served = client.get(f"/static{response.json()['file_path']}")
+
+        assert response.status_code == 200
+        assert [p.name for p in (static_dir / "images" / "products" / "lighting" / "7").iterdir()] == [response.json()["file_name"]]
+        assert served.content == b"image-bytes"
+
+    def test_cors_origins_from_settings(self, tmp_path):
+        """Test that only the configured origins are allowed"""
+        app = create_app(AppSettings(cors_origins=("https://shop.example.com",), static_dir=str(tmp_path), schema_check=False))
+        preflight = {"Access-Control-Request-Method": "GET"}
+
+        with TestClient(app) as client:
+            allowed = client.options("/health", headers={"Origin": "https://shop.example.com", **preflight})
+            refused = client.options("/health", headers={"Origin": "http://localhost:5173", **preflight})
+
+        assert allowed.headers["access-control-allow-origin"] == "https://shop.example.com"
+        assert "access-control-allow-origin" not in refused.headers
+
+    def test_startup_refuses_unmigrated_database(self, tmp_path):
+        """Test that the schema check stops startup when migrations have not run"""
+        app = create_app(AppSettings(static_dir=str(tmp_path), schema_check=True))
+
+        with pytest.raises(SchemaVersionError):
+            with TestClient(app):
+                pass
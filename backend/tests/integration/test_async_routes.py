@@ -0,0 +1,64 @@
+import asyncio
+import httpx
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models import Product, Seller, User
+
+class TestAsyncRoutes:
+    def test_async_and_sync_routes_share_data(self, client: TestClient, test_db: Session):
+        """Test that a user created through an async route can log in and is visible to sync code"""
+        response = client.post("/users/", json={
+            "email": "async.user@example.com",
+            "password": "asyncpassword123",
+            "first_name": "Async",
+            "last_name": "User"
+        })
+        assert response.status_code == 201
+
+        assert test_db.query(User).filter(User.email == "async.user@example.com").count() == 1
+        login = client.post("/auth/login", json={
+            "email": "async.user@example.com",
+            "password": "asyncpassword123"
+        })
+        assert login.status_code == 200
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        assert client.get("/users/me", headers=headers).json()["first_name"] == "Async"
+
+    def test_concurrent_requests_on_one_event_loop(self, app, client: TestClient, test_db: Session, seller: Seller):
+        """Test that many product reads in flight at once on one event loop all succeed"""
+        test_db.add_all([
+            Product(seller_id=seller.seller_id, name=f"Concurrent {i}", price=10 + i, stock_quantity=1)
+            for i in range(5)
+        ])
+        test_db.commit()
+
+        async def fetch_all():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                return await asyncio.gather(*(
+                    async_client.get("/products/", params={"limit": 3}) for _ in range(20)
+                ))
+
+        responses = asyncio.run(fetch_all())
+
+        assert [response.status_code for response in responses] == [200] * 20
+        assert all(len(response.json()) == 3 for response in responses)
+
+    def test_concurrent_product_writes_on_one_event_loop(self, app, client: TestClient, test_db: Session, seller: Seller, seller_headers: dict):
+        """Test that product writes in flight at once on one event loop all succeed"""
+        async def create_all():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                return await asyncio.gather(*(
+                    async_client.post("/products/", json={
+                        "name": f"Concurrent {i}", "price": "10.00", "stock_quantity": 1
+                    }, headers=seller_headers)
+                    for i in range(10)
+                ))
+
+        responses = asyncio.run(create_all())
+
+        assert [response.status_code for response in responses] == [201] * 10
+        assert all(response.json()["images"] == [] for response in responses)
+        assert test_db.query(Product).filter(Product.seller_id == seller.seller_id).count() == 10
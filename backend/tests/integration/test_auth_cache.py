@@ -0,0 +1,85 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+
+from core.cache import get_cache_stats
+from models import Seller
+from services.auth_service.cache import (
+    principal_cache, token_cache, user_key, seller_key, cache_payload
+)
+
+class TestPrincipalCache:
+    def test_repeat_request_skips_queries(self, client: TestClient, seller: Seller, seller_headers: dict, query_counter: list):
+        """Test that a second request with the same token does not query the user"""
+        client.get("/users/me", headers=seller_headers)
+
+        query_counter.clear()
+        response = client.get("/users/me", headers=seller_headers)
+
+        assert response.status_code == 200
+        assert response.json()["email"] == "seller.fixture@example.com"
+        assert query_counter == []
+
+    def test_repeat_seller_request_skips_queries(self, client: TestClient, seller: Seller, seller_headers: dict, query_counter: list):
+        """Test that get_current_seller serves user and seller from the cache"""
+        client.get("/products/seller/my-products", headers=seller_headers)
+
+        query_counter.clear()
+        response = client.get("/products/seller/my-products", headers=seller_headers)
+
+        assert response.status_code == 200
+        # Only the (empty) product page itself
+        assert len(query_counter) == 1
+
+    def test_hit_rates_reported(self, client: TestClient, seller: Seller, seller_headers: dict):
+        """Test that both auth caches report their hit rates"""
+        for _ in range(3):
+            client.get("/users/me", headers=seller_headers)
+
+        stats = get_cache_stats()
+        assert stats["auth_tokens"]["hits"] == 2
+        assert stats["auth_principals"]["hits"] == 2
+        assert stats["auth_principals"]["hit_ratio"] == pytest.approx(2 / 3)
+
+    def test_user_update_invalidates(self, client: TestClient, seller: Seller, seller_headers: dict):
+        """Test that updating a user drops the cached principal"""
+        client.get("/users/me", headers=seller_headers)
+        assert principal_cache.get(user_key(seller.user.email)) is not None
+
+        response = client.put("/users/me", json={"first_name": "Renamed"}, headers=seller_headers)
+
+        assert response.status_code == 200
+        assert principal_cache.get(user_key("seller.fixture@example.com")) is None
+
+    def test_deleted_user_rejected(self, client: TestClient, seller: Seller, seller_headers: dict):
+        """Test that a cached principal does not outlive the user's deletion"""
+        client.get("/users/me", headers=seller_headers)
+
+        assert client.delete("/users/me", headers=seller_headers).status_code == 204
+
+        assert client.get("/users/me", headers=seller_headers).status_code == 401
+
+    def test_deleted_seller_rejected(self, client: TestClient, seller: Seller, seller_headers: dict):
+        """Test that deleting the seller profile invalidates the cached seller"""
+        client.get("/products/seller/my-products", headers=seller_headers)
+        assert principal_cache.get(seller_key(seller.user_id)) is not None
+
+        assert client.delete("/sellers/me", headers=seller_headers).status_code == 204
+
+        assert client.get("/products/seller/my-products", headers=seller_headers).status_code == 403
+
+class TestTokenCache:
+    def test_expired_token_not_cached(self):
+        """Test that a payload is never cached beyond the token's expiry"""
+        cache_payload("expired", {"sub": "a@example.com", "exp": time.time() - 1})
+        cache_payload("valid", {"sub": "a@example.com", "exp": time.time() + 600})
+
+        assert token_cache.get("expired") is None
+        assert token_cache.get("valid") is not None
+
+    def test_invalid_token_rejected(self, client: TestClient):
+        """Test that a malformed token is still rejected"""
+        response = client.get("/users/me", headers={"Authorization": "Bearer not-a-jwt"})
+
+        assert response.status_code == 401
+        assert len(token_cache) == 0
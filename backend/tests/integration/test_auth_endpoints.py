@@ -1,10 +1,15 @@
 # backend/tests/integration/test_auth_endpoints.py
+import threading
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from models import User
-from core.security import get_password_hash
+from jose import jwt
+
+from models import User, Seller
+from core.cache import reset_all_caches
+from core.security import get_password_hash, create_access_token
+from core.password_hasher import password_hasher
 
 class TestAuthEndpoints:
     def test_login_success(self, client: TestClient, test_db: Session):
@@ -92,4 +97,78 @@ class TestAuthEndpoints:
         response = client.get("/users/me", headers=headers)
         
         # Should return 401 Unauthorized
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+class TestTokenClaims:
+    def test_login_token_claims(self, client: TestClient, seller: Seller):
+        """Test that seller tokens carry user_id and seller_id claims"""
+        response = client.post("/auth/login", json={
+            "email": "seller.fixture@example.com",
+            "password": "sellerpassword123"
+        })
+
+        assert response.status_code == 200
+        assert response.json()["is_seller"] is True
+        claims = jwt.get_unverified_claims(response.json()["access_token"])
+        assert claims["user_id"] == seller.user_id
+        assert claims["seller_id"] == seller.seller_id
+        assert claims["roles"] == ["user", "seller"]
+
+    def test_login_queries_roles_once(self, client: TestClient, seller: Seller, query_counter: list):
+        """Test that login looks up the seller profile a single time"""
+        query_counter.clear()
+        client.post("/auth/login", json={
+            "email": "seller.fixture@example.com",
+            "password": "sellerpassword123"
+        })
+
+        # user by email + seller_id by user_id
+        assert len(query_counter) == 2
+
+    def test_seller_resolved_with_one_query(self, client: TestClient, seller: Seller, seller_headers: dict, query_counter: list):
+        """Test that get_current_seller loads only the seller row on a cold cache"""
+        reset_all_caches()
+        query_counter.clear()
+        response = client.get("/products/seller/my-products", headers=seller_headers)
+
+        assert response.status_code == 200
+        # seller by primary key, then the (empty) product page
+        assert len(query_counter) == 2
+        assert "FROM sellers" in query_counter[0]
+        assert not any("FROM users" in statement for statement in query_counter)
+
+    def test_seller_id_of_other_user_rejected(self, client: TestClient, seller: Seller):
+        """Test that a seller_id claim must belong to the token's user"""
+        token = create_access_token({
+            "sub": "someone.else@example.com",
+            "user_id": seller.user_id + 1,
+            "seller_id": seller.seller_id,
+            "roles": ["user", "seller"]
+        })
+
+        response = client.get("/products/seller/my-products", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 403
+
+    def test_token_without_seller_claims(self, client: TestClient, seller: Seller):
+        """Test that tokens issued before the seller_id claim still work"""
+        token = create_access_token({"sub": "seller.fixture@example.com", "roles": ["user", "seller"]})
+
+        response = client.get("/products/seller/my-products", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+
+class TestLoginBackpressure:
+    def test_login_returns_503_when_saturated(self, client: TestClient, seller: Seller, monkeypatch):
+        """Test that login fails fast when the password hashing pool is full"""
+        full = threading.BoundedSemaphore(1)
+        full.acquire()
+        monkeypatch.setattr(password_hasher, "_slots", full)
+
+        response = client.post("/auth/login", json={
+            "email": "seller.fixture@example.com",
+            "password": "sellerpassword123"
+        })
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
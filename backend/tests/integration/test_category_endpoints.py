@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models import Category
+
+class TestCategoryCatalogue:
+    @pytest.fixture
+    def categories(self, test_db: Session):
+        test_db.add_all([Category(name="Tools"), Category(name="Paint")])
+        test_db.commit()
+
+    def test_list_has_etag(self, client: TestClient, categories):
+        """Test that the category list carries a strong ETag"""
+        response = client.get("/categories/")
+
+        assert response.status_code == 200
+        assert [c["name"] for c in response.json()] == ["Tools", "Paint"]
+        assert response.headers["ETag"].startswith('"')
+
+    def test_if_none_match_returns_304_without_queries(self, client: TestClient, categories, query_counter: list):
+        """Test revalidation against a warm catalogue"""
+        etag = client.get("/categories/").headers["ETag"]
+        query_counter.clear()
+
+        response = client.get("/categories/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert query_counter == []
+
+    def test_writes_change_etag(self, client: TestClient, categories, seller_headers: dict):
+        """Test that creating, renaming and deleting categories invalidate the catalogue"""
+        etags = [client.get("/categories/").headers["ETag"]]
+
+        created = client.post("/categories/", json={"name": "Garden"}, headers=seller_headers)
+        assert created.status_code == 201
+        listing = client.get("/categories/", headers={"If-None-Match": etags[-1]})
+        assert listing.status_code == 200
+        assert "Garden" in [c["name"] for c in listing.json()]
+        etags.append(listing.headers["ETag"])
+
+        category_id = created.json()["category_id"]
+        client.put(f"/categories/{category_id}", json={"name": "Outdoor"}, headers=seller_headers)
+        listing = client.get("/categories/", headers={"If-None-Match": etags[-1]})
+        assert listing.status_code == 200
+        assert "Outdoor" in [c["name"] for c in listing.json()]
+        etags.append(listing.headers["ETag"])
+
+        client.delete(f"/categories/{category_id}", headers=seller_headers)
+        listing = client.get("/categories/", headers={"If-None-Match": etags[-1]})
+        assert listing.status_code == 200
+        assert listing.headers["ETag"] == etags[0]
+
+    def test_pages_have_distinct_etags(self, client: TestClient, categories):
+        """Test that skip/limit slices are validated independently"""
+        first = client.get("/categories/", params={"limit": 1})
+        second = client.get("/categories/", params={"skip": 1, "limit": 1})
+
+        assert [c["name"] for c in first.json()] == ["Tools"]
+        assert [c["name"] for c in second.json()] == ["Paint"]
+        assert first.headers["ETag"] != second.headers["ETag"]
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from core.metrics import request_metrics
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    request_metrics.reset()
+    yield
+
+def samples(text: str) -> dict:
+    """Parse the exposition format into {series: value}"""
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            result[series] = float(value)
+    return result
+
+class TestMetricsEndpoint:
+    def test_route_counters_use_templates(self, client: TestClient):
+        """Test that requests are counted per route template, method and status"""
+        client.get("/products/")
+        client.get("/products/")
+        client.get("/products/12345")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        values = samples(response.text)
+        assert values['http_requests_total{route="/products/",method="GET",status="200"}'] == 2
+        assert values['http_requests_total{route="/products/{product_id}",method="GET",status="404"}'] == 1
+        assert values['http_request_duration_seconds_count{route="/products/",method="GET",status="200"}'] == 2
+        # The /metrics request itself is still in flight while it renders
+        assert values["http_requests_in_flight"] == 1
+
+    def test_unmatched_paths_share_one_series(self, client: TestClient):
+        """Test that unknown paths do not create a series each"""
+        client.get("/no-such-page")
+        client.get("/another-missing-page")
+
+        values = samples(client.get("/metrics").text)
+
+        assert values['http_requests_total{route="unmatched",method="GET",status="404"}'] == 2
+
+    def test_pool_cache_and_hasher_metrics(self, client: TestClient, seller_headers: dict):
+        """Test that pool gauges, cache ratios and hasher counters are exported"""
+        before = samples(client.get("/metrics").text)
+        client.post("/auth/token", data={"username": "seller.fixture@example.com", "password": "wrongpassword"})
+        client.get("/users/me", headers=seller_headers)
+        client.get("/users/me", headers=seller_headers)
+
+        values = samples(client.get("/metrics").text)
+
+        # The test profile uses in-memory SQLite, whose StaticPool has no size gauges
+        assert 'db_pool_checkouts_total{engine="primary"}' in values
+        assert 'db_pool_checkouts_total{engine="primary_async"}' in values
+        assert values['cache_hit_ratio{cache="auth_principals"}'] == 0.5
+        # The hasher and SQL counters are process-wide, so compare deltas
+        assert values["password_hash_submitted_total"] - before["password_hash_submitted_total"] == 1
+        wait_count = 'password_hash_queue_wait_seconds_bucket{le="+Inf"}'
+        assert values[wait_count] - before[wait_count] == 1
+        assert values["sql_requests_total"] - before["sql_requests_total"] == 4
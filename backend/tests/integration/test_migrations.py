@@ -0,0 +1,123 @@
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import NullPool
+
+from core.schema_version import SchemaVersionError, alembic_config, check_schema_version, head_revisions
+from models import Base
+from tests.integration import baseline_models
+
+@pytest.fixture
+def migration_db(tmp_path):
+    """Empty SQLite file and an Alembic config pointing at it"""
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    config = alembic_config()
+    config.set_main_option("sqlalchemy.url", url)
+    # Leave the test run's logging alone
+    config.attributes["configure_logger"] = False
+    engine = create_engine(url, poolclass=NullPool)
+    yield config, engine
+    engine.dispose()
+
+class TestMigrations:
+    def test_head_matches_models(self, migration_db):
+        """Test that migrating an empty database yields exactly the models' schema"""
+        config, engine = migration_db
+
+        command.upgrade(config, "head")
+
+        with engine.connect() as conn:
+            diff = compare_metadata(MigrationContext.configure(conn, opts={"compare_type": True}), Base.metadata)
+        assert diff == []
+
+    def test_baseline_matches_pre_migration_models(self, migration_db):
+        """Test that revision 0001 is exactly the schema the old create_all() built"""
+        config, engine = migration_db
+
+        command.upgrade(config, "0001")
+
+        with engine.connect() as conn:
+            diff = compare_metadata(
+                MigrationContext.configure(conn, opts={"compare_type": True}), baseline_models.Base.metadata
+            )
+        assert diff == []
+
+    def test_downgrade_to_base(self, migration_db):
+        """Test that every migration can be reverted"""
+        config, engine = migration_db
+        command.upgrade(config, "head")
+
+        command.downgrade(config, "base")
+
+        assert inspect(engine).get_table_names() == ["alembic_version"]
+
+    def test_backfills_product_cards(self, migration_db):
+        """Test that products without a listing card get one when migrating"""
+        config, engine = migration_db
+        command.upgrade(config, "0003")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO users (user_id, email, password_hash, first_name, last_name) "
+                "VALUES (1, 'a@example.com', 'x', 'A', 'B')"
+            ))
+            conn.execute(text("INSERT INTO sellers (seller_id, user_id, id_type, number_id) VALUES (1, 1, 'CC', '1')"))
+            conn.execute(text(
+                "INSERT INTO products (product_id, seller_id, name, price, stock_quantity) "
+                "VALUES (1, 1, 'Lamp', 10, 3)"
+            ))
+
+        command.upgrade(config, "head")
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT name, in_stock FROM product_cards")).all() == [("Lamp", 1)]
+
+    def test_upgrades_pre_migration_database(self, migration_db):
+        """Test that a database built by the old create_all(), once stamped, upgrades to the models' schema"""
+        config, engine = migration_db
+        baseline_models.Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO users (user_id, email, password_hash, first_name, last_name) "
+                "VALUES (1, 'a@example.com', 'x', 'A', 'B')"
+            ))
+            conn.execute(text("INSERT INTO sellers (seller_id, user_id, id_type, number_id) VALUES (1, 1, 'CC', '1')"))
+            conn.execute(text(
+                "INSERT INTO products (product_id, seller_id, name, price, stock_quantity) "
+                "VALUES (1, 1, 'Lamp', 10, 0)"
+            ))
+
+        command.stamp(config, "0001")
+        command.upgrade(config, "head")
+
+        with engine.connect() as conn:
+            diff = compare_metadata(MigrationContext.configure(conn, opts={"compare_type": True}), Base.metadata)
+            cards = conn.execute(text("SELECT name, in_stock FROM product_cards")).all()
+        assert diff == []
+        assert cards == [("Lamp", 0)]
+        check_schema_version(engine)
+
+class TestSchemaVersionCheck:
+    def test_passes_at_head(self, migration_db):
+        """Test that a fully migrated database passes"""
+        config, engine = migration_db
+        command.upgrade(config, "head")
+
+        check_schema_version(engine)
+
+    def test_fails_without_migrations(self, migration_db):
+        """Test that a database that was never migrated is refused"""
+        _, engine = migration_db
+
+        with pytest.raises(SchemaVersionError, match="no revision"):
+            check_schema_version(engine)
+
+    def test_fails_when_behind(self, migration_db):
+        """Test that a database missing the latest migrations is refused"""
+        config, engine = migration_db
+        command.upgrade(config, "0001")
+
+        with pytest.raises(SchemaVersionError, match="alembic upgrade head"):
+            check_schema_version(engine)
+        assert head_revisions() != {"0001"}
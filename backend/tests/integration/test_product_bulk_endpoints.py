@@ -0,0 +1,214 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models import Product, Category, Seller
+
+class TestProductImport:
+    @pytest.fixture
+    def categories(self, test_db: Session):
+        tools, paint = Category(name="Tools"), Category(name="Paint")
+        test_db.add_all([tools, paint])
+        test_db.commit()
+        return {"Tools": tools.category_id, "Paint": paint.category_id}
+
+    def test_import_csv(self, client: TestClient, test_db: Session, categories: dict, seller_headers: dict):
+        """Test importing a CSV file with category names, ids and images"""
+        content = (
+            "name,description,price,stock_quantity,categories,images\n"
+            "Hammer,Steel hammer,19.90,5,tools,/img/hammer.jpg|/img/hammer2.jpg\n"
+            f"Brush,,4.50,,Paint|{categories['Tools']},\n"
+        )
+
+        response = client.post(
+            "/products/import",
+            files={"file": ("catalog.csv", content, "text/csv")},
+            headers=seller_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"created": 2, "failed": 0, "errors": []}
+
+        hammer = test_db.query(Product).filter(Product.name == "Hammer").one()
+        assert [c.name for c in hammer.categories] == ["Tools"]
+        assert [(i.image_url, i.is_primary) for i in hammer.images] == [
+            ("/img/hammer.jpg", True), ("/img/hammer2.jpg", False)
+        ]
+        brush = test_db.query(Product).filter(Product.name == "Brush").one()
+        assert brush.stock_quantity == 0
+        assert sorted(c.name for c in brush.categories) == ["Paint", "Tools"]
+
+    def test_import_reports_row_errors(self, client: TestClient, test_db: Session, categories: dict, seller_headers: dict):
+        """Test that invalid rows are reported without blocking valid ones"""
+        lines = [
+            json.dumps({"name": "Saw", "price": "30.00", "categories": ["Tools"]}),
+            "{not json",
+            json.dumps({"name": "Ladder", "price": "-1"}),
+            "",
+            json.dumps({"name": "Glue", "price": "3.00", "categories": ["Adhesives"]}),
+        ]
+
+        response = client.post(
+            "/products/import",
+            params={"format": "ndjson"},
+            files={"file": ("catalog.txt", "\n".join(lines), "text/plain")},
+            headers=seller_headers
+        )
+
+        data = response.json()
+        assert data["created"] == 1
+        assert data["failed"] == 3
+        assert [error["row"] for error in data["errors"]] == [2, 3, 4]
+        assert "price" in data["errors"][1]["errors"][0]
+        assert "Adhesives" in data["errors"][2]["errors"][0]
+        assert [p.name for p in test_db.query(Product)] == ["Saw"]
+
+    def test_import_in_chunks(self, client: TestClient, test_db: Session, seller: Seller, seller_headers: dict,
+                              monkeypatch: pytest.MonkeyPatch):
+        """Test that large files are inserted chunk by chunk"""
+        monkeypatch.setattr("services.product_service.bulk_service.IMPORT_CHUNK_SIZE", 3)
+        content = "\n".join(
+            json.dumps({"name": f"Item {i}", "price": "1.00", "stock_quantity": i}) for i in range(10)
+        )
+
+        response = client.post(
+            "/products/import",
+            files={"file": ("catalog.ndjson", content, "application/x-ndjson")},
+            headers=seller_headers
+        )
+
+        assert response.json()["created"] == 10
+        products = test_db.query(Product).order_by(Product.product_id).all()
+        assert [p.name for p in products] == [f"Item {i}" for i in range(10)]
+        assert all(p.seller_id == seller.seller_id for p in products)
+
+    def test_import_requires_known_format(self, client: TestClient, seller_headers: dict):
+        """Test that an undetectable format is rejected"""
+        response = client.post(
+            "/products/import",
+            files={"file": ("catalog.txt", "name\nHammer\n", "text/plain")},
+            headers=seller_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_import_requires_seller(self, client: TestClient):
+        """Test that importing requires authentication"""
+        response = client.post("/products/import", files={"file": ("catalog.csv", "", "text/csv")})
+
+        assert response.status_code == 401
+
+class TestProductBulkUpdate:
+    @pytest.fixture
+    def products(self, test_db: Session, seller: Seller):
+        products = [
+            Product(seller_id=seller.seller_id, name=f"Item {i}", price=10, stock_quantity=1)
+            for i in range(3)
+        ]
+        test_db.add_all(products)
+        test_db.commit()
+        return [p.product_id for p in products]
+
+    @pytest.fixture
+    def foreign_product_id(self, test_db: Session, seller: Seller):
+        other = Seller(user_id=seller.user_id + 100, business_name="Other", id_type="NIT", number_id="1")
+        test_db.add(other)
+        test_db.flush()
+        product = Product(seller_id=other.seller_id, name="Not mine", price=5, stock_quantity=5)
+        test_db.add(product)
+        test_db.commit()
+        return product.product_id
+
+    def test_bulk_update(self, client: TestClient, test_db: Session, products: list, seller_headers: dict,
+                         query_counter: list):
+        """Test updating price and stock of several products at once"""
+        response = client.patch("/products/bulk", json={"items": [
+            {"product_id": products[0], "price": "12.50"},
+            {"product_id": products[1], "stock_quantity": 40},
+            {"product_id": products[2], "price": "7.00", "stock_quantity": 0},
+        ]}, headers=seller_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"updated": 3, "rejected": []}
+        updates = [q for q in query_counter if q.startswith("UPDATE products")]
+        assert len(updates) == 1
+        # The count comes from the rows the UPDATE changed, not a prior SELECT
+        assert "RETURNING product_id" in updates[0]
+
+        test_db.expire_all()
+        rows = {p.product_id: (str(p.price), p.stock_quantity) for p in test_db.query(Product)}
+        assert rows[products[0]] == ("12.50", 1)
+        assert rows[products[1]] == ("10.00", 40)
+        assert rows[products[2]] == ("7.00", 0)
+
+    def test_bulk_update_rejects_foreign_and_missing(self, client: TestClient, test_db: Session, products: list,
+                                                     foreign_product_id: int, seller_headers: dict):
+        """Test that products the seller does not own are rejected untouched"""
+        response = client.patch("/products/bulk", json={"items": [
+            {"product_id": products[0], "price": "1.00"},
+            {"product_id": foreign_product_id, "price": "1.00"},
+            {"product_id": 9999, "stock_quantity": 1},
+            {"product_id": products[1]},
+        ]}, headers=seller_headers)
+
+        assert response.json() == {"updated": 1, "rejected": [foreign_product_id, 9999, products[1]]}
+        test_db.expire_all()
+        assert str(test_db.get(Product, foreign_product_id).price) == "5.00"
+
+    def test_bulk_update_evicts_cache(self, client: TestClient, products: list, seller_headers: dict):
+        """Test that updated products are not served stale from the cache"""
+        client.get(f"/products/{products[0]}")
+
+        client.patch("/products/bulk", json={"items": [
+            {"product_id": products[0], "stock_quantity": 99}
+        ]}, headers=seller_headers)
+
+        assert client.get(f"/products/{products[0]}").json()["stock_quantity"] == 99
+
+class TestProductExport:
+    @pytest.fixture
+    def products(self, test_db: Session, seller: Seller):
+        tools = Category(name="Tools")
+        products = [
+            Product(seller_id=seller.seller_id, name=f"Item {i}", price=10 + i, stock_quantity=i,
+                    categories=[tools] if i % 2 else [])
+            for i in range(7)
+        ]
+        test_db.add_all(products)
+        test_db.commit()
+        return sorted(p.product_id for p in products)
+
+    def test_export_ndjson(self, client: TestClient, products: list, seller_headers: dict,
+                           monkeypatch: pytest.MonkeyPatch):
+        """Test streaming the catalogue as NDJSON across several batches"""
+        monkeypatch.setattr("services.product_service.bulk_service.EXPORT_BATCH_SIZE", 3)
+
+        response = client.get("/products/seller/export", headers=seller_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["product_id"] for row in rows] == products
+        item = next(row for row in rows if row["name"] == "Item 1")
+        assert item["categories"] == ["Tools"]
+        assert item["price"] == "11.00"
+
+    def test_export_csv_round_trips_through_import(self, client: TestClient, test_db: Session, products: list,
+                                                   seller_headers: dict):
+        """Test that an exported CSV file can be imported again"""
+        exported = client.get("/products/seller/export", params={"format": "csv"}, headers=seller_headers)
+        assert exported.text.splitlines()[0].startswith("product_id,name,description,price")
+
+        response = client.post(
+            "/products/import",
+            files={"file": ("products.csv", exported.content, "text/csv")},
+            headers=seller_headers
+        )
+
+        assert response.json()["created"] == len(products)
+        assert test_db.query(Product).count() == 2 * len(products)
+
+    def test_export_requires_seller(self, client: TestClient):
+        """Test that exporting requires authentication"""
+        assert client.get("/products/seller/export").status_code == 401
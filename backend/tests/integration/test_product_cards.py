@@ -0,0 +1,157 @@
+import pytest
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models import Product, ProductCard, ProductImage, Category, Seller
+from services.product_service.card_service import ProductCardService
+
+def card_of(db: Session, product_id: int) -> ProductCard:
+    db.expire_all()
+    return db.get(ProductCard, product_id)
+
+class TestProductCardSync:
+    @pytest.fixture
+    def category(self, test_db: Session):
+        category = Category(name="Tools")
+        test_db.add(category)
+        test_db.commit()
+        return category
+
+    @pytest.fixture
+    def product_id(self, client: TestClient, category: Category, seller_headers: dict):
+        response = client.post("/products/", json={
+            "name": "Hammer",
+            "price": "19.90",
+            "stock_quantity": 3,
+            "category_ids": [category.category_id],
+            "images": [
+                {"image_url": "/img/side.jpg", "display_order": 1},
+                {"image_url": "/img/front.jpg", "is_primary": True, "display_order": 2}
+            ]
+        }, headers=seller_headers)
+        assert response.status_code == 201
+        return response.json()["product_id"]
+
+    def test_card_created_with_product(self, test_db: Session, product_id: int):
+        """Test that creating a product writes its card"""
+        card = card_of(test_db, product_id)
+
+        assert card.name == "Hammer"
+        assert card.price == Decimal("19.90")
+        assert card.in_stock is True
+        assert card.primary_image_url == "/img/front.jpg"
+        assert card.category_names == ["Tools"]
+
+    def test_card_follows_product_update(self, client: TestClient, test_db: Session, product_id: int, seller_headers: dict):
+        """Test that price, stock and category changes reach the card"""
+        response = client.put(f"/products/{product_id}", json={
+            "price": "25.00", "stock_quantity": 0, "category_ids": []
+        }, headers=seller_headers)
+        assert response.status_code == 200
+
+        card = card_of(test_db, product_id)
+        assert card.price == Decimal("25.00")
+        assert card.in_stock is False
+        assert card.category_names == []
+
+    def test_card_follows_images(self, client: TestClient, test_db: Session, product_id: int, seller_headers: dict):
+        """Test that adding and deleting images updates the primary image"""
+        image_id = test_db.query(ProductImage.image_id).filter(
+            ProductImage.image_url == "/img/front.jpg"
+        ).scalar()
+        client.delete(f"/products/{product_id}/images/{image_id}", headers=seller_headers)
+        assert card_of(test_db, product_id).primary_image_url == "/img/side.jpg"
+
+        client.post(f"/products/{product_id}/images", json={
+            "image_url": "/img/new.jpg", "is_primary": True
+        }, headers=seller_headers)
+        assert card_of(test_db, product_id).primary_image_url == "/img/new.jpg"
+
+    def test_card_follows_category_rename(self, client: TestClient, test_db: Session, category: Category, product_id: int, seller_headers: dict):
+        """Test that renaming a category rewrites the cards that show it"""
+        client.put(f"/categories/{category.category_id}", json={"name": "Hand tools"}, headers=seller_headers)
+
+        assert card_of(test_db, product_id).category_names == ["Hand tools"]
+
+    def test_card_deleted_with_product(self, client: TestClient, test_db: Session, product_id: int, seller_headers: dict):
+        """Test that deleting a product removes its card"""
+        client.delete(f"/products/{product_id}", headers=seller_headers)
+
+        assert card_of(test_db, product_id) is None
+
+    def test_bulk_writes_update_cards(self, client: TestClient, test_db: Session, category: Category, seller_headers: dict):
+        """Test that bulk import and bulk update keep cards in sync"""
+        content = "name,price,stock_quantity,categories,images\nSaw,30.00,0,Tools,/img/saw.jpg\n"
+        client.post("/products/import", files={"file": ("catalog.csv", content, "text/csv")}, headers=seller_headers)
+        saw = test_db.query(Product).filter(Product.name == "Saw").one()
+
+        card = card_of(test_db, saw.product_id)
+        assert (card.in_stock, card.primary_image_url, card.category_names) == (False, "/img/saw.jpg", ["Tools"])
+
+        client.patch("/products/bulk", json={"items": [
+            {"product_id": saw.product_id, "price": "27.50", "stock_quantity": 4}
+        ]}, headers=seller_headers)
+
+        card = card_of(test_db, saw.product_id)
+        assert (card.price, card.in_stock) == (Decimal("27.50"), True)
+
+class TestProductCardListing:
+    @pytest.fixture
+    def catalog(self, test_db: Session, seller: Seller):
+        category = Category(name="Hardware")
+        products = [
+            Product(
+                seller_id=seller.seller_id,
+                name=f"Product {i}",
+                price=Decimal("10.00") + i,
+                stock_quantity=i,
+                categories=[category],
+                images=[ProductImage(image_url=f"/images/{i}.jpg", is_primary=True)]
+            )
+            for i in range(5)
+        ]
+        test_db.add_all(products)
+        test_db.commit()
+        ProductCardService.refresh(test_db, [product.product_id for product in products])
+        test_db.commit()
+        return sorted(products, key=lambda p: p.product_id)
+
+    def test_card_view(self, client: TestClient, catalog):
+        """Test the compact representation returned by view=card"""
+        response = client.get("/products/", params={"view": "card", "limit": 1})
+
+        assert response.status_code == 200
+        assert response.json() == [{
+            "product_id": catalog[0].product_id,
+            "name": "Product 0",
+            "price": "10.00",
+            "in_stock": False,
+            "primary_image_url": "/images/0.jpg",
+            "category_names": ["Hardware"],
+            "updated_at": catalog[0].updated_at.isoformat()
+        }]
+
+    def test_card_view_single_query(self, client: TestClient, catalog, query_counter: list):
+        """Test that a page of cards costs one query"""
+        query_counter.clear()
+        response = client.get("/products/", params={"view": "card"})
+
+        assert len(response.json()) == 5
+        assert len(query_counter) == 1
+
+    def test_card_view_filters_and_cursor(self, client: TestClient, catalog):
+        """Test that cards take the listing filters, sorts and cursors"""
+        params = {"view": "card", "sort": "price", "in_stock": "true", "limit": 2}
+        first = client.get("/products/", params=params)
+        second = client.get("/products/", params={**params, "cursor": first.headers["X-Next-Cursor"]})
+
+        ids = [card["product_id"] for card in first.json() + second.json()]
+        assert ids == [p.product_id for p in catalog[1:]]
+
+    def test_my_products_card_view(self, client: TestClient, catalog, seller_headers: dict):
+        """Test view=card on the seller's own product list"""
+        response = client.get("/products/seller/my-products", params={"view": "card"}, headers=seller_headers)
+
+        assert response.status_code == 200
+        assert [card["name"] for card in response.json()] == [p.name for p in catalog]
@@ -0,0 +1,506 @@
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from models import Product, Category, ProductImage, Seller
+from services.product_service.cache import product_cache
+from services.product_service.search import product_search_index
+from services.product_service.service import ProductService
+
+def create_products(db: Session, seller: Seller, count: int, category: Category = None):
+    """Insert `count` products for the seller and return them in id order"""
+    products = []
+    for i in range(count):
+        product = Product(
+            seller_id=seller.seller_id,
+            name=f"Product {i}",
+            description=f"Description {i}",
+            price=Decimal("10.00") + i,
+            stock_quantity=i
+        )
+        if category is not None:
+            product.categories = [category]
+        product.images = [ProductImage(image_url=f"/images/{i}.jpg", is_primary=True)]
+        db.add(product)
+        products.append(product)
+    db.commit()
+    return products
+
+class TestProductPagination:
+    def test_cursor_walks_all_pages(self, client: TestClient, test_db: Session, seller: Seller):
+        """Test that following X-Next-Cursor visits every product exactly once"""
+        create_products(test_db, seller, 7)
+
+        seen = []
+        response = client.get("/products/", params={"limit": 3})
+        while True:
+            assert response.status_code == 200
+            seen.extend(p["product_id"] for p in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            response = client.get("/products/", params={"limit": 3, "cursor": cursor})
+
+        assert seen == sorted(seen)
+        assert len(seen) == 7
+
+    def test_cursor_respects_category_filter(self, client: TestClient, test_db: Session, seller: Seller):
+        """Test that cursor pagination keeps the category filter"""
+        category = Category(name="Tools")
+        test_db.add(category)
+        test_db.commit()
+        create_products(test_db, seller, 3)
+        tagged = create_products(test_db, seller, 4, category=category)
+
+        first = client.get("/products/", params={"limit": 2, "category_id": category.category_id})
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get("/products/", params={
+            "limit": 2, "category_id": category.category_id, "cursor": cursor
+        })
+
+        ids = [p["product_id"] for p in first.json() + second.json()]
+        assert ids == [p.product_id for p in tagged]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_skip_limit_still_supported(self, client: TestClient, test_db: Session, seller: Seller):
+        """Test the legacy offset parameters"""
+        products = create_products(test_db, seller, 5)
+
+        response = client.get("/products/", params={"skip": 3, "limit": 10})
+
+        assert response.status_code == 200
+        assert [p["product_id"] for p in response.json()] == [p.product_id for p in products[3:]]
+
+    def test_invalid_cursor(self, client: TestClient):
+        """Test that a malformed cursor is rejected"""
+        response = client.get("/products/", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    def test_my_products_cursor(self, client: TestClient, test_db: Session, seller: Seller, seller_headers: dict):
+        """Test cursor pagination on the seller's own product list"""
+        create_products(test_db, seller, 4)
+
+        first = client.get("/products/seller/my-products", params={"limit": 3}, headers=seller_headers)
+        assert first.status_code == 200
+        second = client.get("/products/seller/my-products", params={
+            "limit": 3, "cursor": first.headers["X-Next-Cursor"]
+        }, headers=seller_headers)
+
+        assert len(first.json()) == 3
+        assert len(second.json()) == 1
+
+class TestProductListingFilters:
+    def walk(self, client: TestClient, params: dict, limit: int = 2) -> list:
+        """Follow X-Next-Cursor through every page and return all products"""
+        products = []
+        response = client.get("/products/", params={**params, "limit": limit})
+        while True:
+            assert response.status_code == 200
+            products.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return products
+            response = client.get("/products/", params={**params, "limit": limit, "cursor": cursor})
+
+    @pytest.fixture
+    def catalog(self, test_db: Session, seller: Seller):
+        products = create_products(test_db, seller, 6)
+        # Duplicate prices and names so ties have to be broken by product_id
+        for product, price, name in zip(
+            products,
+            ["30.00", "10.00", "20.00", "10.00", "30.00", "20.00"],
+            ["Cable", "Adapter", "Battery", "Adapter", "Drill", "Cable"]
+        ):
+            product.price = Decimal(price)
+            product.name = name
+        test_db.commit()
+        return products
+
+    def test_sort_by_price(self, client: TestClient, catalog):
+        """Test that sort=price pages through products cheapest first"""
+        products = self.walk(client, {"sort": "price"})
+
+        expected = sorted(catalog, key=lambda p: (p.price, p.product_id))
+        assert [p["product_id"] for p in products] == [p.product_id for p in expected]
+
+    def test_sort_by_name(self, client: TestClient, catalog):
+        """Test that sort=name pages through products alphabetically"""
+        products = self.walk(client, {"sort": "name"})
+
+        expected = sorted(catalog, key=lambda p: (p.name, p.product_id))
+        assert [p["product_id"] for p in products] == [p.product_id for p in expected]
+
+    def test_sort_newest(self, client: TestClient, catalog):
+        """Test that sort=newest lists the most recently created products first"""
+        products = self.walk(client, {"sort": "newest"})
+
+        assert [p["product_id"] for p in products] == [p.product_id for p in reversed(catalog)]
+
+    def test_price_range_and_stock(self, client: TestClient, catalog):
+        """Test the price range and in_stock filters together with a sort"""
+        products = self.walk(client, {
+            "min_price": "15", "max_price": "30", "in_stock": "true", "sort": "price"
+        }, limit=1)
+
+        # catalog[0] has a matching price but no stock
+        expected = sorted(
+            (p for p in catalog[1:] if Decimal("15") <= p.price <= Decimal("30")),
+            key=lambda p: (p.price, p.product_id)
+        )
+        assert [p["product_id"] for p in products] == [p.product_id for p in expected]
+
+    def test_out_of_stock(self, client: TestClient, catalog):
+        """Test in_stock=false"""
+        response = client.get("/products/", params={"in_stock": "false"})
+
+        assert [p["product_id"] for p in response.json()] == [catalog[0].product_id]
+
+    def test_invalid_sort(self, client: TestClient):
+        """Test that an unknown sort is rejected"""
+        response = client.get("/products/", params={"sort": "popularity"})
+
+        assert response.status_code == 422
+
+    def test_cursor_bound_to_sort(self, client: TestClient, catalog):
+        """Test that a cursor issued for one sort is rejected by another"""
+        first = client.get("/products/", params={"sort": "price", "limit": 2})
+        cursor = first.headers["X-Next-Cursor"]
+
+        assert client.get("/products/", params={"sort": "name", "cursor": cursor}).status_code == 400
+        assert client.get("/products/", params={"cursor": cursor}).status_code == 400
+
+    def test_my_products_sorted(self, client: TestClient, catalog, seller_headers: dict):
+        """Test sorting on the seller's own product list"""
+        response = client.get(
+            "/products/seller/my-products",
+            params={"sort": "price", "max_price": "10"},
+            headers=seller_headers
+        )
+
+        assert [p["product_id"] for p in response.json()] == [catalog[1].product_id, catalog[3].product_id]
+
+class TestProductQueryCounts:
+    @pytest.fixture
+    def catalog(self, test_db: Session, seller: Seller):
+        category = Category(name="Hardware")
+        test_db.add(category)
+        test_db.commit()
+        return create_products(test_db, seller, 20, category=category)
+
+    def test_list_products_query_count(self, client: TestClient, catalog, query_counter: list):
+        """Test that listing products does not lazy-load per product"""
+        query_counter.clear()
+        response = client.get("/products/")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 20
+        assert all(p["categories"] and p["images"] for p in response.json())
+        # products + categories + images
+        assert len(query_counter) == 3
+
+    def test_product_detail_query_count(self, client: TestClient, catalog, query_counter: list):
+        """Test that a product detail loads its relationships in batched queries"""
+        product_id = catalog[0].product_id
+        query_counter.clear()
+        response = client.get(f"/products/{product_id}")
+
+        assert response.status_code == 200
+        assert len(query_counter) == 3
+
+    def test_my_products_query_count(self, client: TestClient, catalog, seller_headers: dict, query_counter: list):
+        """Test that the seller product list costs a fixed number of queries"""
+        query_counter.clear()
+        response = client.get("/products/seller/my-products", headers=seller_headers)
+
+        assert response.status_code == 200
+        assert len(response.json()) == 20
+        # seller lookup by the token's seller_id, then products + categories + images
+        assert len(query_counter) == 4
+
+class TestProductSearch:
+    @pytest.fixture
+    def catalog(self, test_db: Session, seller: Seller):
+        tools = Category(name="Tools")
+        test_db.add(tools)
+        test_db.commit()
+        specs = [
+            ("Cordless drill", "Compact drill with two batteries", "120.00", [tools]),
+            ("Drill bit set", "Twenty titanium bits", "25.00", [tools]),
+            ("Work gloves", "Leather gloves, good for drill work", "15.00", []),
+            ("Paint roller", "Nine inch roller", "8.00", []),
+        ]
+        products = {}
+        for name, description, price, categories in specs:
+            product = Product(
+                seller_id=seller.seller_id,
+                name=name,
+                description=description,
+                price=Decimal(price),
+                stock_quantity=5,
+                categories=categories
+            )
+            test_db.add(product)
+            products[name] = product
+        test_db.commit()
+        return {name: product.product_id for name, product in products.items()}
+
+    def test_search_ranks_name_matches_first(self, client: TestClient, catalog: dict):
+        """Test that name matches outrank description-only matches"""
+        response = client.get("/products/search", params={"q": "drill"})
+
+        assert response.status_code == 200
+        ids = [p["product_id"] for p in response.json()]
+        assert set(ids) == {catalog["Cordless drill"], catalog["Drill bit set"], catalog["Work gloves"]}
+        assert ids[-1] == catalog["Work gloves"]
+
+    def test_search_index_rebuilt_after_ttl(self, client: TestClient, test_db: Session, seller: Seller, catalog: dict, monkeypatch: pytest.MonkeyPatch):
+        """Test that products written by another worker are found once the index expires"""
+        now = [1000.0]
+        monkeypatch.setattr("services.product_service.search.time.monotonic", lambda: now[0])
+        assert len(client.get("/products/search", params={"q": "drill"}).json()) == 3
+
+        # Written straight to the database, as another worker would
+        test_db.add(Product(seller_id=seller.seller_id, name="Hammer drill", price=Decimal("90.00"), stock_quantity=1))
+        test_db.commit()
+        assert len(client.get("/products/search", params={"q": "drill"}).json()) == 3
+
+        now[0] += product_search_index.ttl_seconds
+        assert len(client.get("/products/search", params={"q": "drill"}).json()) == 4
+
+    def test_search_requires_all_terms(self, client: TestClient, catalog: dict):
+        """Test that every query term must match"""
+        response = client.get("/products/search", params={"q": "drill batteries"})
+
+        assert [p["product_id"] for p in response.json()] == [catalog["Cordless drill"]]
+
+    def test_search_with_filters(self, client: TestClient, test_db: Session, catalog: dict):
+        """Test search combined with category and price filters"""
+        tools = test_db.query(Category).filter(Category.name == "Tools").first()
+
+        by_category = client.get("/products/search", params={"q": "drill", "category_id": tools.category_id})
+        by_price = client.get("/products/search", params={"q": "drill", "max_price": "30"})
+
+        assert {p["product_id"] for p in by_category.json()} == {
+            catalog["Cordless drill"], catalog["Drill bit set"]
+        }
+        assert {p["product_id"] for p in by_price.json()} == {
+            catalog["Drill bit set"], catalog["Work gloves"]
+        }
+
+    def test_search_cursor_pagination(self, client: TestClient, catalog: dict):
+        """Test paging through search results with the cursor"""
+        first = client.get("/products/search", params={"q": "drill", "limit": 2})
+        second = client.get("/products/search", params={
+            "q": "drill", "limit": 2, "cursor": first.headers["X-Next-Cursor"]
+        })
+        everything = client.get("/products/search", params={"q": "drill"})
+
+        paged = [p["product_id"] for p in first.json() + second.json()]
+        assert paged == [p["product_id"] for p in everything.json()]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_search_cursor_with_tied_ranks(self, client: TestClient, test_db: Session, seller: Seller):
+        """Test that products with equal rank are each served exactly once across pages"""
+        for i in range(5):
+            test_db.add(Product(seller_id=seller.seller_id, name="Desk lamp", price=10 + i, stock_quantity=1))
+        test_db.commit()
+
+        seen = []
+        params = {"q": "lamp", "limit": 2}
+        for _ in range(5):
+            response = client.get("/products/search", params=params)
+            seen += [p["product_id"] for p in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        assert "X-Next-Cursor" not in response.headers
+        assert len(seen) == 5
+        assert seen == sorted(set(seen))
+
+    def test_postgres_rank_compared_as_double(self, test_db: Session):
+        """Test that the Postgres search casts ts_rank (real) to the cursor's double precision"""
+        query = ProductService._search_postgres_query(test_db, "lamp", (0.0607927, 3), {})
+
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+        # Selected, compared twice in the cursor predicate, and ordered by
+        assert sql.count("CAST(ts_rank(") == 4
+        assert sql.count("ts_rank(") == 4
+
+    def test_search_sees_new_products(self, client: TestClient, catalog: dict, seller_headers: dict):
+        """Test that products created after the index is built are searchable"""
+        assert client.get("/products/search", params={"q": "hammer"}).json() == []
+
+        response = client.post("/products/", json={
+            "name": "Claw hammer",
+            "price": "19.90",
+            "stock_quantity": 3
+        }, headers=seller_headers)
+        assert response.status_code == 201
+
+        results = client.get("/products/search", params={"q": "hammer"}).json()
+        assert [p["product_id"] for p in results] == [response.json()["product_id"]]
+
+class TestProductDetailCache:
+    @pytest.fixture
+    def product_id(self, test_db: Session, seller: Seller):
+        return create_products(test_db, seller, 1)[0].product_id
+
+    def test_repeat_reads_skip_database(self, client: TestClient, product_id: int, query_counter: list):
+        """Test that a cached product is served without queries"""
+        first = client.get(f"/products/{product_id}")
+        query_counter.clear()
+        second = client.get(f"/products/{product_id}")
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert query_counter == []
+        assert product_cache.stats()["hits"] == 1
+
+    def test_update_evicts_product(self, client: TestClient, product_id: int, seller_headers: dict):
+        """Test that updating a product is visible on the next read"""
+        client.get(f"/products/{product_id}")
+
+        response = client.put(f"/products/{product_id}", json={"name": "Renamed"}, headers=seller_headers)
+        assert response.status_code == 200
+
+        assert client.get(f"/products/{product_id}").json()["name"] == "Renamed"
+
+    def test_image_changes_evict_product(self, client: TestClient, product_id: int, seller_headers: dict):
+        """Test that adding and deleting images invalidate the cached payload"""
+        client.get(f"/products/{product_id}")
+
+        added = client.post(f"/products/{product_id}/images", json={
+            "image_url": "/images/extra.jpg"
+        }, headers=seller_headers)
+        assert added.status_code == 200
+        assert len(client.get(f"/products/{product_id}").json()["images"]) == 2
+
+        deleted = client.delete(
+            f"/products/{product_id}/images/{added.json()['image_id']}", headers=seller_headers
+        )
+        assert deleted.status_code == 204
+        assert len(client.get(f"/products/{product_id}").json()["images"]) == 1
+
+    def test_delete_evicts_product(self, client: TestClient, product_id: int, seller_headers: dict):
+        """Test that a deleted product is no longer served from the cache"""
+        client.get(f"/products/{product_id}")
+
+        assert client.delete(f"/products/{product_id}", headers=seller_headers).status_code == 204
+        assert client.get(f"/products/{product_id}").status_code == 404
+
+    def test_seller_delete_evicts_products(self, client: TestClient, product_id: int, seller_headers: dict):
+        """Test that products deleted with their seller are no longer served or found"""
+        client.get(f"/products/{product_id}")
+        assert len(client.get("/products/search", params={"q": "product"}).json()) == 1
+
+        assert client.delete("/sellers/me", headers=seller_headers).status_code == 204
+        assert client.get(f"/products/{product_id}").status_code == 404
+        assert client.get("/products/search", params={"q": "product"}).json() == []
+
+    def test_user_delete_evicts_products(self, client: TestClient, product_id: int, seller_headers: dict):
+        """Test that products deleted with their seller's account are no longer served or found"""
+        client.get(f"/products/{product_id}")
+        assert len(client.get("/products/search", params={"q": "product"}).json()) == 1
+
+        assert client.delete("/users/me", headers=seller_headers).status_code == 204
+        assert client.get(f"/products/{product_id}").status_code == 404
+        assert client.get("/products/search", params={"q": "product"}).json() == []
+
+class TestProductConditionalGet:
+    @pytest.fixture
+    def products(self, test_db: Session, seller: Seller):
+        products = create_products(test_db, seller, 3)
+        # SQLite timestamps have one second resolution; start from the past
+        # so writes made during the test move updated_at forward
+        for product in products:
+            product.updated_at = datetime(2020, 1, 1)
+        test_db.commit()
+        return [product.product_id for product in products]
+
+    def test_detail_etag_and_304(self, client: TestClient, products: list):
+        """Test revalidating a product with If-None-Match"""
+        first = client.get(f"/products/{products[0]}")
+        etag = first.headers["ETag"]
+        assert first.headers["Last-Modified"] == "Wed, 01 Jan 2020 00:00:00 GMT"
+
+        response = client.get(f"/products/{products[0]}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    def test_detail_if_modified_since(self, client: TestClient, products: list):
+        """Test revalidating a product with If-Modified-Since"""
+        current = client.get(f"/products/{products[0]}", headers={
+            "If-Modified-Since": "Thu, 02 Jan 2020 00:00:00 GMT"
+        })
+        stale = client.get(f"/products/{products[0]}", headers={
+            "If-Modified-Since": "Tue, 31 Dec 2019 00:00:00 GMT"
+        })
+
+        assert current.status_code == 304
+        assert stale.status_code == 200
+
+    def test_detail_etag_changes_after_image_added(self, client: TestClient, products: list, seller_headers: dict):
+        """Test that image changes produce a new validator"""
+        etag = client.get(f"/products/{products[0]}").headers["ETag"]
+
+        client.post(f"/products/{products[0]}/images", json={"image_url": "/images/new.jpg"}, headers=seller_headers)
+        response = client.get(f"/products/{products[0]}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_list_etag_and_304(self, client: TestClient, products: list, seller_headers: dict):
+        """Test revalidating a product page"""
+        first = client.get("/products/", params={"limit": 2})
+        etag = first.headers["ETag"]
+
+        assert client.get("/products/", params={"limit": 2}, headers={"If-None-Match": etag}).status_code == 304
+        other_filter = client.get("/products/", params={"limit": 3}, headers={"If-None-Match": etag})
+        assert other_filter.status_code == 200
+
+        client.put(f"/products/{products[1]}", json={"price": "99.00"}, headers=seller_headers)
+        response = client.get("/products/", params={"limit": 2}, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()[1]["price"] == "99.00"
+
+class TestProductBatch:
+    def test_batch_keeps_order_and_reports_missing(self, client: TestClient, test_db: Session, seller: Seller, query_counter: list):
+        """Test hydrating several products with one query round"""
+        ids = [p.product_id for p in create_products(test_db, seller, 3)]
+        requested = [ids[2], 9999, ids[0]]
+        query_counter.clear()
+
+        response = client.get("/products/batch", params={"ids": ",".join(map(str, requested))})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["product_id"] for p in data["products"]] == [ids[2], ids[0]]
+        assert data["missing"] == [9999]
+        assert all(p["images"] for p in data["products"])
+        # products + categories + images
+        assert len(query_counter) == 3
+
+    def test_batch_uses_product_cache(self, client: TestClient, test_db: Session, seller: Seller, query_counter: list):
+        """Test that cached products are not queried again"""
+        ids = [p.product_id for p in create_products(test_db, seller, 2)]
+        client.get("/products/batch", params={"ids": f"{ids[0]},{ids[1]}"})
+        query_counter.clear()
+
+        response = client.post("/products/batch", json={"ids": ids})
+
+        assert [p["product_id"] for p in response.json()["products"]] == ids
+        assert query_counter == []
+
+    def test_batch_rejects_bad_ids(self, client: TestClient):
+        """Test validation of the id list"""
+        assert client.get("/products/batch", params={"ids": "1,abc"}).status_code == 400
+        too_many = ",".join(str(i) for i in range(101))
+        assert client.get("/products/batch", params={"ids": too_many}).status_code == 400
@@ -0,0 +1,209 @@
+import re
+import pytest
+from contextlib import contextmanager
+from decimal import Decimal
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.pagination import encode_cursor
+from core.security import create_access_token
+from models import User, Seller, Product, Category
+from services.auth_service.middleware import get_current_user, get_current_seller
+from services.product_service.service import ProductService
+from services.user_service.service import UserService
+
+# A table read without any index, e.g. "SCAN products". Index scans read
+# "SCAN products USING INDEX ..." and are not matched.
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+@contextmanager
+def captured_selects(db: Session):
+    """Collect (statement, parameters) of every SELECT run inside the block"""
+    engine = db.get_bind()
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def query_plans(db: Session, captured: list) -> list:
+    """Run EXPLAIN QUERY PLAN for each captured statement"""
+    connection = db.connection()
+    plans = []
+    for statement, parameters in captured:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        plans.append((statement, [row[3] for row in rows]))
+    return plans
+
+def assert_no_full_scans(db: Session, captured: list):
+    """Fail if any captured statement reads a table without an index"""
+    assert captured, "no queries were captured"
+    for statement, plan in query_plans(db, captured):
+        scans = [line for line in plan if FULL_SCAN.match(line)]
+        assert not scans, f"sequential scan in plan {plan} for:\n{statement}"
+
+@pytest.fixture
+def seller_user(test_db: Session):
+    user = User(email="plans@example.com", password_hash="x", first_name="Plan", last_name="Test")
+    test_db.add(user)
+    test_db.flush()
+    test_db.add(Seller(user_id=user.user_id, business_name="Plans", id_type="NIT", number_id="1"))
+    test_db.commit()
+    return user
+
+class TestProductQueryPlans:
+    def test_seller_listing_uses_index(self, test_db: Session):
+        """Test that seller listings use the (seller_id, product_id) index"""
+        with captured_selects(test_db) as captured:
+            ProductService.get_products_page(test_db, seller_id=1)
+            ProductService.get_products_page(test_db, seller_id=1, cursor=encode_cursor({"id": 10}))
+
+        assert_no_full_scans(test_db, captured)
+
+    def test_category_listing_uses_index(self, test_db: Session):
+        """Test that category listings start from the category_id index"""
+        with captured_selects(test_db) as captured:
+            ProductService.get_products_page(test_db, category_id=1)
+            ProductService.get_products_page(test_db, category_id=1, cursor=encode_cursor({"id": 10}))
+
+        assert_no_full_scans(test_db, captured)
+
+    def test_keyset_page_uses_primary_key(self, test_db: Session):
+        """Test that a cursor page seeks on the primary key"""
+        with captured_selects(test_db) as captured:
+            ProductService.get_products_page(test_db, cursor=encode_cursor({"id": 10}))
+
+        assert_no_full_scans(test_db, captured)
+
+    def test_unfiltered_first_page_is_ordered_limit_scan(self, test_db: Session):
+        """Test that the first page walks the primary key in order and stops after LIMIT rows"""
+        with captured_selects(test_db) as captured:
+            ProductService.get_products_page(test_db, limit=10)
+
+        (_, plan), = query_plans(test_db, captured)
+        assert plan == ["SCAN products"]
+
+    def test_relationship_loads_use_index(self, test_db: Session, seller_user: User):
+        """Test that categories and images are loaded through indexes"""
+        test_db.add(Product(seller_id=1, name="Indexed", price=1, stock_quantity=1))
+        test_db.commit()
+
+        with captured_selects(test_db) as captured:
+            test_db.expire_all()
+            ProductService.get_products_page(test_db, seller_id=1)
+            ProductService.get_product_by_id(test_db, 1)
+
+        # product rows + selectin loads of categories and images, twice
+        assert len(captured) == 6
+        assert_no_full_scans(test_db, captured)
+
+    def test_batch_lookup_uses_primary_key(self, test_db: Session):
+        """Test that batch lookups seek on the primary key"""
+        with captured_selects(test_db) as captured:
+            ProductService.get_product_payloads(test_db, [1, 2, 3])
+
+        assert_no_full_scans(test_db, captured)
+
+class TestUserQueryPlans:
+    def test_user_lookups_use_index(self, test_db: Session):
+        """Test that user lookups by email and id use indexes"""
+        with captured_selects(test_db) as captured:
+            UserService.get_user_by_email(test_db, "plans@example.com")
+            UserService.get_user_by_id(test_db, 1)
+
+        assert_no_full_scans(test_db, captured)
+
+class TestAuthQueryPlans:
+    def test_current_user_uses_index(self, test_db: Session, seller_user: User):
+        """Test the queries behind get_current_user"""
+        token = create_access_token({"sub": seller_user.email, "roles": ["user"]})
+        test_db.expire_all()
+
+        with captured_selects(test_db) as captured:
+            get_current_user(token=token, db=test_db)
+
+        assert_no_full_scans(test_db, captured)
+
+    def test_current_seller_uses_index(self, test_db: Session, seller_user: User):
+        """Test the queries behind get_current_seller"""
+        token = create_access_token({"sub": seller_user.email, "roles": ["user", "seller"]})
+        test_db.expire_all()
+
+        with captured_selects(test_db) as captured:
+            get_current_seller(token=token, db=test_db)
+
+        assert_no_full_scans(test_db, captured)
+
+    def test_current_seller_from_claims_uses_primary_key(self, test_db: Session, seller_user: User):
+        """Test the single lookup behind get_current_seller for tokens with a seller_id"""
+        token = create_access_token({
+            "sub": seller_user.email,
+            "user_id": seller_user.user_id,
+            "seller_id": seller_user.seller.seller_id,
+            "roles": ["user", "seller"]
+        })
+        test_db.expire_all()
+
+        with captured_selects(test_db) as captured:
+            get_current_seller(token=token, db=test_db)
+
+        assert len(captured) == 1
+        assert_no_full_scans(test_db, captured)
+
+class TestProductListingPlans:
+    @pytest.mark.parametrize("sort", [None, "price", "newest", "name"])
+    @pytest.mark.parametrize("filters", [
+        {"seller_id": 1},
+        {"seller_id": 1, "in_stock": True},
+        {"category_id": 1},
+        {"min_price": Decimal("10"), "max_price": Decimal("20")},
+        {"seller_id": 1, "min_price": Decimal("10")},
+    ])
+    def test_filtered_sorted_listing_uses_index(self, test_db: Session, seller_user: User, sort, filters):
+        """Test every sort combined with the listing filters, on both pages"""
+        category = Category(name="Plans")
+        for i in range(3):
+            test_db.add(Product(
+                seller_id=1, name=f"Plan {i}", price=Decimal("12") + i,
+                stock_quantity=i + 1, categories=[category]
+            ))
+        test_db.commit()
+        _, cursor = ProductService.get_products_page(test_db, limit=1, sort=sort, **filters)
+
+        assert cursor is not None
+
+        with captured_selects(test_db) as captured:
+            ProductService.get_products_page(test_db, limit=1, sort=sort, **filters)
+            ProductService.get_products_page(test_db, limit=1, sort=sort, cursor=cursor, **filters)
+
+        assert_no_full_scans(test_db, captured)
+
+    @pytest.mark.parametrize("sort", ["price", "newest", "name"])
+    def test_unfiltered_sort_reads_index_in_order(self, test_db: Session, sort):
+        """Test that a sorted listing reads its index in order instead of sorting the table"""
+        with captured_selects(test_db) as captured:
+            ProductService.get_products_page(test_db, limit=10, sort=sort)
+
+        (_, plan), = query_plans(test_db, captured)
+        assert not any("TEMP B-TREE" in line for line in plan), plan
+
+    @pytest.mark.parametrize("filters", [
+        {"seller_id": 1, "sort": "price"},
+        {"category_id": 1, "sort": "name"},
+        {"seller_id": 1, "sort": "newest"},
+        {"min_price": Decimal("10"), "max_price": Decimal("20")},
+        {"cursor": encode_cursor({"id": 10})},
+    ])
+    def test_card_listing_uses_index(self, test_db: Session, filters):
+        """Test that card pages join product_cards on its primary key"""
+        with captured_selects(test_db) as captured:
+            ProductService.get_product_cards_page(test_db, **filters)
+
+        assert len(captured) == 1
+        assert_no_full_scans(test_db, captured)
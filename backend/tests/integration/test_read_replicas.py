@@ -0,0 +1,172 @@
+import pytest
+import time
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from core.replicas import (
+    ReplicaRouter, READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER, get_read_db, get_async_read_db
+)
+from models import Base, Product, Seller
+from services.product_service.cache import product_cache
+
+@pytest.fixture
+def replica_path(tmp_path):
+    """A second local database standing in for a lagging read replica"""
+    path = tmp_path / "replica.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return path
+
+@pytest.fixture
+def router(app, client: TestClient, test_db: Session, test_async_engine, replica_path):
+    """Route the read-only dependencies between the test database and the replica"""
+    replica_engine = create_engine(
+        f"sqlite:///{replica_path}", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    async_replica_engine = create_async_engine(f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool)
+    router = ReplicaRouter(
+        primary=sessionmaker(bind=test_db.get_bind(), autoflush=False),
+        replicas=[sessionmaker(bind=replica_engine, autoflush=False, info={"replica": True})],
+        async_primary=async_sessionmaker(test_async_engine, autoflush=False, expire_on_commit=False),
+        async_replicas=[async_sessionmaker(
+            async_replica_engine, autoflush=False, expire_on_commit=False, info={"replica": True}
+        )],
+        window_seconds=5
+    )
+
+    def read_db(request: Request):
+        db = router.read_sessionmaker(request)()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def async_read_db(request: Request):
+        async with router.async_read_sessionmaker(request)() as db:
+            yield db
+
+    app.dependency_overrides[get_read_db] = read_db
+    app.dependency_overrides[get_async_read_db] = async_read_db
+    yield router
+    replica_engine.dispose()
+    async_replica_engine.sync_engine.dispose()
+
+def add_product(db: Session, seller_id: int, name: str) -> Product:
+    product = Product(seller_id=seller_id, name=name, price=10, stock_quantity=1)
+    db.add(product)
+    db.commit()
+    return product
+
+class TestReadReplicas:
+    def test_public_reads_use_replica(self, client: TestClient, test_db: Session, seller: Seller, router: ReplicaRouter):
+        """Test that anonymous listings are served by the replica"""
+        add_product(test_db, seller.seller_id, "Primary only")
+
+        response = client.get("/products/")
+
+        assert response.status_code == 200
+        assert response.json() == []
+        assert router.stats()["replica_reads"] == 1
+        assert client.get("/categories/").json() == []
+
+    def test_reads_follow_own_writes(self, client: TestClient, seller: Seller, seller_headers: dict, router: ReplicaRouter):
+        """Test that a seller sees a product it just created"""
+        client.cookies.clear()
+
+        response = client.post("/products/", json={"name": "Fresh", "price": "5.00", "stock_quantity": 1}, headers=seller_headers)
+
+        assert response.status_code == 201
+        assert READ_YOUR_WRITES_COOKIE in response.cookies
+        product_id = response.json()["product_id"]
+        mine = client.get("/products/seller/my-products", headers=seller_headers).json()
+        assert [p["product_id"] for p in mine] == [product_id]
+        assert client.get(f"/products/{product_id}").status_code == 200
+        assert router.stats()["primary_reads"] == 2
+
+    def test_reads_follow_own_writes_without_cookies(self, client: TestClient, seller: Seller, seller_headers: dict, router: ReplicaRouter):
+        """Test that a client that drops cookies is pinned by its token"""
+        client.cookies.clear()
+        response = client.post("/products/", json={"name": "Fresh", "price": "5.00", "stock_quantity": 1}, headers=seller_headers)
+        assert response.status_code == 201
+        client.cookies.clear()
+
+        mine = client.get("/products/seller/my-products", headers=seller_headers).json()
+        assert [p["product_id"] for p in mine] == [response.json()["product_id"]]
+        assert router.stats() == {"replicas": 1, "primary_reads": 1, "replica_reads": 0}
+
+        # Anonymous reads are not affected by the seller's pin
+        assert client.get("/products/").json() == []
+
+    def test_echoed_header_pins_reads(self, client: TestClient, seller: Seller, seller_headers: dict, router: ReplicaRouter):
+        """Test that sending back the response header keeps reads on the primary"""
+        client.cookies.clear()
+        response = client.post("/products/", json={"name": "Fresh", "price": "5.00", "stock_quantity": 1}, headers=seller_headers)
+        until = response.headers[READ_YOUR_WRITES_HEADER]
+        client.cookies.clear()
+
+        product_id = response.json()["product_id"]
+        assert client.get(f"/products/{product_id}").status_code == 404
+        assert client.get(f"/products/{product_id}", headers={READ_YOUR_WRITES_HEADER: until}).status_code == 200
+
+    def test_read_only_post_does_not_pin(self, client: TestClient, test_db: Session, seller: Seller, seller_headers: dict, router: ReplicaRouter):
+        """Test that POST /products/batch is not treated as a write"""
+        product = add_product(test_db, seller.seller_id, "Primary only")
+        client.cookies.clear()
+
+        response = client.post("/products/batch", json={"ids": [product.product_id]}, headers=seller_headers)
+
+        assert response.status_code == 200
+        assert READ_YOUR_WRITES_COOKIE not in response.cookies
+        assert READ_YOUR_WRITES_HEADER not in response.headers
+        assert client.get(f"/products/{product.product_id}", headers=seller_headers).status_code == 404
+        assert router.stats()["primary_reads"] == 0
+
+    def test_expired_window_returns_to_replica(self, client: TestClient, test_db: Session, seller: Seller, router: ReplicaRouter):
+        """Test that reads go back to the replica once the window has passed"""
+        product = add_product(test_db, seller.seller_id, "Primary only")
+        client.cookies.set(READ_YOUR_WRITES_COOKIE, "1")
+
+        assert client.get(f"/products/{product.product_id}").status_code == 404
+        assert router.stats()["replica_reads"] == 1
+
+    def test_far_future_cookie_ignored(self, client: TestClient, test_db: Session, seller: Seller, router: ReplicaRouter):
+        """Test that a cookie beyond the window cannot pin a client to the primary"""
+        product = add_product(test_db, seller.seller_id, "Primary only")
+        client.cookies.set(READ_YOUR_WRITES_COOKIE, "9999999999")
+
+        assert client.get(f"/products/{product.product_id}").status_code == 404
+        assert router.stats()["replica_reads"] == 1
+
+    def test_reads_and_failures_do_not_pin(self, client: TestClient, seller: Seller, seller_headers: dict):
+        """Test that only successful writes set the cookie"""
+        client.cookies.clear()
+
+        assert READ_YOUR_WRITES_COOKIE not in client.get("/products/").cookies
+        response = client.put("/products/999", json={"name": "Missing"}, headers=seller_headers)
+        assert response.status_code == 404
+        assert READ_YOUR_WRITES_COOKIE not in response.cookies
+
+    def test_replica_read_after_write_not_cached(self, client: TestClient, test_db: Session, seller: Seller, seller_headers: dict, router: ReplicaRouter, replica_path):
+        """Test that a replica read right after an invalidation is not cached"""
+        product = add_product(test_db, seller.seller_id, "Original")
+        # The replica has the product as it was before the update below
+        replica_engine = create_engine(f"sqlite:///{replica_path}")
+        with Session(replica_engine) as replica:
+            replica.merge(Seller(seller_id=seller.seller_id, user_id=seller.user_id, business_name="Fixture Store", id_type="NIT", number_id="900123456"))
+            replica.add(Product(product_id=product.product_id, seller_id=seller.seller_id, name="Original", price=10, stock_quantity=1))
+            replica.commit()
+        replica_engine.dispose()
+
+        assert client.put(f"/products/{product.product_id}", json={"name": "Renamed"}, headers=seller_headers).status_code == 200
+        client.cookies.clear()
+
+        # Another client still sees the lagging replica, but it is not cached
+        assert client.get(f"/products/{product.product_id}").json()["name"] == "Original"
+        assert product_cache.get(product.product_id) is None
+        client.cookies.set(READ_YOUR_WRITES_COOKIE, f"{time.time() + 2:.3f}")
+        assert client.get(f"/products/{product.product_id}").json()["name"] == "Renamed"
@@ -0,0 +1,75 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from core.slow_queries import slow_query_log
+
+@pytest.fixture
+def record_all(monkeypatch):
+    """Treat every statement as slow and capture plans"""
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    monkeypatch.setattr(slow_query_log, "explain", True)
+    yield slow_query_log
+    # Let pending plans finish before the test database goes away
+    slow_query_log.shutdown()
+
+@pytest.fixture
+def admin(monkeypatch, seller_headers: dict):
+    """Make the seller fixture's user an admin"""
+    monkeypatch.setattr("services.auth_service.middleware.ADMIN_EMAILS", {"seller.fixture@example.com"})
+    return seller_headers
+
+class TestSlowQueryLog:
+    def test_records_route_and_plan(self, client: TestClient, record_all):
+        """Test that slow SELECTs are kept with their route and an EXPLAIN plan"""
+        client.get("/products/")
+        record_all.shutdown()
+
+        entry = next(
+            e for e in record_all.entries()
+            if e["route"] == "/products/" and "FROM products" in e["statement"]
+        )
+        assert entry["explain_status"] == "done"
+        assert any("products" in line for line in entry["explain"])
+        assert record_all.stats()["explains"] >= 1
+
+    def test_parameters_redacted(self, client: TestClient, record_all):
+        """Test that string parameters such as emails are not kept"""
+        client.post("/auth/token", data={"username": "someone@example.com", "password": "secret-password"})
+
+        entries = record_all.entries()
+        assert entries
+        assert all("someone@example.com" not in str(entry) for entry in entries)
+        assert any("<str>" in str(entry["parameters"]) for entry in entries)
+
+    def test_fast_statements_ignored(self, client: TestClient, monkeypatch):
+        """Test that statements under the threshold are not recorded"""
+        monkeypatch.setattr(slow_query_log, "threshold_ms", 60_000)
+
+        client.get("/products/")
+
+        assert slow_query_log.entries() == []
+
+class TestSlowQueryEndpoint:
+    def test_admin_reads_entries(self, client: TestClient, record_all, admin: dict):
+        """Test that admins get the newest entries with the log counters"""
+        client.get("/products/")
+
+        response = client.get("/admin/slow-queries?limit=2", headers=admin)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["queries"]) == 2
+        assert data["recorded"] >= 2
+        assert data["threshold_ms"] == 0
+
+    def test_requires_admin(self, client: TestClient, seller_headers: dict):
+        """Test that users outside ADMIN_EMAILS are refused"""
+        response = client.get("/admin/slow-queries", headers=seller_headers)
+
+        assert response.status_code == 403
+
+    def test_requires_authentication(self, client: TestClient):
+        """Test that anonymous requests are refused"""
+        response = client.get("/admin/slow-queries")
+
+        assert response.status_code == 401
@@ -0,0 +1,82 @@
+import json
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.sql_instrumentation import (
+    QueryBudgetExceeded, RequestQueries, current_queries, sql_instrumentation
+)
+from models import Product, Seller
+
+def add_products(db: Session, seller: Seller, count: int) -> None:
+    db.add_all([
+        Product(seller_id=seller.seller_id, name=f"Product {i}", price=10 + i, stock_quantity=1)
+        for i in range(count)
+    ])
+    db.commit()
+
+class TestServerTiming:
+    def test_header_reports_statement_count(self, client: TestClient, test_db: Session, seller: Seller, query_counter: list):
+        """Test that Server-Timing carries the number of statements and their duration"""
+        add_products(test_db, seller, 3)
+        query_counter.clear()
+
+        response = client.get("/products/")
+
+        assert response.status_code == 200
+        timing = response.headers["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert f'desc="{len(query_counter)} queries"' in timing
+
+    def test_request_logged(self, client: TestClient, caplog: pytest.LogCaptureFixture):
+        """Test that each request gets one structured log record"""
+        with caplog.at_level(logging.INFO, logger="app.sql"):
+            client.get("/products/")
+
+        records = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.sql"]
+        assert records[-1]["path"] == "/products/"
+        assert records[-1]["status"] == 200
+        assert "repeated" not in records[-1]
+
+class TestNPlusOneDetection:
+    def test_listing_has_no_repeated_statements(self, client: TestClient, test_db: Session, seller: Seller, seller_headers: dict, caplog: pytest.LogCaptureFixture):
+        """Test that product listings and seller auth do not repeat a statement per row"""
+        add_products(test_db, seller, 10)
+
+        with caplog.at_level(logging.INFO, logger="app.sql"):
+            client.get("/products/")
+            client.get("/products/seller/my-products", headers=seller_headers)
+
+        assert not [r for r in caplog.records if r.name == "app.sql" and r.levelno >= logging.WARNING]
+
+    def test_repeated_statement_flagged(self, test_db: Session, caplog: pytest.LogCaptureFixture):
+        """Test that a statement executed once per row is reported as a likely N+1"""
+        queries = RequestQueries()
+        token = current_queries.set(queries)
+        try:
+            for product_id in range(sql_instrumentation.n_plus_one_threshold):
+                test_db.execute(text("SELECT * FROM products WHERE product_id = :id"), {"id": product_id})
+        finally:
+            current_queries.reset(token)
+
+        with caplog.at_level(logging.WARNING, logger="app.sql"):
+            record = sql_instrumentation.finish("GET", "/n-plus-one", 200, queries)
+
+        assert record["repeated"][0]["count"] == sql_instrumentation.n_plus_one_threshold
+        assert "sql_suspect" in caplog.records[-1].getMessage()
+
+class TestQueryBudget:
+    def test_budget_exceeded_fails_request(self, client: TestClient, seller: Seller, seller_headers: dict, query_budget):
+        """Test that a request over the budget raises instead of running more statements"""
+        query_budget(1)
+
+        with pytest.raises(QueryBudgetExceeded):
+            client.get("/products/seller/my-products", headers=seller_headers)
+
+    def test_within_budget(self, client: TestClient, seller: Seller, seller_headers: dict, query_budget):
+        """Test that the seller listing fits a small budget"""
+        query_budget(3)
+
+        assert client.get("/products/seller/my-products", headers=seller_headers).status_code == 200
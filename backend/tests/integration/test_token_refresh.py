@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, UTC
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from core.cache import get_cache_stats
+from models import RevokedToken, Seller
+from services.auth_service.middleware import decode_access_token
+from services.auth_service.revocation import revocation_list
+
+def login(client: TestClient) -> dict:
+    response = client.post("/auth/login", json={
+        "email": "seller.fixture@example.com",
+        "password": "sellerpassword123"
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+class TestRefreshTokens:
+    def test_login_returns_refresh_token(self, client: TestClient, seller: Seller):
+        """Test that login issues a refresh token alongside the access token"""
+        tokens = login(client)
+
+        assert tokens["refresh_token"]
+        assert decode_access_token(tokens["refresh_token"])["type"] == "refresh"
+        assert decode_access_token(tokens["access_token"])["type"] == "access"
+
+    def test_refresh_rotates_tokens(self, client: TestClient, seller: Seller):
+        """Test that a refresh returns a working access token and a new refresh token"""
+        tokens = login(client)
+
+        response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+        assert response.status_code == 200
+        refreshed = response.json()
+        assert refreshed["refresh_token"] != tokens["refresh_token"]
+        assert refreshed["is_seller"] is True
+        assert client.get("/auth/me", headers=bearer(refreshed["access_token"])).status_code == 200
+
+    def test_refresh_token_single_use(self, client: TestClient, seller: Seller):
+        """Test that a refresh token cannot be exchanged twice"""
+        tokens = login(client)
+        assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 200
+
+        response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+        assert response.status_code == 401
+
+    def test_access_token_not_accepted_for_refresh(self, client: TestClient, seller: Seller):
+        """Test that an access token cannot be used as a refresh token"""
+        tokens = login(client)
+
+        response = client.post("/auth/refresh", json={"refresh_token": tokens["access_token"]})
+
+        assert response.status_code == 401
+
+    def test_refresh_token_not_accepted_as_access_token(self, client: TestClient, seller: Seller):
+        """Test that a refresh token does not authenticate API requests"""
+        tokens = login(client)
+
+        assert client.get("/auth/me", headers=bearer(tokens["refresh_token"])).status_code == 401
+        assert client.get("/products/seller/my-products", headers=bearer(tokens["refresh_token"])).status_code == 401
+
+class TestLogout:
+    def test_logout_revokes_access_token(self, client: TestClient, seller: Seller):
+        """Test that the access token stops working after logout"""
+        tokens = login(client)
+        headers = bearer(tokens["access_token"])
+
+        assert client.post("/auth/logout", headers=headers).status_code == 204
+
+        assert client.get("/auth/me", headers=headers).status_code == 401
+        assert client.get("/products/seller/my-products", headers=headers).status_code == 401
+
+    def test_logout_revokes_refresh_token(self, client: TestClient, seller: Seller):
+        """Test that a refresh token passed to logout can no longer be used"""
+        tokens = login(client)
+
+        response = client.post(
+            "/auth/logout",
+            json={"refresh_token": tokens["refresh_token"]},
+            headers=bearer(tokens["access_token"])
+        )
+
+        assert response.status_code == 204
+        assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+    def test_logout_rejects_foreign_refresh_token(self, client: TestClient, seller: Seller):
+        """Test that logout does not accept an access token in place of a refresh token"""
+        tokens = login(client)
+
+        response = client.post(
+            "/auth/logout",
+            json={"refresh_token": tokens["access_token"]},
+            headers=bearer(tokens["access_token"])
+        )
+
+        assert response.status_code == 401
+
+class TestRevocationList:
+    def test_valid_token_checks_cost_no_queries(self, client: TestClient, seller: Seller, query_counter: list):
+        """Test that checking an unrevoked token is answered from the filter"""
+        headers = bearer(login(client)["access_token"])
+        client.get("/auth/me", headers=headers)
+
+        query_counter.clear()
+        assert client.get("/auth/me", headers=headers).status_code == 200
+
+        assert query_counter == []
+        assert get_cache_stats()["token_revocations"]["checks"] == 2
+
+    def test_sync_picks_up_other_workers_revocations(self, client: TestClient, test_db: Session, seller: Seller):
+        """Test that revocations written elsewhere are seen after the next sync"""
+        tokens = login(client)
+        headers = bearer(tokens["access_token"])
+        assert client.get("/auth/me", headers=headers).status_code == 200
+
+        # Another worker revokes the token directly in the table
+        payload = decode_access_token(tokens["access_token"])
+        test_db.add(RevokedToken(
+            jti=payload["jti"],
+            expires_at=datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=30)
+        ))
+        test_db.commit()
+        revocation_list._next_sync = 0.0
+
+        assert client.get("/auth/me", headers=headers).status_code == 401
+        assert revocation_list.stats()["syncs"] == 1
+
+    def test_prune_drops_expired_revocations(self, test_db: Session):
+        """Test that revocations of expired tokens are deleted"""
+        now = datetime.now(UTC).replace(tzinfo=None)
+        test_db.add_all([
+            RevokedToken(jti="expired", expires_at=now - timedelta(minutes=1)),
+            RevokedToken(jti="live", expires_at=now + timedelta(minutes=1)),
+        ])
+        test_db.commit()
+
+        assert revocation_list.prune(test_db) == 1
+        test_db.commit()
+        assert [row.jti for row in test_db.query(RevokedToken)] == ["live"]
@@ -0,0 +1,30 @@
+from core.bloom import BloomFilter
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        """Test that every added item is reported as present"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"token-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+        assert bloom.stats()["items"] == 1000
+
+    def test_false_positive_rate_bounded(self):
+        """Test that the false positive rate at capacity stays near error_rate"""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"revoked-{i}")
+
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+
+        assert false_positives / 10000 < 0.02
+
+    def test_size(self):
+        """Test that memory follows the standard sizing formula"""
+        bloom = BloomFilter(capacity=100000, error_rate=0.001)
+
+        stats = bloom.stats()
+        assert 170_000 < stats["size_bytes"] < 190_000
+        assert stats["hash_count"] == 10
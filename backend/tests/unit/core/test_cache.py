@@ -0,0 +1,90 @@
+import pytest
+
+from core.cache import TTLCache
+
+class TestTTLCache:
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses"""
+        cache = TTLCache("test_counters", max_entries=10, ttl_seconds=60)
+
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full"""
+        cache = TTLCache("test_lru", max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that entries are dropped once their TTL has passed"""
+        now = [1000.0]
+        monkeypatch.setattr("core.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache("test_ttl", max_entries=10, ttl_seconds=5)
+        cache.set("a", 1)
+
+        now[0] += 6
+
+        assert cache.get("a") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_stale_generation_is_not_cached(self):
+        """Test that a value loaded before an invalidation is discarded"""
+        cache = TTLCache("test_generation", max_entries=10, ttl_seconds=60)
+        generation = cache.generation
+
+        cache.evict("a")
+        cache.set("a", "stale", generation=generation)
+
+        assert cache.get("a") is None
+
+    def test_min_age_applies_to_invalidated_key_only(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that a recent invalidation only blocks refills of the keys it touched"""
+        now = [1000.0]
+        monkeypatch.setattr("core.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache("test_min_age", max_entries=10, ttl_seconds=60)
+
+        cache.evict("a")
+        cache.set("a", "stale", min_age=5)
+        cache.set("b", "fresh", min_age=5)
+        assert cache.get("a") is None
+        assert cache.get("b") == "fresh"
+
+        now[0] += 6
+        cache.set("a", "fresh", min_age=5)
+        assert cache.get("a") == "fresh"
+
+    def test_min_age_after_invalidations_overflow(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that keys whose invalidation is no longer tracked are treated conservatively"""
+        now = [1000.0]
+        monkeypatch.setattr("core.cache.time.monotonic", lambda: now[0])
+        cache = TTLCache("test_min_age_overflow", max_entries=2, ttl_seconds=60)
+
+        cache.evict_many(["a", "b", "c"])
+        cache.set("a", "stale", min_age=5)
+        assert cache.get("a") is None
+
+        cache.clear()
+        cache.set("d", "stale", min_age=5)
+        assert cache.get("d") is None
+
+    def test_disabled_cache(self):
+        """Test that a disabled cache never stores values"""
+        cache = TTLCache("test_disabled", max_entries=10, ttl_seconds=60, enabled=False)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.stats()["enabled"] is False
@@ -0,0 +1,30 @@
+import pytest
+
+from core.config import _database_url
+
+class TestDatabaseUrl:
+    def test_database_url_wins(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that DATABASE_URL overrides the profile and DB_* variables"""
+        monkeypatch.setenv("DATABASE_URL", "postgresql://app:secret@db/app")
+
+        assert _database_url({"url": "sqlite:///:memory:"}) == "postgresql://app:secret@db/app"
+
+    def test_built_from_db_variables(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that the local URL is built from DB_* variables"""
+        monkeypatch.delenv("DATABASE_URL", raising=False)
+        monkeypatch.setenv("DB_USER", "app")
+        monkeypatch.setenv("DB_PASSWORD", "secret")
+        monkeypatch.setenv("DB_HOST", "db")
+        monkeypatch.setenv("DB_PORT", "5432")
+        monkeypatch.setenv("DB_NAME", "shop")
+
+        assert _database_url({}) == "postgresql://app:secret@db:5432/shop"
+
+    def test_credentials_required(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that there is no built-in user or password to fall back on"""
+        monkeypatch.delenv("DATABASE_URL", raising=False)
+        monkeypatch.setenv("DB_USER", "app")
+        monkeypatch.delenv("DB_PASSWORD", raising=False)
+
+        with pytest.raises(ValueError, match="DB_USER and DB_PASSWORD"):
+            _database_url({})
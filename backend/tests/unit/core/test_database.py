@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from core.database import create_db_engine, create_async_db_engine, get_pool_stats
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        echo=False, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    yield engine
+    engine.dispose()
+
+class TestDatabaseEngine:
+    def test_memory_database_shares_one_connection(self):
+        """Test that in-memory SQLite keeps its data across sessions"""
+        engine = create_db_engine("sqlite:///:memory:", echo=False)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM t")).scalar() == 0
+        assert get_pool_stats(engine)["pool"] == "StaticPool"
+
+    def test_pool_settings_applied(self, file_engine):
+        """Test that pool size and overflow come from the factory arguments"""
+        stats = get_pool_stats(file_engine)
+
+        assert stats["pool"] == "InstrumentedQueuePool"
+        assert stats["size"] == 1
+        assert stats["max_overflow"] == 0
+
+    def test_checkouts_and_waits_counted(self, file_engine):
+        """Test that checkouts, connections and waits are counted"""
+        for _ in range(3):
+            with file_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        stats = get_pool_stats(file_engine)
+        assert stats["checkouts"] == 3
+        assert stats["connects"] == 1
+        assert stats["wait_count"] == 3
+        assert stats["checked_out"] == 0
+
+    def test_exhausted_pool_times_out(self, file_engine):
+        """Test that a checkout beyond the pool size times out and is counted"""
+        held = file_engine.connect()
+        try:
+            with pytest.raises(PoolTimeoutError):
+                file_engine.connect()
+        finally:
+            held.close()
+
+        stats = get_pool_stats(file_engine)
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds_max"] >= 0.05
+
+    def test_wait_measured_while_pool_busy(self, file_engine):
+        """Test that time spent queued for a connection is recorded"""
+        held = file_engine.connect()
+        threading.Timer(0.02, held.close).start()
+
+        with file_engine.connect():
+            pass
+
+        assert get_pool_stats(file_engine)["wait_seconds_max"] >= 0.015
+
+    def test_async_engine_uses_async_driver(self, tmp_path):
+        """Test that a sync URL is switched to its async driver and instrumented"""
+        engine = create_async_db_engine(f"sqlite:///{tmp_path / 'async.db'}", echo=False, pool_size=2)
+
+        async def run():
+            async with engine.connect() as connection:
+                value = (await connection.execute(text("SELECT 1"))).scalar()
+            await engine.dispose()
+            return value
+
+        assert asyncio.run(run()) == 1
+        assert engine.url.drivername == "sqlite+aiosqlite"
+        stats = get_pool_stats(engine)
+        assert stats["pool"] == "InstrumentedAsyncQueuePool"
+        assert stats["size"] == 2
+        assert stats["checkouts"] == 1
+        assert stats["wait_count"] == 1
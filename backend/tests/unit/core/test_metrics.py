@@ -0,0 +1,52 @@
+from core.metrics import RequestMetrics, MetricsWriter, write_request_metrics
+
+class TestRequestMetrics:
+    def test_observe_buckets(self):
+        """Test that observations land in the first bucket whose bound they do not exceed"""
+        metrics = RequestMetrics(buckets=(0.1, 1.0))
+        metrics.observe("/products/", "GET", 200, 0.05)
+        metrics.observe("/products/", "GET", 200, 0.1)
+        metrics.observe("/products/", "GET", 200, 0.5)
+        metrics.observe("/products/", "GET", 200, 3.0)
+
+        [(route, method, status_code, series)] = list(metrics.series())
+        assert (route, method, status_code) == ("/products/", "GET", 200)
+        assert series[0] == 4
+        assert series[1] == 3.65
+        assert series[2:] == [2, 1]
+
+    def test_series_reused(self):
+        """Test that repeat observations update the same series in place"""
+        metrics = RequestMetrics()
+        metrics.observe("/", "GET", 200, 0.01)
+        [(_, _, _, series)] = list(metrics.series())
+
+        metrics.observe("/", "GET", 200, 0.01)
+
+        assert list(metrics.series())[0][3] is series
+        assert series[0] == 2
+
+class TestMetricsWriter:
+    def test_histogram_is_cumulative(self):
+        """Test that rendered buckets are cumulative and end with +Inf"""
+        metrics = RequestMetrics(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.5, 3.0):
+            metrics.observe("/items/{item_id}", "GET", 200, seconds)
+        writer = MetricsWriter()
+
+        write_request_metrics(writer, metrics)
+        text = writer.render()
+
+        labels = 'route="/items/{item_id}",method="GET",status="200"'
+        assert f'http_requests_total{{{labels}}} 3' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="1.0"}} 2' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert "# TYPE http_request_duration_seconds histogram" in text
+
+    def test_label_escaping(self):
+        """Test that quotes, backslashes and newlines in labels are escaped"""
+        writer = MetricsWriter()
+        writer.sample("m", 1, route='a"b\\c\nd')
+
+        assert writer.render() == 'm{route="a\\"b\\\\c\\nd"} 1\n'
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+
+from core.password_hasher import PasswordHasher
+from core.security import pwd_context
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, queue_limit=1, timeout_seconds=5)
+    yield hasher
+    hasher.shutdown()
+
+def occupy(hasher: PasswordHasher, release: threading.Event) -> threading.Thread:
+    """Start a call that holds one pool slot until release is set"""
+    started = threading.Event()
+
+    def blocked():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=hasher._run, args=(blocked,))
+    thread.start()
+    started.wait(5)
+    return thread
+
+class TestPasswordHasher:
+    def test_hash_and_verify(self, hasher: PasswordHasher):
+        """Test that hashing and verification run on the pool"""
+        hashed = hasher.hash("secret-password")
+
+        assert hasher.verify("secret-password", hashed)
+        assert not hasher.verify("wrong-password", hashed)
+        assert hasher.stats()["submitted"] == 3
+
+    def test_rounds_configurable(self):
+        """Test that new hashes use the configured bcrypt cost"""
+        hashed = pwd_context.hash("secret-password")
+
+        # $2b$<rounds>$...; the test suite runs with BCRYPT_ROUNDS=4
+        assert hashed.split("$")[2] == "04"
+
+    def test_saturated_pool_rejects_immediately(self, hasher: PasswordHasher):
+        """Test that calls beyond workers + queue_limit get a 503 without waiting"""
+        release = threading.Event()
+        running = occupy(hasher, release)
+        queued = threading.Thread(target=hasher._run, args=(lambda: None,))
+        queued.start()
+
+        try:
+            with pytest.raises(HTTPException) as exc:
+                hasher.hash("secret-password")
+        finally:
+            release.set()
+            running.join()
+            queued.join()
+
+        assert exc.value.status_code == 503
+        assert exc.value.headers["Retry-After"] == "1"
+        assert hasher.stats()["rejected"] == 1
+
+    def test_timeout(self):
+        """Test that a call stuck in the queue times out with a 503"""
+        hasher = PasswordHasher(workers=1, queue_limit=1, timeout_seconds=5)
+        release = threading.Event()
+        running = occupy(hasher, release)
+        hasher.timeout_seconds = 0.05
+
+        try:
+            with pytest.raises(HTTPException) as exc:
+                hasher.hash("secret-password")
+        finally:
+            release.set()
+            running.join()
+            hasher.shutdown()
+
+        assert exc.value.status_code == 503
+        stats = hasher.stats()
+        assert stats["timeouts"] == 1
+        # The timed-out call was cancelled before it started, freeing its slot
+        assert stats["queue_wait_count"] == 1
+        assert hasher._slots.acquire(blocking=False)
+
+    def test_queue_wait_recorded(self, hasher: PasswordHasher):
+        """Test that time spent queued behind another call is measured"""
+        release = threading.Event()
+        running = occupy(hasher, release)
+        timer = threading.Timer(0.05, release.set)
+        timer.start()
+
+        hasher.hash("secret-password")
+        running.join()
+
+        stats = hasher.stats()
+        assert stats["queue_wait_count"] == 2
+        assert stats["queue_wait_seconds_max"] >= 0.04
+        assert sum(stats["queue_wait_buckets"].values()) == 2
+
+    def test_async_hash_and_verify(self, hasher: PasswordHasher):
+        """Test that the async variants run on the pool and return the same results"""
+        async def run():
+            hashed = await hasher.hash_async("secret-password")
+            return hashed, await hasher.verify_async("secret-password", hashed)
+
+        hashed, verified = asyncio.run(run())
+
+        assert verified
+        assert pwd_context.verify("secret-password", hashed)
+        assert hasher.stats()["submitted"] == 2
+        assert hasher.stats()["in_flight"] == 0
+
+    def test_async_timeout(self):
+        """Test that an awaited call stuck in the queue times out with a 503"""
+        hasher = PasswordHasher(workers=1, queue_limit=1, timeout_seconds=5)
+        release = threading.Event()
+        running = occupy(hasher, release)
+        hasher.timeout_seconds = 0.05
+
+        try:
+            with pytest.raises(HTTPException) as exc:
+                asyncio.run(hasher.verify_async("secret-password", "hash"))
+        finally:
+            release.set()
+            running.join()
+            hasher.shutdown()
+
+        assert exc.value.status_code == 503
+        assert hasher.stats()["timeouts"] == 1
@@ -0,0 +1,52 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+
+from core.slow_queries import SlowQueryLog, redact_parameters
+
+class TestRedactParameters:
+    def test_positional(self):
+        """Test that numbers and NULLs are kept and other values replaced by their type"""
+        assert redact_parameters(("seller@example.com", 42, 9.5, None, True)) == ["<str>", 42, 9.5, None, True]
+
+    def test_named(self):
+        """Test that named parameters keep their names"""
+        redacted = redact_parameters({"email_1": "a@b.c", "price": Decimal("10.00"), "at": datetime(2024, 1, 1)})
+
+        assert redacted == {"email_1": "<str>", "price": Decimal("10.00"), "at": "<datetime>"}
+
+class TestSlowQueryLog:
+    def test_ring_buffer_keeps_newest(self):
+        """Test that the buffer is bounded and lists the newest entries first"""
+        log = SlowQueryLog(enabled=True, threshold_ms=0, size=2, explain=False)
+        engine = create_engine("sqlite://")
+
+        for i in range(3):
+            log.record(engine, f"SELECT {i}", (), None, False, 1.0)
+
+        assert [entry["statement"] for entry in log.entries()] == ["SELECT 2", "SELECT 1"]
+        assert log.entries(limit=1)[0]["statement"] == "SELECT 2"
+        assert log.stats()["recorded"] == 3
+        assert log.stats()["buffered"] == 2
+
+    def test_executemany_keeps_first_row(self):
+        """Test that batched statements record the row count and one redacted row"""
+        log = SlowQueryLog(enabled=True, threshold_ms=0, size=10, explain=False)
+        engine = create_engine("sqlite://")
+
+        entry = log.record(engine, "INSERT INTO t VALUES (?, ?)", [("a", 1), ("b", 2)], None, True, 1.0)
+
+        assert entry["parameters"] == ["<str>", 1]
+        assert entry["rows"] == 2
+        assert entry["explain_status"] == "disabled"
+
+    def test_reset(self):
+        """Test that reset empties the buffer and the counters"""
+        log = SlowQueryLog(enabled=True, threshold_ms=0, size=10, explain=False)
+        log.record(create_engine("sqlite://"), "SELECT 1", (), None, False, 1.0)
+
+        log.reset()
+
+        assert log.entries() == []
+        assert log.stats()["recorded"] == 0
@@ -0,0 +1,38 @@
+from core.sql_instrumentation import statement_shape, RequestQueries, SQLInstrumentation
+
+class TestStatementShape:
+    def test_placeholder_styles_collapse(self):
+        """Test that bind placeholders of every driver style normalise the same way"""
+        assert statement_shape("SELECT * FROM t WHERE id = ?") == "SELECT * FROM t WHERE id = ?"
+        assert statement_shape("SELECT * FROM t WHERE id = %(id_1)s") == "SELECT * FROM t WHERE id = ?"
+        assert statement_shape("SELECT * FROM t WHERE id = $1") == "SELECT * FROM t WHERE id = ?"
+
+    def test_in_lists_and_whitespace_collapse(self):
+        """Test that IN lists of any length and layout give one shape"""
+        short = statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?)")
+        long = statement_shape("SELECT * FROM t WHERE id IN (?,?,?,?)")
+
+        assert short == long == "SELECT * FROM t WHERE id IN (?)"
+
+class TestRequestQueries:
+    def test_repeated_shapes(self):
+        """Test that shapes at or above the threshold are reported, most frequent first"""
+        queries = RequestQueries()
+        queries.shapes.update(["a"] * 2 + ["b"] * 6 + ["c"] * 5)
+
+        assert queries.repeated(5) == [("b", 6), ("c", 5)]
+
+    def test_finish_counts_requests(self):
+        """Test that finished requests feed the process counters"""
+        instrumentation = SQLInstrumentation(enabled=True, n_plus_one_threshold=3, budget=2, enforce_budget=False)
+        queries = RequestQueries()
+        queries.count = 3
+        queries.shapes["SELECT ?"] = 3
+
+        record = instrumentation.finish("GET", "/products/", 200, queries)
+
+        assert record["repeated"] == [{"statement": "SELECT ?", "count": 3}]
+        stats = instrumentation.stats()
+        assert stats["n_plus_one_requests"] == 1
+        assert stats["over_budget_requests"] == 1
+        assert stats["max_queries"] == 3
@@ -1,6 +1,6 @@
 // src/services/apiService.js
 
-import { authHeader } from './authService';
+import { authHeader, readYourWritesHeader, rememberPrimaryUntil } from './authService';
 
 /**
  * Service for handling API requests with authentication
@@ -21,8 +21,10 @@ export const get = async (endpoint) => {
       headers: {
         'Content-Type': 'application/json',
         ...authHeader(),
+        ...readYourWritesHeader(),
       },
     });
+    rememberPrimaryUntil(response);
 
     if (!response.ok) {
       const errorData = await response.json();
@@ -49,9 +51,11 @@ export const post = async (endpoint, data) => {
       headers: {
         'Content-Type': 'application/json',
         ...authHeader(),
+        ...readYourWritesHeader(),
       },
       body: JSON.stringify(data),
     });
+    rememberPrimaryUntil(response);
 
     if (!response.ok) {
       const errorData = await response.json();
@@ -83,9 +87,11 @@ export const put = async (endpoint, data) => {
       headers: {
         'Content-Type': 'application/json',
         ...authHeader(),
+        ...readYourWritesHeader(),
       },
       body: JSON.stringify(data),
     });
+    rememberPrimaryUntil(response);
 
     if (!response.ok) {
       const errorData = await response.json();
@@ -111,8 +117,10 @@ export const del = async (endpoint) => {
       headers: {
         'Content-Type': 'application/json',
         ...authHeader(),
+        ...readYourWritesHeader(),
       },
     });
+    rememberPrimaryUntil(response);
 
     if (!response.ok) {
       const errorData = await response.json();
@@ -153,6 +153,35 @@ export const getCurrentUser = async () => {
   }
 };
 
+// Header with the time (unix seconds) until which the API reads from its
+// primary database for us after a write; sending it back lets us see our own
+// changes when reads are served by lagging replicas
+const PRIMARY_UNTIL_HEADER = 'X-DB-Primary-Until';
+let primaryUntil = null;
+
+/**
+ * Remember the read-your-writes time handed out with a response
+ * @param {Response} response - Response from the API
+ */
+export const rememberPrimaryUntil = (response) => {
+  const value = response.headers.get(PRIMARY_UNTIL_HEADER);
+  if (value) {
+    primaryUntil = value;
+  }
+};
+
+/**
+ * Create the header that keeps reads on the primary right after a write
+ * @returns {Object} - Headers object with the read-your-writes time while it lasts
+ */
+export const readYourWritesHeader = () => {
+  if (primaryUntil && Number(primaryUntil) > Date.now() / 1000) {
+    return { [PRIMARY_UNTIL_HEADER]: primaryUntil };
+  }
+  primaryUntil = null;
+  return {};
+};
+
 /**
  * Create API headers with authentication token
  * @returns {Object} - Headers object with Authorization if token exists
@@ -1,5 +1,5 @@
 // src/services/fileService.js
-import { authHeader } from './authService';
+import { authHeader, readYourWritesHeader, rememberPrimaryUntil } from './authService';
 
 /**
  * Service for handling file uploads to the backend
@@ -42,10 +42,12 @@ export const uploadProductImage = async (file, category = 'uncategorized', produ
       method: 'POST',
       headers: {
         ...authHeader(),
+        ...readYourWritesHeader(),
         // Don't set Content-Type for FormData as it'll be set automatically with the proper boundary
       },
       body: formData
     });
+    rememberPrimaryUntil(response);
     
     if (!response.ok) {
       const errorData = await response.json();